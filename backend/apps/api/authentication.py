@@ -0,0 +1,76 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+TOKEN_CACHE_PREFIX = 'auth:token'
+
+
+def token_cache_key(key: str) -> str:
+    """Ключ кэша для токена (сам токен в кэш не попадает)."""
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f'{TOKEN_CACHE_PREFIX}:{digest}'
+
+
+def user_cache_key(user_id: int) -> str:
+    """Ключ кэша, указывающий на снимок пользователя по его токену."""
+    return f'{TOKEN_CACHE_PREFIX}:user:{user_id}'
+
+
+def invalidate_user_tokens(user_id: int) -> None:
+    """
+    Удаляет из кэша снимки пользователя для всех его токенов.
+
+    Ключ снимка берётся из индекса `user_cache_key`. Если индекс уже
+    вытеснен из кэша, токены пользователя читаются из БД.
+    """
+    index_key = user_cache_key(user_id)
+    cache_key = cache.get(index_key)
+    if cache_key is not None:
+        cache.delete_many([cache_key, index_key])
+        return
+    keys = Token.objects.filter(user_id=user_id).values_list('key', flat=True)
+    cache.delete_many([token_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication, хранящая снимок пользователя в общем кэше.
+
+    Вместо `SELECT` по authtoken_token c join на users_user на каждый
+    запрос пользователь берётся из кэша на `TOKEN_AUTH_CACHE_TIMEOUT`
+    секунд. Снимок удаляется при удалении токена (logout) и при
+    сохранении пользователя (смена пароля, деактивация, правка профиля),
+    см. `apps.api.signals`.
+
+    View может потребовать проверку токена по БД, выставив атрибут
+    `verify_token_in_db = True` (например, для действий сотрудников
+    или смены пароля).
+    """
+
+    def authenticate(self, request):
+        view = (request.parser_context or {}).get('view')
+        self.use_cache = not getattr(view, 'verify_token_in_db', False)
+        return super().authenticate(request)
+
+    def authenticate_credentials(self, key):
+        if not self.use_cache:
+            return super().authenticate_credentials(key)
+
+        cache_key = token_cache_key(key)
+        user = cache.get(cache_key)
+        if user is None:
+            user, token = super().authenticate_credentials(key)
+            cache.set_many(
+                {cache_key: user, user_cache_key(user.pk): cache_key},
+                settings.TOKEN_AUTH_CACHE_TIMEOUT,
+            )
+            return user, token
+
+        if not user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+        return user, Token(key=key, user=user)
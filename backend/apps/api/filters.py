@@ -1,11 +1,26 @@
+from django.db.models import Exists, F, OuterRef
 from django_filters import rest_framework as filters
 
+from apps.recipes.cache import get_tag_registry
 from apps.recipes.models import Ingredient, Recipe
+from apps.recipes.services import get_tags_mask
+from apps.users.models import Cart, Favorite
 
 FILTER_CHOICES = (
     (0, 'Нет'),
     (1, 'Да'),
 )
+TAGS_MATCH_ANY = 'any'
+TAGS_MATCH_ALL = 'all'
+TAGS_MATCH_CHOICES = (
+    (TAGS_MATCH_ANY, 'Любой из тегов'),
+    (TAGS_MATCH_ALL, 'Все теги'),
+)
+
+
+def get_tag_choices() -> list[tuple[str, str]]:
+    """Возвращает варианты фильтра по тегам из реестра тегов."""
+    return [(slug, slug) for slug in sorted(get_tag_registry())]
 
 
 class IngredientFilter(filters.FilterSet):
@@ -27,10 +42,14 @@ class RecipeFilter(filters.FilterSet):
     - is_in_shopping_cart: фильтр по рецептам в корзине пользователя
     - author: фильтр по ID автора рецепта
     - tags: фильтр по тегам (поддерживает множественный выбор)
+    - tags_match: `any` (по умолчанию) — рецепты c любым из тегов,
+      `all` — рецепты со всеми тегами
 
     Примеры использования:
     - `/recipes/?is_favorited=1` - только избранные рецепты
-    - `/recipes/?tags=breakfast,dinner` - рецепты c тегами
+    - `/recipes/?tags=breakfast&tags=dinner` - рецепты c любым из тегов
+    - `/recipes/?tags=breakfast&tags=dinner&tags_match=all` - рецепты
+      c обоими тегами
     - `/recipes/?author=5` - рецепты автора c ID=5
     """
 
@@ -49,34 +68,82 @@ class RecipeFilter(filters.FilterSet):
         help_text='Только рецепты добавленные в корзину',
     )
     author = filters.NumberFilter(label='Автор', help_text='ID автора рецепта')
-    tags = filters.AllValuesMultipleFilter(
-        field_name='tags__slug',
+    tags = filters.MultipleChoiceFilter(
+        choices=get_tag_choices,
+        method='filter_tags',
         label='Теги',
         help_text='Список доступных тегов',
     )
+    tags_match = filters.ChoiceFilter(
+        choices=TAGS_MATCH_CHOICES,
+        method='filter_tags_match',
+        label='Совпадение тегов',
+        help_text='any — любой из тегов, all — все теги',
+    )
 
     class Meta:
         model = Recipe
-        fields = ('is_favorited', 'is_in_shopping_cart', 'author', 'tags')
+        fields = (
+            'is_favorited',
+            'is_in_shopping_cart',
+            'author',
+            'tags',
+            'tags_match',
+        )
+
+    def filter_tags(self, queryset, name, value):
+        """
+        Фильтрует рецепты по тегам через маску `Recipe.tags_mask`.
+
+        Условие проверяется побитовым AND по колонке рецепта, без JOIN
+        c тегами и без DISTINCT. Допустимые slug и их биты берутся
+        из реестра тегов, поэтому фильтр не обращается к БД. Если
+        у тега нет бита, условие не выразить маской и выборка пуста:
+        маска 0 совпала бы co всеми рецептами.
+        """
+        mask = get_tags_mask(value)
+        if mask is None:
+            return queryset.none()
+        queryset = queryset.alias(tags_matched=F('tags_mask').bitand(mask))
+        if self.form.cleaned_data.get('tags_match') == TAGS_MATCH_ALL:
+            return queryset.filter(tags_matched=mask)
+        return queryset.exclude(tags_matched=0)
+
+    def filter_tags_match(self, queryset, name, value):
+        """Режим совпадения тегов, применяется в `filter_tags`."""
+        return queryset
 
     def filter_is_favorited(self, queryset, name, value):
         """Фильтрует рецепты по статусу "в избранном"."""
-        user = self.request.user
-
-        if not user.is_authenticated:
-            return queryset.none() if value else queryset
-
-        if value == 1:
-            return queryset.filter(favorites__user=user)
-        return queryset.exclude(favorites__user=user)
+        return self.filter_user_relation(queryset, Favorite, value)
 
     def filter_is_in_shopping_cart(self, queryset, name, value):
         """Фильтрует рецепты по статусу "в корзине"."""
+        return self.filter_user_relation(queryset, Cart, value)
+
+    def filter_user_relation(self, queryset, relation_model, value):
+        """
+        Фильтрует рецепты по связи c текущим пользователем.
+
+        Связь проверяется коррелированным подзапросом `EXISTS`
+        (`NOT EXISTS` для значения 0): в отличие от JOIN он не дублирует
+        строки рецептов, a в отличие от `NOT IN` использует индекс
+        уникальности (user, recipe) для каждой строки.
+
+        Args:
+            queryset (QuerySet): Рецепты.
+            relation_model (Model): Модель связи (Favorite или Cart).
+            value (int): 1 — только связанные рецепты, 0 — остальные.
+
+        Returns:
+            QuerySet: Отфильтрованные рецепты.
+        """
         user = self.request.user
 
         if not user.is_authenticated:
             return queryset.none() if value else queryset
 
-        if value == 1:
-            return queryset.filter(carts__user=user)
-        return queryset.exclude(carts__user=user)
+        related = Exists(
+            relation_model.objects.filter(user=user, recipe=OuterRef('pk'))
+        )
+        return queryset.filter(related if value else ~related)
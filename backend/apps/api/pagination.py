@@ -1,12 +1,27 @@
+from functools import partial
+
+from django.core.paginator import Paginator
 from rest_framework.pagination import PageNumberPagination
 
 from apps.core.constants import MAX_PAGE_SIZE_PAGINATION, PAGE_SIZE_PAGINATION
 
 
+class CountedPaginator(Paginator):
+    """Paginator, принимающий заранее посчитанное число объектов."""
+
+    def __init__(self, *args, count: int | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if count is not None:
+            self.count = count
+
+
 class LimitPageNumberPagination(PageNumberPagination):
     """
     Пагинатор, позволяющий пользователю задавать лимит на странице.
 
+    Если view уже посчитала объекты (атрибут `object_count`), повторный
+    `COUNT` не выполняется.
+
     Attributes:
         page_size (int): Количество элементов на странице по умолчанию
         max_page_size (int): Максимально допустимое количество элементов
@@ -16,3 +31,9 @@ class LimitPageNumberPagination(PageNumberPagination):
     page_size = PAGE_SIZE_PAGINATION
     max_page_size = MAX_PAGE_SIZE_PAGINATION
     page_size_query_param = 'limit'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.django_paginator_class = partial(
+            CountedPaginator, count=getattr(view, 'object_count', None)
+        )
+        return super().paginate_queryset(queryset, request, view)
@@ -0,0 +1,30 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from apps.api.renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser на orjson (если пакет установлен).
+
+    orjson всегда отклоняет NaN и Infinity, поэтому при
+    `STRICT_JSON = False` используется стандартный `json`.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            raw = stream.read()
+            if encoding.lower().replace('_', '-') not in {'utf-8', 'utf8'}:
+                raw = raw.decode(encoding)
+            return orjson.loads(raw)
+        except ValueError as e:
+            msg = f'JSON parse error - {e}'
+            raise ParseError(msg) from e
@@ -0,0 +1,50 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson не установлен
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson (если пакет установлен).
+
+    Даты, Decimal, ленивые строки и прочие типы, которые orjson
+    не сериализует сам, передаются в `encoder_class` DRF. Форматированный
+    вывод (`indent`), `UNICODE_JSON = False` и `COMPACT_JSON = False`,
+    а также данные, c которыми orjson не справился (например, целые
+    больше 64 бит), обрабатываются стандартным `json`.
+
+    Отличия от `JSONRenderer`:
+    - NaN и Infinity выводятся как `null`, a не вызывают ошибку;
+    - экспонента float записывается короче: `1e16` и `1e-7` вместо
+      `1e+16` и `1e-07` (значения те же, в ответах API float нет).
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=(
+                    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                ),
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Как и JSONRenderer, экранирует U+2028 и U+2029 для совместимости
+        # c JavaScript.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+                b'\xe2\x80\xa9', b'\\u2029'
+            )
+        return ret
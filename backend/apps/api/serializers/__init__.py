@@ -1,16 +1,25 @@
 from .fields import Base64ImageField
+from .lean import (
+    LeanIngredientListSerializer,
+    LeanIngredientSerializer,
+    LeanRecipeReadSerializer,
+    LeanUserSerializer,
+)
 from .recipes import (
+    BulkRelationSerializer,
     CartCreateSerializer,
     FavoriteCreateSerializer,
     IngredientSerializer,
     RecipeIngredientBaseSerializer,
     RecipeIngredientCreateSerializer,
     RecipeIngredientReadSerializer,
+    RecipeReadListSerializer,
     RecipeReadSerializer,
     RecipeShortSerializer,
     RecipeWriteSerializer,
     TagSerializer,
 )
+from .sparse import SparseFieldsSerializerMixin
 from .users import (
     SubscriptionUserSerializer,
     UserAvatarSerializer,
@@ -20,15 +29,22 @@ from .users import (
 
 __all__ = [
     'Base64ImageField',
+    'BulkRelationSerializer',
     'CartCreateSerializer',
     'FavoriteCreateSerializer',
     'IngredientSerializer',
+    'LeanIngredientListSerializer',
+    'LeanIngredientSerializer',
+    'LeanRecipeReadSerializer',
+    'LeanUserSerializer',
     'RecipeIngredientBaseSerializer',
     'RecipeIngredientCreateSerializer',
     'RecipeIngredientReadSerializer',
+    'RecipeReadListSerializer',
     'RecipeReadSerializer',
     'RecipeShortSerializer',
     'RecipeWriteSerializer',
+    'SparseFieldsSerializerMixin',
     'SubscriptionUserSerializer',
     'TagSerializer',
     'UserAvatarSerializer',
@@ -0,0 +1,122 @@
+"""
+Облегчённые сериализаторы чтения.
+
+Выдают тот же JSON, что и базовые сериализаторы, но собирают словари
+напрямую из объектов (или строк `.values_list()`), не создавая
+объекты полей DRF и не проходя `Serializer.to_representation`.
+Наследуются от заменяемых сериализаторов, поэтому view подставляет
+их через `LeanSerializerMixin` только там, где использовался
+базовый сериализатор.
+"""
+
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+from apps.api.serializers.recipes import (
+    IngredientSerializer,
+    RecipeReadSerializer,
+)
+from apps.api.serializers.users import UserReadSerializer
+
+
+def build_file_url(context: dict, value) -> str | None:
+    """Возвращает ссылку на файл так же, как `serializers.ImageField`."""
+    if not value:
+        return None
+    try:
+        url = value.url
+    except AttributeError:
+        return None
+    request = context.get('request')
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+class LeanIngredientListSerializer(serializers.ListSerializer):
+    """Список ингредиентов из строк `.values_list()` без моделей."""
+
+    def to_representation(self, data):
+        if not isinstance(data, QuerySet):
+            return super().to_representation(data)
+        return [
+            {'id': pk, 'name': name, 'measurement_unit': unit}
+            for pk, name, unit in data.values_list(
+                'pk', 'name', 'measurement_unit__name'
+            )
+        ]
+
+
+class LeanIngredientSerializer(IngredientSerializer):
+    """Облегчённый `IngredientSerializer`."""
+
+    class Meta(IngredientSerializer.Meta):
+        list_serializer_class = LeanIngredientListSerializer
+
+    def to_representation(self, instance):
+        return {
+            'id': instance.pk,
+            'name': instance.name,
+            'measurement_unit': instance.measurement_unit.name,
+        }
+
+
+class LeanUserSerializer(UserReadSerializer):
+    """
+    Облегчённый `UserReadSerializer`.
+
+    Ответ c выборочными полями собирает базовый класс.
+    """
+
+    def to_representation(self, instance):
+        if self.fieldset is not None:
+            return super().to_representation(instance)
+        return {
+            'email': instance.email,
+            'id': instance.pk,
+            'username': instance.username,
+            'first_name': instance.first_name,
+            'last_name': instance.last_name,
+            'is_subscribed': self.get_is_subscribed(instance),
+            'avatar': build_file_url(self.context, instance.avatar),
+        }
+
+
+class LeanRecipeReadSerializer(RecipeReadSerializer):
+    """
+    Облегчённый `RecipeReadSerializer`.
+
+    Заменяет только сборку ответа для рецептов, которых нет в кэше
+    фрагментов; кэш и персональные поля обрабатываются базовым классом.
+    Ответ c выборочными полями собирает базовый класс.
+    """
+
+    def render(self, recipe) -> dict:
+        if self.fieldset is not None:
+            return super().render(recipe)
+        author = recipe.author
+        if hasattr(recipe, 'is_subscribed'):
+            author.is_subscribed = recipe.is_subscribed
+        return {
+            'id': recipe.pk,
+            'tags': [
+                {'id': tag.pk, 'name': tag.name, 'slug': tag.slug}
+                for tag in recipe.tags.all()
+            ],
+            'author': LeanUserSerializer(
+                context=self.context
+            ).to_representation(author),
+            'ingredients': [
+                {
+                    'id': item.ingredient_id,
+                    'amount': item.amount,
+                    'name': item.ingredient.name,
+                    'measurement_unit': item.ingredient.measurement_unit.name,
+                }
+                for item in recipe.recipe_ingredients.all()
+            ],
+            'is_favorited': self.get_is_favorited(recipe),
+            'is_in_shopping_cart': self.get_is_in_shopping_cart(recipe),
+            'name': recipe.name,
+            'image': build_file_url(self.context, recipe.image),
+            'text': recipe.text,
+            'cooking_time': recipe.cooking_time,
+        }
@@ -1,8 +1,12 @@
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import Manager, Prefetch, prefetch_related_objects
 from rest_framework import serializers
 
 from apps.api.serializers import Base64ImageField
+from apps.api.serializers.sparse import SparseFieldsSerializerMixin
+from apps.core.constants import MAX_BULK_RELATION_IDS
+from apps.recipes.cache import get_recipe_fragments, set_recipe_fragments
 from apps.recipes.models import (
     Ingredient,
     Recipe,
@@ -164,14 +168,45 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
         return RecipeReadSerializer(instance, context=self.context).data
 
 
-class RecipeReadSerializer(serializers.ModelSerializer):
+class RecipeReadListSerializer(serializers.ListSerializer):
+    """
+    Список рецептов, собираемый из кэша фрагментов.
+
+    Фрагменты всех рецептов страницы читаются одним `get_many`,
+    связанные объекты подгружаются только для отсутствующих в кэше.
+    """
+
+    def to_representation(self, data):
+        recipes = list(data.all() if isinstance(data, Manager) else data)
+        return self.child.to_representation_many(recipes)
+
+
+class RecipeReadSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     """
     Сериализатор для отображения рецепта.
 
     Включает вложенные теги, автора, ингредиенты и вычисляемые поля
-    избранного и корзины.
+    избранного и корзины. Ответ без персональных полей кэшируется
+    (см. `apps.recipes.cache.get_recipe_fragments`), поэтому теги
+    и ингредиенты подгружаются самим сериализатором и только для
+    рецептов, которых нет в кэше.
+
+    C выборочными полями (`fieldset`) кэш фрагментов не используется,
+    a подгружаются только связи запрошенных полей.
     """
 
+    expandable_fields = ('tags', 'author', 'ingredients')
+
+    prefetch_lookups = (
+        'tags',
+        Prefetch(
+            'recipe_ingredients',
+            queryset=RecipeIngredient.objects.for_detail(),
+        ),
+    )
+
     author = serializers.SerializerMethodField()
     tags = TagSerializer(many=True, read_only=True)
     ingredients = RecipeIngredientReadSerializer(
@@ -182,6 +217,7 @@ class RecipeReadSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Recipe
+        list_serializer_class = RecipeReadListSerializer
         fields = (
             'id',
             'tags',
@@ -195,11 +231,140 @@ class RecipeReadSerializer(serializers.ModelSerializer):
             'cooking_time',
         )
 
+    def to_representation(self, instance):
+        return self.to_representation_many([instance])[0]
+
+    def to_representation_many(self, recipes: list) -> list[dict]:
+        """
+        Сериализует рецепты, используя кэш фрагментов.
+
+        Args:
+            recipes (list[Recipe]): Рецепты c загруженным автором.
+
+        Returns:
+            list[dict]: Данные рецептов в исходном порядке.
+        """
+        if self.fieldset is not None:
+            self.load_deferred_fields(recipes)
+            prefetch_related_objects(recipes, *self.get_prefetch_lookups())
+            return [self.render(recipe) for recipe in recipes]
+        fragments = get_recipe_fragments(recipes)
+        missing = [recipe for recipe in recipes if recipe.pk not in fragments]
+        rendered = {}
+        if missing:
+            self.load_deferred_fields(missing)
+            prefetch_related_objects(missing, *self.prefetch_lookups)
+            rendered = {recipe.pk: self.render(recipe) for recipe in missing}
+            set_recipe_fragments(
+                {
+                    recipe: self.make_fragment(recipe, rendered[recipe.pk])
+                    for recipe in missing
+                }
+            )
+        return [
+            rendered[recipe.pk]
+            if recipe.pk in rendered
+            else self.personalize(recipe, fragments[recipe.pk])
+            for recipe in recipes
+        ]
+
+    def load_deferred_fields(self, recipes: list) -> None:
+        """
+        Загружает одним запросом отложенные колонки выводимых полей.
+
+        Без этого обращение к отложенному полю выполняло бы отдельный
+        запрос на каждый рецепт. View загружают выводимые поля сразу, так
+        что обычно запроса нет.
+        """
+        if not recipes:
+            return
+        sources = {field.source for field in self.fields.values()}
+        deferred = sorted(recipes[0].get_deferred_fields() & sources)
+        if not deferred:
+            return
+        rows = (
+            Recipe.objects.for_aggregate()
+            .filter(pk__in=[recipe.pk for recipe in recipes])
+            .values_list('pk', *deferred)
+        )
+        values = {pk: row for pk, *row in rows}
+        for recipe in recipes:
+            row = values.get(recipe.pk)
+            if row is None:
+                continue
+            for name, value in zip(deferred, row, strict=True):
+                setattr(recipe, name, value)
+
+    def get_prefetch_lookups(self) -> tuple:
+        """Возвращает связи, нужные выводимым полям."""
+        if self.fieldset is None:
+            return self.prefetch_lookups
+        sources = {field.source for field in self.fields.values()}
+        return tuple(
+            lookup
+            for lookup in self.prefetch_lookups
+            if getattr(lookup, 'prefetch_through', lookup) in sources
+        )
+
+    def render(self, recipe) -> dict:
+        """Сериализует рецепт без обращения к кэшу."""
+        return super().to_representation(recipe)
+
+    @staticmethod
+    def make_fragment(recipe, data) -> dict:
+        """
+        Возвращает данные рецепта без персональных полей.
+
+        Ссылки на изображения сохраняются относительными: абсолютный
+        адрес зависит от запроса.
+        """
+        author = recipe.author
+        return {
+            **data,
+            'is_favorited': False,
+            'is_in_shopping_cart': False,
+            'image': recipe.image.url if recipe.image else None,
+            'author': {
+                **data['author'],
+                'is_subscribed': False,
+                'avatar': author.avatar.url if author.avatar else None,
+            },
+        }
+
+    def personalize(self, recipe, fragment: dict) -> dict:
+        """Дополняет фрагмент полями, зависящими от запроса."""
+        from .users import UserReadSerializer  # noqa: PLC0415
+
+        author = recipe.author
+        if hasattr(recipe, 'is_subscribed'):
+            author.is_subscribed = recipe.is_subscribed
+        author_serializer = UserReadSerializer(context=self.context)
+        fragment['is_favorited'] = self.get_is_favorited(recipe)
+        fragment['is_in_shopping_cart'] = self.get_is_in_shopping_cart(recipe)
+        fragment['author']['is_subscribed'] = (
+            author_serializer.get_is_subscribed(author)
+        )
+        fragment['image'] = self.build_url(fragment['image'])
+        fragment['author']['avatar'] = self.build_url(
+            fragment['author']['avatar']
+        )
+        return fragment
+
+    def build_url(self, url: str | None) -> str | None:
+        """Делает ссылку абсолютной, как `serializers.ImageField`."""
+        request = self.context.get('request')
+        if url and request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
     def get_author(self, obj):
         """Lazy import для UserReadSerializer."""
         from .users import UserReadSerializer  # noqa: PLC0415
 
-        return UserReadSerializer(obj.author, context=self.context).data
+        author = obj.author
+        if hasattr(obj, 'is_subscribed'):
+            author.is_subscribed = obj.is_subscribed
+        return UserReadSerializer(author, context=self.context).data
 
     def get_is_favorited(self, obj):
         """
@@ -208,13 +373,17 @@ class RecipeReadSerializer(serializers.ModelSerializer):
         Args:
             obj: Объект рецепта.
 
+        Если queryset аннотирован флагом `is_favorited`, запрос не выполняется.
+
         Returns:
             bool: True, если рецепт в избранном, иначе False.
         """
         user = self.context['request'].user
-        return (
-            user.is_authenticated and obj.favorites.filter(user=user).exists()
-        )
+        if not user.is_authenticated:
+            return False
+        if hasattr(obj, 'is_favorited'):
+            return obj.is_favorited
+        return obj.favorites.filter(user=user).exists()
 
     def get_is_in_shopping_cart(self, obj):
         """
@@ -223,11 +392,18 @@ class RecipeReadSerializer(serializers.ModelSerializer):
         Args:
             obj: Объект рецепта.
 
+        Если queryset аннотирован флагом `is_in_shopping_cart`,
+        запрос не выполняется.
+
         Returns:
             bool: True, если рецепт добавлен в корзину, иначе False.
         """
         user = self.context['request'].user
-        return user.is_authenticated and obj.carts.filter(user=user).exists()
+        if not user.is_authenticated:
+            return False
+        if hasattr(obj, 'is_in_shopping_cart'):
+            return obj.is_in_shopping_cart
+        return obj.carts.filter(user=user).exists()
 
 
 class RecipeShortSerializer(serializers.ModelSerializer):
@@ -241,14 +417,32 @@ class RecipeShortSerializer(serializers.ModelSerializer):
 class FavoriteCreateSerializer(serializers.ModelSerializer):
     """Сериализатор для добавления рецептов в избранное."""
 
+    recipe = serializers.PrimaryKeyRelatedField(
+        queryset=Recipe.objects.defer('text')
+    )
+
     class Meta:
         model = Favorite
         fields = ('user', 'recipe')
 
 
+class BulkRelationSerializer(serializers.Serializer):
+    """Сериализатор списка ID для пакетного изменения связей."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_BULK_RELATION_IDS,
+    )
+
+
 class CartCreateSerializer(serializers.ModelSerializer):
     """Сериализатор для добавления рецептов в корзину."""
 
+    recipe = serializers.PrimaryKeyRelatedField(
+        queryset=Recipe.objects.defer('text')
+    )
+
     class Meta:
         model = Cart
         fields = ('user', 'recipe')
@@ -0,0 +1,83 @@
+from rest_framework import serializers
+
+
+def split_param(value: str | None) -> set[str] | None:
+    """Разбирает список имён через запятую; пустое значение — None."""
+    if not value:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Миксин сериализатора c выборочными полями (sparse fieldsets).
+
+    Сериализатор, созданный c аргументом `fieldset`, выводит только
+    перечисленные в нём поля. Набор полей строится из параметров запроса
+    (`parse_fieldset`):
+    - `fields` — поля ответа; без него выводятся все поля, кроме
+      вложенных объектов из `expandable_fields`;
+    - `expand` — вложенные объекты, добавляемые к `fields`.
+
+    Без обоих параметров ответ не меняется.
+
+    Attributes:
+        expandable_fields (tuple[str, ...]): Поля c вложенными объектами,
+            для которых view загружает связанные данные.
+    """
+
+    expandable_fields: tuple[str, ...] = ()
+
+    def __init__(self, *args, fieldset=None, **kwargs):
+        self.fieldset = fieldset
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.fieldset is None:
+            return fields
+        return {
+            name: field
+            for name, field in fields.items()
+            if name in self.fieldset
+        }
+
+    @classmethod
+    def parse_fieldset(cls, query_params) -> frozenset[str] | None:
+        """
+        Строит набор полей ответа из параметров `fields` и `expand`.
+
+        Args:
+            query_params (QueryDict): Параметры запроса.
+
+        Returns:
+            frozenset[str] | None: Имена полей или None, если ответ
+                не ограничен.
+
+        Raises:
+            ValidationError: Если запрошены неизвестные поля или
+                `expand` содержит поле без вложенного объекта.
+        """
+        requested = split_param(query_params.get('fields'))
+        expand = split_param(query_params.get('expand'))
+        if requested is None and expand is None:
+            return None
+
+        available = set(cls.Meta.fields)
+        unknown = sorted((requested or set()) - available)
+        if unknown:
+            raise serializers.ValidationError(
+                {'fields': f'Неизвестные поля: {", ".join(unknown)}.'}
+            )
+        not_expandable = sorted((expand or set()) - set(cls.expandable_fields))
+        if not_expandable:
+            raise serializers.ValidationError(
+                {
+                    'expand': (
+                        f'Поля нельзя раскрыть: {", ".join(not_expandable)}.'
+                    )
+                }
+            )
+        if requested is None:
+            requested = available - set(cls.expandable_fields)
+        return frozenset(requested | (expand or set()))
@@ -1,18 +1,23 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
-from apps.api.serializers import Base64ImageField, RecipeShortSerializer
+from apps.api.serializers.fields import Base64ImageField
+from apps.api.serializers.recipes import RecipeShortSerializer
+from apps.api.serializers.sparse import SparseFieldsSerializerMixin
 from apps.users.models import Subscribe
 
 User = get_user_model()
 
 
-class UserReadSerializer(serializers.ModelSerializer):
+class UserReadSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     """
     Сериализатор для чтения данных пользователя (GET-запросы).
 
     Включает вычисляемое поле `is_subscribed`, показывающее,
     подписан ли текущий пользователь на отображаемого автора.
+    Поддерживает выборочные поля (`?fields=`).
 
     Attributes:
         is_subscribed (SerializerMethodField): Вычисляемое поле.
@@ -39,14 +44,18 @@ class UserReadSerializer(serializers.ModelSerializer):
         Args:
             obj (User): Автор, на которого может быть подписка.
 
+        Если объект аннотирован флагом `is_subscribed`,
+        запрос не выполняется.
+
         Returns:
             bool: True, user подписан на obj, иначе False.
         """
         user = self.context['request'].user
-        return (
-            user.is_authenticated
-            and obj.subscribers.filter(user=user).exists()
-        )
+        if not user.is_authenticated:
+            return False
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
+        return obj.subscribers.filter(user=user).exists()
 
 
 class UserCreateSerializer(serializers.ModelSerializer):
@@ -107,9 +116,9 @@ class SubscriptionUserSerializer(UserReadSerializer):
     class Meta(UserReadSerializer.Meta):
         fields = (*UserReadSerializer.Meta.fields, 'recipes', 'recipes_count')
 
-    def _get_recipes_limit(self):
+    @staticmethod
+    def get_recipes_limit(request):
         """Получение лимита рецептов из параметров запроса."""
-        request = self.context.get('request')
         if not request:
             return None
         recipes_limit = request.query_params.get('recipes_limit')
@@ -123,7 +132,8 @@ class SubscriptionUserSerializer(UserReadSerializer):
         """
         Вычисляемое поле, возвращающее список рецептов автора.
 
-        Ограниченный параметром recipes_limit.
+        Ограниченный параметром recipes_limit. Если рецепты уже подгружены
+        через Prefetch c `to_attr='short_recipes'`, запрос не выполняется.
 
         Args:
             obj (User): Автор, чьи рецепты нужно получить.
@@ -131,10 +141,12 @@ class SubscriptionUserSerializer(UserReadSerializer):
         Returns:
             list: Список рецептов ограниченный по количеству.
         """
-        limit = self._get_recipes_limit()
-        recipes = obj.recipes.all()
-        if limit is not None:
-            recipes = recipes[:limit]
+        recipes = getattr(obj, 'short_recipes', None)
+        if recipes is None:
+            limit = self.get_recipes_limit(self.context.get('request'))
+            recipes = obj.recipes.defer('text')
+            if limit is not None:
+                recipes = recipes[:limit]
         return RecipeShortSerializer(
             recipes, many=True, context=self.context
         ).data
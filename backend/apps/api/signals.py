@@ -0,0 +1,37 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from apps.api.authentication import invalidate_user_tokens, token_cache_key
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Token, dispatch_uid='forget_cached_token')
+def forget_cached_token(sender, instance, **kwargs):
+    """
+    Удаляет снимок пользователя из кэша при удалении токена (logout).
+
+    Args:
+        sender (Model): Класс модели, отправившей сигнал.
+        instance (Token): Удалённый токен.
+    """
+    cache.delete(token_cache_key(instance.key))
+
+
+@receiver(post_save, sender=User, dispatch_uid='forget_cached_user')
+def forget_cached_user(sender, instance, created, **kwargs):
+    """
+    Удаляет снимки пользователя из кэша токенов при его сохранении.
+
+    Покрывает смену пароля, деактивацию и изменение профиля.
+
+    Args:
+        sender (Model): Класс модели, отправившей сигнал.
+        instance (User): Сохранённый пользователь.
+        created (bool): Пользователь только что создан.
+    """
+    if not created:
+        invalidate_user_tokens(instance.pk)
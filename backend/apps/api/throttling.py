@@ -0,0 +1,21 @@
+from rest_framework import throttling
+
+from apps.core.metrics import registry
+
+
+class MetricsThrottleMixin:
+    """Учитывает отклонённые запросы в `foodgram_throttled_requests_total`."""
+
+    def throttle_failure(self):
+        registry.inc(
+            'foodgram_throttled_requests_total', {'scope': self.scope}
+        )
+        return super().throttle_failure()
+
+
+class AnonRateThrottle(MetricsThrottleMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(MetricsThrottleMixin, throttling.UserRateThrottle):
+    pass
@@ -7,6 +7,7 @@ from apps.api.views import (
     TagViewSet,
     UserViewSet,
 )
+from apps.core.admission import Priority, RoutePriority
 
 app_name = 'api_v1'
 
@@ -23,6 +24,31 @@ v1_patterns = [
 ]
 
 
+# Приоритеты маршрутов при перегрузке воркера (см. apps.core.admission).
+# Запросы небезопасными методами всегда HIGH, маршруты вне списка — NORMAL.
+ROUTE_PRIORITIES = {
+    f'{app_name}:{url_name}': priority
+    for url_name, priority in (
+        ('login', RoutePriority(Priority.HIGH)),
+        ('logout', RoutePriority(Priority.HIGH)),
+        ('users-me', RoutePriority(Priority.HIGH)),
+        ('recipes-download_shopping_cart', RoutePriority(Priority.LOW)),
+        (
+            'recipes-list',
+            RoutePriority(Priority.NORMAL, anonymous=Priority.LOW),
+        ),
+        (
+            'users-list',
+            RoutePriority(Priority.NORMAL, anonymous=Priority.LOW),
+        ),
+        (
+            'ingredients-list',
+            RoutePriority(Priority.NORMAL, anonymous=Priority.LOW),
+        ),
+    )
+}
+
+
 urlpatterns = [
     path('v1/', include(v1_patterns)),
 ]
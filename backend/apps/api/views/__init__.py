@@ -1,9 +1,14 @@
 from .mixins import (
     AvatarManagementMixin,
+    ConditionalGetMixin,
     DisableDjoserActionsMixin,
     FavoriteManagerMixin,
+    LeanSerializerMixin,
+    PersonalizedListCacheMixin,
     ShoppingCartManagerMixin,
     ShortLinkMixin,
+    SparseFieldsMixin,
+    StatementTimeoutMixin,
     SubscriptionMixin,
 )
 from .recipes import (
@@ -15,12 +20,17 @@ from .users import UserViewSet
 
 __all__ = [
     'AvatarManagementMixin',
+    'ConditionalGetMixin',
     'DisableDjoserActionsMixin',
     'FavoriteManagerMixin',
     'IngredientViewSet',
+    'LeanSerializerMixin',
+    'PersonalizedListCacheMixin',
     'RecipeViewSet',
     'ShoppingCartManagerMixin',
     'ShortLinkMixin',
+    'SparseFieldsMixin',
+    'StatementTimeoutMixin',
     'SubscriptionMixin',
     'TagViewSet',
     'UserViewSet',
@@ -1,5 +1,18 @@
+import hashlib
+import math
+import time
+
+from typing import ClassVar
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Count, Sum
+from django.db.models import Count, Exists, Max, OuterRef, Prefetch
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.exceptions import NotFound
@@ -8,24 +21,52 @@ from rest_framework.response import Response
 
 from apps.api.pagination import LimitPageNumberPagination
 from apps.api.serializers import (
+    BulkRelationSerializer,
     CartCreateSerializer,
     FavoriteCreateSerializer,
     RecipeShortSerializer,
+    SparseFieldsSerializerMixin,
     SubscriptionUserSerializer,
     UserAvatarSerializer,
 )
 from apps.api.serializers.users import SubscribeCreateSerializer
+from apps.core.compression import get_cached_response, make_body_cache_key
 from apps.core.constants import SHORT_LINK_PREFIX
-from apps.recipes.models import RecipeIngredient
+from apps.core.metrics import registry
+from apps.core.timeouts import (
+    StatementTimeoutExceeded,
+    is_statement_timeout,
+    statement_timeout,
+)
+from apps.recipes.cache import (
+    UserRelations,
+    get_list_page,
+    get_recipe_updated,
+    get_user_relations,
+    get_versions,
+    set_list_page,
+    set_recipe_updated,
+)
+from apps.recipes.models import Recipe, RecipeIngredient
 from apps.recipes.services import (
     get_txt_in_response,
     manage_user_relation_object,
+    manage_user_relations_bulk,
 )
 from apps.users.models import Cart, Favorite, Subscribe
+from config.routers import use_replicas
 
 User = get_user_model()
 
 
+def get_lookup_id(view) -> int:
+    """Возвращает ID объекта из URL detail-действия без его загрузки."""
+    try:
+        return int(view.kwargs[view.lookup_url_kwarg or view.lookup_field])
+    except (KeyError, ValueError) as e:
+        raise NotFound from e
+
+
 class DisableDjoserActionsMixin:
     """
     Миксин для отключения ненужных действий Djoser.
@@ -116,8 +157,16 @@ class SubscriptionMixin:
     def subscriptions(self, request):
         """Возвращает подписки текущего пользователя."""
         subscriptions = Subscribe.objects.filter(user=request.user)
-        authors = self.get_queryset().filter(
-            pk__in=subscriptions.values('author')
+        recipes = Recipe.objects.for_short_list()
+        limit = SubscriptionUserSerializer.get_recipes_limit(request)
+        if limit is not None:
+            recipes = recipes[:limit]
+        authors = (
+            self.get_queryset()
+            .filter(pk__in=subscriptions.values('author'))
+            .prefetch_related(
+                Prefetch('recipes', queryset=recipes, to_attr='short_recipes')
+            )
         )
         paginator = LimitPageNumberPagination()
         paginated_authors = paginator.paginate_queryset(authors, request)
@@ -137,14 +186,12 @@ class SubscriptionMixin:
     )
     def manage_subscribe(self, request, **kwargs):
         """Подписка или отписка от пользователя."""
-        author = self.get_object()
-
         handler = manage_user_relation_object(
             relation_model=Subscribe,
             user_id=request.user.id,
             target_field='author',
-            target_object_id=author.id,
-            target_object=author,
+            target_object_id=get_lookup_id(self),
+            target_queryset=self.get_queryset(),
             create_serializer=SubscribeCreateSerializer,
             response_serializer=SubscriptionUserSerializer,
             context={'request': request},
@@ -152,9 +199,44 @@ class SubscriptionMixin:
         )
         return handler(request)
 
+    @action(
+        detail=False,
+        methods=['post', 'delete'],
+        url_name='subscribe_bulk',
+        url_path='subscribe',
+        permission_classes=[IsAuthenticated],
+    )
+    def manage_subscribe_bulk(self, request):
+        """Подписка или отписка от нескольких авторов по списку `ids`."""
+        handler = manage_user_relations_bulk(
+            relation_model=Subscribe,
+            user_id=request.user.id,
+            target_field='author',
+            ids_serializer=BulkRelationSerializer,
+            invalid={request.user.id: 'Нельзя подписаться на самого себя'},
+        )
+        return handler(request)
+
     def get_queryset(self):
-        """Добавляет аннотацию для `recipes_count`."""
-        return super().get_queryset().annotate(recipes_count=Count('recipes'))
+        """
+        Добавляет аннотации для `recipes_count` и `is_subscribed`.
+
+        `recipes_count` нужен только подпискам, `is_subscribed` — если
+        поле запрошено (см. `SparseFieldsMixin`).
+        """
+        queryset = super().get_queryset()
+        if self.action in {'subscriptions', 'manage_subscribe'}:
+            queryset = queryset.annotate(recipes_count=Count('recipes'))
+        user = self.request.user
+        if not user.is_authenticated or not self.is_field_requested(
+            'is_subscribed'
+        ):
+            return queryset
+        return queryset.annotate(
+            is_subscribed=Exists(
+                Subscribe.objects.filter(user=user, author=OuterRef('pk'))
+            )
+        )
 
 
 class FavoriteManagerMixin:
@@ -173,14 +255,12 @@ class FavoriteManagerMixin:
     )
     def manage_favorite(self, request, **kwargs):
         """Добавление или удаление рецепта из избранного."""
-        recipe = self.get_object()
-
         handler = manage_user_relation_object(
             relation_model=Favorite,
             user_id=request.user.id,
             target_field='recipe',
-            target_object_id=recipe.id,
-            target_object=recipe,
+            target_object_id=get_lookup_id(self),
+            target_queryset=self.get_queryset(),
             create_serializer=FavoriteCreateSerializer,
             response_serializer=RecipeShortSerializer,
             context={'request': request},
@@ -188,6 +268,23 @@ class FavoriteManagerMixin:
         )
         return handler(request)
 
+    @action(
+        detail=False,
+        methods=['post', 'delete'],
+        url_name='favorite_bulk',
+        url_path='favorite',
+        permission_classes=[IsAuthenticated],
+    )
+    def manage_favorite_bulk(self, request):
+        """Добавление или удаление рецептов из избранного по списку `ids`."""
+        handler = manage_user_relations_bulk(
+            relation_model=Favorite,
+            user_id=request.user.id,
+            target_field='recipe',
+            ids_serializer=BulkRelationSerializer,
+        )
+        return handler(request)
+
 
 class ShoppingCartManagerMixin:
     """
@@ -221,19 +318,7 @@ class ShoppingCartManagerMixin:
 
     def _get_shopping_ingredients(self, user):
         """Возвращает queryset ингредиентов."""
-        return (
-            RecipeIngredient.objects.filter(recipe__carts__user=user)
-            .values(
-                'ingredient__name',
-                'ingredient__measurement_unit__name',
-            )
-            .annotate(
-                amount=Sum('amount'),
-            )
-            .order_by(
-                'ingredient__name',
-            )
-        )
+        return RecipeIngredient.objects.shopping_list(user)
 
     @action(
         detail=True,
@@ -244,14 +329,12 @@ class ShoppingCartManagerMixin:
     )
     def manage_shopping_cart(self, request, **kwargs):
         """Добавление или удаление рецепта из корзины."""
-        recipe = self.get_object()
-
         handler = manage_user_relation_object(
             relation_model=Cart,
             user_id=request.user.id,
             target_field='recipe',
-            target_object_id=recipe.id,
-            target_object=recipe,
+            target_object_id=get_lookup_id(self),
+            target_queryset=self.get_queryset(),
             create_serializer=CartCreateSerializer,
             response_serializer=RecipeShortSerializer,
             context={'request': request},
@@ -259,6 +342,23 @@ class ShoppingCartManagerMixin:
         )
         return handler(request)
 
+    @action(
+        detail=False,
+        methods=['post', 'delete'],
+        url_name='shopping_cart_bulk',
+        url_path='shopping_cart',
+        permission_classes=[IsAuthenticated],
+    )
+    def manage_shopping_cart_bulk(self, request):
+        """Добавление или удаление рецептов из корзины по списку `ids`."""
+        handler = manage_user_relations_bulk(
+            relation_model=Cart,
+            user_id=request.user.id,
+            target_field='recipe',
+            ids_serializer=BulkRelationSerializer,
+        )
+        return handler(request)
+
 
 class ShortLinkMixin:
     """
@@ -287,3 +387,350 @@ class ShortLinkMixin:
         domain = request.build_absolute_uri('/')[:-1]
         short_url = f'{domain}/{SHORT_LINK_PREFIX}/{recipe.short_code}/'
         return Response({'short-link': short_url}, status=status.HTTP_200_OK)
+
+
+class ConditionalGetMixin:
+    """
+    Миксин условных GET (ETag / Last-Modified) для списка и рецепта.
+
+    Валидаторы вычисляются до сериализации, и при совпадении
+    `If-None-Match` / `If-Modified-Since` возвращается 304 без построения
+    ответа. В них входят путь c параметрами, формат ответа, пользователь,
+    версия контента и версия состояния пользователя
+    (см. `apps.recipes.cache`), а также:
+    - для рецепта — `updated_at` (из кэша, без запроса к БД);
+    - для списка — `max(updated_at)` и число рецептов в отфильтрованной
+      выборке; это число передаётся пагинатору вместо повторного COUNT.
+
+    Готовые JSON-ответы кэшируются по ETag вместе co сжатыми вариантами
+    (`apps.core.compression`): при повторном запросе ответ не строится.
+
+    Список и рецепт читаются из основной базы, a не c реплик: валидаторы
+    и версии берутся из основной базы и кэша, и тело, прочитанное
+    c отстающей реплики, попало бы в кэш тел под новым ETag.
+    """
+
+    object_count = None
+    body_cache_key = None
+    list_stats = None
+    versions = (None, None)
+
+    @use_replicas(enabled=False)
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        stats = queryset.for_aggregate().aggregate(
+            count=Count('pk'), last_modified=Max('updated_at')
+        )
+        updated_at = stats['last_modified']
+        self.list_stats = (
+            updated_at.timestamp() if updated_at else 0,
+            stats['count'],
+        )
+        etag, last_modified = self.get_validators(request, *self.list_stats)
+        not_modified = self.get_not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        cached = self.get_cached_response(request, etag)
+        if cached is not None:
+            return self.set_validators(request, cached, etag, last_modified)
+
+        self.object_count = stats['count']
+        response = self.build_list_response(queryset)
+        response.body_cache_key = self.body_cache_key
+        return self.set_validators(request, response, etag, last_modified)
+
+    def build_list_response(self, queryset):
+        """Сериализует отфильтрованный список (c пагинацией)."""
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @use_replicas(enabled=False)
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            recipe_id = int(kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except (KeyError, ValueError):
+            return super().retrieve(request, *args, **kwargs)
+
+        updated_at = get_recipe_updated(recipe_id)
+        if updated_at is None:
+            try:
+                updated = Recipe.objects.values_list(
+                    'updated_at', flat=True
+                ).get(pk=recipe_id)
+            except Recipe.DoesNotExist:
+                return super().retrieve(request, *args, **kwargs)
+            set_recipe_updated(recipe_id, updated)
+            updated_at = updated.timestamp()
+
+        etag, last_modified = self.get_validators(request, updated_at)
+        not_modified = self.get_not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        cached = self.get_cached_response(request, etag)
+        if cached is not None:
+            return self.set_validators(request, cached, etag, last_modified)
+        response = super().retrieve(request, *args, **kwargs)
+        response.body_cache_key = self.body_cache_key
+        return self.set_validators(request, response, etag, last_modified)
+
+    def get_validators(
+        self, request, updated_at: float, *parts
+    ) -> tuple[str, int]:
+        """
+        Вычисляет ETag и Last-Modified ответа.
+
+        Прочитанные версии сохраняются в `self.versions`.
+
+        Args:
+            request (Request): Запрос.
+            updated_at (float): Время изменения данных (timestamp).
+            *parts: Дополнительные значения, влияющие на ответ.
+
+        Returns:
+            tuple[str, int]: ETag и Last-Modified (timestamp, округлённый
+                вверх до секунды).
+        """
+        user = request.user
+        user_id = user.pk if user.is_authenticated else None
+        self.versions = get_versions(user_id)
+        content_version, user_version = self.versions
+        raw = ':'.join(
+            map(
+                str,
+                (
+                    request.get_full_path(),
+                    request.accepted_renderer.format,
+                    user_id,
+                    content_version,
+                    user_version,
+                    updated_at,
+                    *parts,
+                ),
+            )
+        )
+        etag = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+        last_modified = max(updated_at, content_version, user_version or 0)
+        return f'"{etag}"', math.ceil(last_modified)
+
+    @staticmethod
+    def get_not_modified(request, etag: str, last_modified: int):
+        """
+        Возвращает ответ 304, если у клиента актуальная версия, иначе None.
+
+        Last-Modified округлён вверх до секунды, и пока эта секунда
+        не закончилась, в неё может попасть ещё одно изменение. До тех
+        пор `If-Modified-Since` не учитывается и 304 возможен только
+        по ETag.
+        """
+        if last_modified > time.time():
+            last_modified = None
+        return get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+
+    def get_cached_response(self, request, etag: str):
+        """
+        Возвращает готовый ответ из кэша тел или None.
+
+        Ключ кэша сохраняется в `self.body_cache_key`, чтобы
+        `CompressionMiddleware` заполнила кэш построенным ответом.
+        Кэшируются только ответы в формате JSON.
+        """
+        if (
+            not settings.RESPONSE_BODY_CACHE_TIMEOUT
+            or request.accepted_renderer.format != 'json'
+        ):
+            return None
+        self.body_cache_key = make_body_cache_key(request, etag)
+        return get_cached_response(self.body_cache_key)
+
+    @staticmethod
+    def set_validators(request, response, etag: str, last_modified: int):
+        """Добавляет валидаторы в успешный ответ."""
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ('Authorization',))
+        if request.user.is_authenticated:
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class PersonalizedListCacheMixin:
+    """
+    Миксин двухслойного кэша страниц списка рецептов.
+
+    Страница списка одинакова для всех пользователей, кроме флагов
+    `is_favorited`, `is_in_shopping_cart` и `author.is_subscribed`.
+    Поэтому она кэшируется один раз на путь c параметрами и версию
+    данных, а флаги подставляются из множеств id пользователя
+    (`apps.recipes.cache.get_user_relations`). Запросы c фильтрами из
+    `personal_filters` зависят от пользователя и кэшируются отдельно
+    для каждого.
+
+    Используется вместе c `ConditionalGetMixin` (версии и статистика
+    выборки вычисляются при проверке валидаторов).
+    """
+
+    personal_filters = ('is_favorited', 'is_in_shopping_cart')
+
+    def build_list_response(self, queryset):
+        if not settings.RECIPE_LIST_CACHE_TIMEOUT:
+            return super().build_list_response(queryset)
+        digest = self.get_list_cache_digest(self.request)
+        data = get_list_page(digest)
+        if data is None:
+            response = super().build_list_response(queryset)
+            if response.status_code == status.HTTP_200_OK:
+                set_list_page(digest, response.data)
+            return response
+        user = self.request.user
+        relations = (
+            get_user_relations(user.pk, self.versions[1])
+            if user.is_authenticated
+            else UserRelations()
+        )
+        self.apply_user_relations(data, relations)
+        return Response(data)
+
+    def get_list_cache_digest(self, request) -> str:
+        """
+        Вычисляет ключ общей страницы списка.
+
+        В ключ входят полный URL запроса (от него зависят ссылки
+        пагинации и изображений), формат ответа, версия контента
+        и статистика выборки; для персональных фильтров — также
+        пользователь и его версия.
+        """
+        content_version, user_version = self.versions
+        parts = [
+            request.build_absolute_uri(),
+            request.accepted_renderer.format,
+            content_version,
+            *self.list_stats,
+        ]
+        if any(name in request.query_params for name in self.personal_filters):
+            parts += [request.user.pk, user_version]
+        raw = ':'.join(map(str, parts))
+        return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+    @staticmethod
+    def apply_user_relations(data, relations: UserRelations) -> None:
+        """Подставляет флаги пользователя в закэшированную страницу."""
+        results = data['results'] if isinstance(data, dict) else data
+        for recipe in results:
+            if 'is_favorited' in recipe:
+                recipe['is_favorited'] = recipe['id'] in relations.favorites
+            if 'is_in_shopping_cart' in recipe:
+                recipe['is_in_shopping_cart'] = recipe['id'] in relations.cart
+            author = recipe.get('author')
+            if author is not None:
+                author['is_subscribed'] = (
+                    author['id'] in relations.subscriptions
+                )
+
+
+class LeanSerializerMixin:
+    """
+    Миксин выбора облегчённого сериализатора чтения.
+
+    Если `lean_serializer_class` наследует сериализатор, который view
+    выбрала для действия, используется облегчённый вариант (выдаёт тот
+    же JSON быстрее). Отключается настройкой `API_LEAN_SERIALIZERS`.
+    """
+
+    lean_serializer_class = None
+
+    def get_serializer(self, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        lean_class = self.lean_serializer_class
+        if (
+            settings.API_LEAN_SERIALIZERS
+            and lean_class is not None
+            and issubclass(lean_class, serializer_class)
+        ):
+            serializer_class = lean_class
+        kwargs.setdefault('context', self.get_serializer_context())
+        return serializer_class(*args, **kwargs)
+
+
+class SparseFieldsMixin:
+    """
+    Миксин выборочных полей ответа (`?fields=` / `?expand=`).
+
+    Для действий из `sparse_actions` набор полей разбирается
+    сериализатором (`SparseFieldsSerializerMixin.parse_fieldset`)
+    и передаётся ему в `get_serializer`. По `is_field_requested` view
+    пропускает аннотации и связи незапрошенных полей.
+    """
+
+    sparse_actions = ('list', 'retrieve')
+
+    def get_fieldset(self) -> frozenset[str] | None:
+        """Возвращает запрошенные поля или None (все поля)."""
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = None
+            serializer_class = (
+                self.get_serializer_class()
+                if self.action in self.sparse_actions
+                else None
+            )
+            if serializer_class is not None and issubclass(
+                serializer_class, SparseFieldsSerializerMixin
+            ):
+                self._fieldset = serializer_class.parse_fieldset(
+                    self.request.query_params
+                )
+        return self._fieldset
+
+    def is_field_requested(self, name: str) -> bool:
+        """Проверяет, выводится ли поле в ответе."""
+        fieldset = self.get_fieldset()
+        return fieldset is None or name in fieldset
+
+    def get_serializer(self, *args, **kwargs):
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            kwargs.setdefault('fieldset', fieldset)
+        return super().get_serializer(*args, **kwargs)
+
+
+class StatementTimeoutMixin:
+    """
+    Миксин лимита времени SQL-запросов действия view.
+
+    Лимит в миллисекундах берётся из `statement_timeouts` по имени
+    действия, иначе из настройки `API_STATEMENT_TIMEOUT_MS` (0 — без
+    лимита), см. `apps.core.timeouts`. Прерванный по лимиту запрос
+    превращается в ответ 503 c заголовком `Retry-After` и учитывается
+    в метрике `foodgram_statement_timeouts_total`.
+    """
+
+    statement_timeouts: ClassVar[dict[str, int]] = {}
+
+    def get_statement_timeout(self, action: str | None) -> int:
+        """Возвращает лимит времени SQL-запроса действия в мс."""
+        return self.statement_timeouts.get(
+            action, settings.API_STATEMENT_TIMEOUT_MS
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        # `self.action` задаётся уже внутри dispatch (initialize_request)
+        action = self.action_map.get(request.method.lower())
+        with statement_timeout(self.get_statement_timeout(action)):
+            return super().dispatch(request, *args, **kwargs)
+
+    def handle_exception(self, exc):
+        if is_statement_timeout(exc):
+            match = self.request.resolver_match
+            registry.inc(
+                'foodgram_statement_timeouts_total',
+                {'view': match.view_name if match else '<unresolved>'},
+            )
+            exc = StatementTimeoutExceeded()
+        return super().handle_exception(exc)
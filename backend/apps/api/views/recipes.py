@@ -1,5 +1,6 @@
 # ruff: noqa: RUF012
 from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
 from rest_framework.permissions import AllowAny
@@ -9,21 +10,29 @@ from apps.api.pagination import LimitPageNumberPagination
 from apps.api.permissions import IsAuthorOrReadOnly
 from apps.api.serializers import (
     IngredientSerializer,
+    LeanIngredientSerializer,
+    LeanRecipeReadSerializer,
     RecipeReadSerializer,
     RecipeWriteSerializer,
     TagSerializer,
 )
 from apps.api.views import (
+    ConditionalGetMixin,
     FavoriteManagerMixin,
+    LeanSerializerMixin,
+    PersonalizedListCacheMixin,
     ShoppingCartManagerMixin,
     ShortLinkMixin,
+    SparseFieldsMixin,
+    StatementTimeoutMixin,
 )
 from apps.recipes.models import Ingredient, Recipe, Tag
+from apps.users.models import Cart, Favorite, Subscribe
 
 User = get_user_model()
 
 
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(StatementTimeoutMixin, viewsets.ModelViewSet):
     """ViewSet для получения информации o тегах."""
 
     queryset = Tag.objects.all()
@@ -33,23 +42,32 @@ class TagViewSet(viewsets.ModelViewSet):
     http_method_names = ['get']
 
 
-class IngredientViewSet(viewsets.ModelViewSet):
+class IngredientViewSet(
+    StatementTimeoutMixin, LeanSerializerMixin, viewsets.ModelViewSet
+):
     """
     ViewSet для модели Ingredient.
 
     Поддерживает поиск по частичному вхождению в начале названия ингредиента.
     """
 
-    queryset = Ingredient.objects.all()
+    queryset = Ingredient.objects.select_related('measurement_unit')
     serializer_class = IngredientSerializer
+    lean_serializer_class = LeanIngredientSerializer
     http_method_names = ['get']
     pagination_class = None
     permission_classes = (AllowAny,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = IngredientFilter
+    statement_timeouts = {'list': 1000}
 
 
 class RecipeViewSet(
+    StatementTimeoutMixin,
+    PersonalizedListCacheMixin,
+    ConditionalGetMixin,
+    SparseFieldsMixin,
+    LeanSerializerMixin,
     FavoriteManagerMixin,
     ShoppingCartManagerMixin,
     ShortLinkMixin,
@@ -65,19 +83,79 @@ class RecipeViewSet(
     - Управление избранными рецептами
     - Управление корзиной покупок
     - Генерация коротких ссылок
+    - Условные GET (ETag / Last-Modified) для списка и рецепта
+    - Общий для пользователей кэш страниц списка c персональными флагами
+    - Облегчённый сериализатор чтения (LeanSerializerMixin)
+    - Выборочные поля ответа `?fields=` / `?expand=` (SparseFieldsMixin)
+    - Лимиты времени SQL-запросов по действиям (StatementTimeoutMixin)
     """
 
-    queryset = Recipe.objects.select_related('author').prefetch_related(
-        'tags', 'recipe_ingredients__ingredient__measurement_unit'
-    )
+    queryset = Recipe.objects.for_list()
+    lean_serializer_class = LeanRecipeReadSerializer
+    heavy_fields = ('text',)
+    full_actions = ('list', 'retrieve', 'create', 'update', 'partial_update')
     permission_classes = (IsAuthorOrReadOnly,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
     pagination_class = LimitPageNumberPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
+    statement_timeouts = {'list': 3000, 'download_shopping_cart': 10000}
 
     def get_serializer_class(self):
         """Возвращает сериализатор в зависимости от действия."""
         if self.action in ['create', 'update', 'partial_update']:
             return RecipeWriteSerializer
         return RecipeReadSerializer
+
+    def get_deferred_fields(self) -> set[str]:
+        """
+        Возвращает тяжёлые колонки, не загружаемые основным запросом.
+
+        Полностью рецепт загружается только действиями, которые выводят
+        его целиком (`full_actions`), кроме полей, исключённых через
+        `?fields=`. Остальные действия (избранное, корзина, ссылка,
+        удаление) текст не выводят и не загружают.
+        """
+        if self.action not in self.full_actions:
+            return set(self.heavy_fields)
+        return {
+            name
+            for name in self.heavy_fields
+            if not self.is_field_requested(name)
+        }
+
+    def get_queryset(self):
+        """
+        Аннотирует флаги текущего пользователя.
+
+        `is_favorited`, `is_in_shopping_cart` и `is_subscribed` (подписка
+        на автора) вычисляются подзапросами в основном запросе, чтобы
+        сериализатор не делал отдельный запрос на каждый рецепт.
+        C выборочными полями флаги и автор загружаются, только если
+        запрошены; тяжёлые колонки см. в `get_deferred_fields`.
+        Сортируется только список (`for_list`), остальным действиям
+        порядок не нужен (`for_detail`).
+        """
+        queryset = super().get_queryset().defer(*self.get_deferred_fields())
+        if self.action != 'list':
+            queryset = queryset.for_detail()
+        requested = self.is_field_requested
+        if not requested('author'):
+            queryset = queryset.select_related(None)
+        user = self.request.user
+        if not user.is_authenticated:
+            return queryset
+        flags = {}
+        if requested('is_favorited'):
+            flags['is_favorited'] = Exists(
+                Favorite.objects.filter(user=user, recipe=OuterRef('pk'))
+            )
+        if requested('is_in_shopping_cart'):
+            flags['is_in_shopping_cart'] = Exists(
+                Cart.objects.filter(user=user, recipe=OuterRef('pk'))
+            )
+        if requested('author'):
+            flags['is_subscribed'] = Exists(
+                Subscribe.objects.filter(user=user, author=OuterRef('author'))
+            )
+        return queryset.annotate(**flags)
@@ -7,6 +7,7 @@ from rest_framework.response import Response
 
 from apps.api.permissions import DenyAll
 from apps.api.serializers import (
+    LeanUserSerializer,
     UserAvatarSerializer,
     UserCreateSerializer,
     UserReadSerializer,
@@ -14,6 +15,9 @@ from apps.api.serializers import (
 from apps.api.views import (
     AvatarManagementMixin,
     DisableDjoserActionsMixin,
+    LeanSerializerMixin,
+    SparseFieldsMixin,
+    StatementTimeoutMixin,
     SubscriptionMixin,
 )
 from apps.core.constants import DISABLED_ACTIONS_DJOSER
@@ -22,9 +26,12 @@ User = get_user_model()
 
 
 class UserViewSet(
+    StatementTimeoutMixin,
     DisableDjoserActionsMixin,
     AvatarManagementMixin,
     SubscriptionMixin,
+    SparseFieldsMixin,
+    LeanSerializerMixin,
     DjoserUserViewSet,
 ):
     """
@@ -35,10 +42,21 @@ class UserViewSet(
     - Отключение стандартных Djoser действий (DisableDjoserActionsMixin)
     - Управление аватарами (AvatarManagementMixin)
     - Управление подписками (SubscriptionMixin)
+    - Облегчённый сериализатор чтения (LeanSerializerMixin)
+    - Выборочные поля ответа `?fields=` (SparseFieldsMixin)
+    - Лимиты времени SQL-запросов по действиям (StatementTimeoutMixin)
     """
 
+    lean_serializer_class = LeanUserSerializer
+    sparse_actions = ('list', 'retrieve', 'me')
+    statement_timeouts = {'subscriptions': 3000}  # noqa: RUF012
     http_method_names = ['get', 'post', 'put', 'delete']  # noqa: RUF012
 
+    @property
+    def verify_token_in_db(self) -> bool:
+        """Смена пароля проверяет токен по БД, минуя кэш."""
+        return self.action == 'set_password'
+
     def get_serializer_class(self):
         """Выбор сериализатора в зависимости от действия."""
         if self.action == 'set_password':
@@ -0,0 +1,81 @@
+from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from apps.core.admin_mixins import NoAddMixin, NoChangeMixin
+from apps.core.models import ProfileDump
+
+
+@admin.register(ProfileDump)
+class ProfileDumpAdmin(NoAddMixin, NoChangeMixin, admin.ModelAdmin):
+    """
+    Админ-класс для профилей запросов.
+
+    Позволяет просмотреть сводку и скачать `.prof`-файл для анализа
+    (`python -m pstats`, snakeviz и т.п.).
+    """
+
+    list_display = (
+        'created_at',
+        'method',
+        'path',
+        'status',
+        'duration_ms',
+        'trigger',
+        'user',
+        'download_link',
+    )
+    list_filter = ('trigger', 'method', 'view_name', 'created_at')
+    search_fields = ('path', 'view_name')
+    date_hierarchy = 'created_at'
+    list_select_related = ('user',)
+    fields = (
+        'created_at',
+        ('method', 'status', 'duration_ms'),
+        'path',
+        'view_name',
+        ('trigger', 'user'),
+        'download_link',
+        'summary_display',
+    )
+    readonly_fields = ('download_link', 'summary_display')
+
+    def get_urls(self):
+        return [
+            path(
+                '<int:pk>/download/',
+                self.admin_site.admin_view(self.download_view),
+                name='core_profiledump_download',
+            ),
+            *super().get_urls(),
+        ]
+
+    def download_view(self, request, pk):
+        """Отдаёт файл профиля."""
+        if not self.has_view_permission(request):
+            raise Http404
+        dump = get_object_or_404(ProfileDump, pk=pk)
+        try:
+            return FileResponse(
+                dump.file_path.open('rb'),
+                as_attachment=True,
+                filename=dump.file_name,
+            )
+        except FileNotFoundError as e:
+            raise Http404 from e
+
+    @admin.display(description='Файл')
+    def download_link(self, obj):
+        """Ссылка на скачивание профиля."""
+        return format_html(
+            '<a href="{}">{}</a>',
+            reverse('admin:core_profiledump_download', args=(obj.pk,)),
+            obj.file_name,
+        )
+
+    @admin.display(description='Сводка')
+    def summary_display(self, obj):
+        """Сводка pstats моноширинным шрифтом."""
+        return format_html('<pre>{}</pre>', obj.summary)
@@ -0,0 +1,128 @@
+"""
+Контроль допуска запросов (load shedding) в пределах одного воркера.
+
+Нагрузка воркера — наибольшее из отношений:
+- запросов в обработке к `ADMISSION_CONTROL['MAX_IN_FLIGHT']`;
+- медианы времени ответа за последние `WINDOW_SECONDS` секунд
+  к `LATENCY_TARGET_MS`;
+- времени ожидания запроса в очереди (заголовок `X-Request-Start`
+  от nginx) к `QUEUE_TARGET_MS`.
+
+При нагрузке больше 1 отклоняются запросы c приоритетом `LOW`,
+больше `NORMAL_SHED_LOAD` — и c приоритетом `NORMAL`. Запросы `HIGH`
+(авторизация и запись) не отклоняются никогда.
+"""
+
+import statistics
+import threading
+import time
+
+from collections import deque
+from enum import IntEnum
+from typing import NamedTuple
+
+from django.conf import settings
+
+# Сколько последних времён ответа хранится для медианы
+LATENCY_SAMPLES = 256
+
+
+class Priority(IntEnum):
+    """Приоритет запроса при перегрузке."""
+
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+
+
+class RoutePriority(NamedTuple):
+    """
+    Приоритет маршрута.
+
+    Attributes:
+        default (Priority): Приоритет запросов c токеном или сессией.
+        anonymous (Priority | None): Приоритет запросов без учётных
+            данных; None — как `default`.
+    """
+
+    default: Priority
+    anonymous: Priority | None = None
+
+
+def parse_request_start(value: str | None) -> float:
+    """
+    Возвращает время ожидания запроса в очереди, мс.
+
+    Args:
+        value (str | None): Заголовок `X-Request-Start` в формате nginx
+            (`t=<секунды c миллисекундами>`).
+
+    Returns:
+        float: Время ожидания; 0, если заголовка нет или он некорректен.
+    """
+    if not value:
+        return 0.0
+    try:
+        started = float(value.removeprefix('t='))
+    except ValueError:
+        return 0.0
+    return max(0.0, (time.time() - started) * 1000)
+
+
+class AdmissionController:
+    """Потокобезопасный учёт нагрузки воркера."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: deque[tuple[float, float]] = deque(
+            maxlen=LATENCY_SAMPLES
+        )
+        self.in_flight = 0
+
+    def started(self) -> None:
+        """Отмечает начало обработки запроса."""
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, duration_ms: float | None) -> None:
+        """
+        Отмечает завершение запроса.
+
+        Args:
+            duration_ms (float | None): Время ответа; None — не учитывать
+                (отклонённые и высокоприоритетные запросы).
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if duration_ms is not None:
+                self._latencies.append((time.monotonic(), duration_ms))
+
+    def load(self, queue_ms: float = 0.0) -> float:
+        """Возвращает текущую нагрузку воркера (1 — на пределе)."""
+        config = settings.ADMISSION_CONTROL
+        horizon = time.monotonic() - config['WINDOW_SECONDS']
+        with self._lock:
+            while self._latencies and self._latencies[0][0] < horizon:
+                self._latencies.popleft()
+            latencies = [duration for _, duration in self._latencies]
+            in_flight = self.in_flight
+        latency = statistics.median(latencies) if latencies else 0.0
+        return max(
+            in_flight / config['MAX_IN_FLIGHT'],
+            latency / config['LATENCY_TARGET_MS'],
+            queue_ms / config['QUEUE_TARGET_MS'],
+        )
+
+    def admits(self, priority: Priority, queue_ms: float = 0.0) -> bool:
+        """Проверяет, можно ли обработать запрос c приоритетом."""
+        if priority is Priority.HIGH:
+            return True
+        limit = (
+            1.0
+            if priority is Priority.LOW
+            else settings.ADMISSION_CONTROL['NORMAL_SHED_LOAD']
+        )
+        return self.load(queue_ms) <= limit
+
+
+controller = AdmissionController()
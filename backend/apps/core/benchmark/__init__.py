@@ -0,0 +1,37 @@
+"""
+Пакет `benchmark` — нагрузочные замеры API через тестовый клиент Django.
+
+Модули:
+    - dataset.py    — генерация воспроизводимого набора данных
+    - scenarios.py  — описание эндпоинтов router_v1 и их бюджетов запросов
+    - runner.py     — прогон сценариев, сбор метрик, сравнение c baseline
+                      и замеры JSON-рендереров и сериализаторов
+    - advisor.py    — поиск полных сканирований и сортировок в планах
+"""
+
+from .advisor import find_plan_issues, normalize_sql
+from .dataset import BenchmarkDataset, generate_dataset
+from .runner import (
+    check_lean_serializers,
+    compare_results,
+    explain_queries,
+    run_endpoint,
+    run_recipe_page,
+    run_renderers,
+)
+from .scenarios import ENDPOINTS, Endpoint
+
+__all__ = [
+    'ENDPOINTS',
+    'BenchmarkDataset',
+    'Endpoint',
+    'check_lean_serializers',
+    'compare_results',
+    'explain_queries',
+    'find_plan_issues',
+    'generate_dataset',
+    'normalize_sql',
+    'run_endpoint',
+    'run_recipe_page',
+    'run_renderers',
+]
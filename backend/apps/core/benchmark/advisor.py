@@ -0,0 +1,45 @@
+import re
+
+# Полное сканирование таблицы: SQLite (`SCAN t` без индекса) и PostgreSQL
+SEQ_SCAN_PATTERNS = (
+    re.compile(r'\bSCAN (?P<table>\w+)$'),
+    re.compile(r'\bSeq Scan on (?P<table>\w+)'),
+)
+# Литералы, по которым запросы разных прогонов отличаются
+LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+IN_LIST_PATTERN = re.compile(r'IN \((?:\?, )*\?\)')
+# Сортировка результата без подходящего индекса
+SORT_PATTERNS = (
+    re.compile(r'\bUSE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY\b'),
+    re.compile(r'(?:^|->)\s*(?:Incremental )?Sort\s+\('),
+)
+
+
+def normalize_sql(sql: str) -> str:
+    """Заменяет литералы на `?`, чтобы сгруппировать одинаковые запросы."""
+    return IN_LIST_PATTERN.sub('IN (...)', LITERAL_PATTERN.sub('?', sql))
+
+
+def find_plan_issues(plan: list[str], tables=None) -> list[str]:
+    """
+    Находит в плане выполнения полные сканирования таблиц и сортировки.
+
+    Понимает вывод `EXPLAIN QUERY PLAN` SQLite и `EXPLAIN` PostgreSQL.
+
+    Args:
+        plan (list[str]): Строки плана из `explain_queries`.
+        tables (Collection[str] | None): Таблицы БД; сканирования
+            подзапросов и других промежуточных результатов пропускаются.
+
+    Returns:
+        list[str]: Описания проблем в порядке появления в плане.
+    """
+    issues = []
+    for line in plan:
+        for pattern in SEQ_SCAN_PATTERNS:
+            match = pattern.search(line.strip())
+            if match and (tables is None or match['table'] in tables):
+                issues.append(f'seq scan: {match["table"]}')
+        if any(pattern.search(line.strip()) for pattern in SORT_PATTERNS):
+            issues.append('sort')
+    return issues
@@ -0,0 +1,208 @@
+import random
+
+from dataclasses import dataclass, field
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from rest_framework.authtoken.models import Token
+
+from apps.recipes.models import (
+    Ingredient,
+    MeasurementUnit,
+    Recipe,
+    RecipeIngredient,
+    Tag,
+)
+from apps.recipes.services import update_tags_masks
+from apps.users.models import Cart, Favorite, Subscribe
+
+User = get_user_model()
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+BENCHMARK_IMAGE = 'recipes/benchmark/default.png'
+
+USERS_PER_SCALE = 20
+RECIPES_PER_SCALE = 200
+INGREDIENTS_PER_SCALE = 300
+TAGS_COUNT = 12
+UNITS_COUNT = 8
+INGREDIENTS_PER_RECIPE = (3, 10)
+TAGS_PER_RECIPE = (1, 3)
+RELATIONS_PER_USER = 15
+SUBSCRIPTIONS_PER_USER = 8
+BULK_RELATION_IDS = 10
+
+
+@dataclass
+class BenchmarkDataset:
+    """
+    Сгенерированный набор данных и идентификаторы для сценариев.
+
+    Attributes:
+        user (User): Пользователь, от имени которого идут запросы.
+        token (Token): Токен пользователя для TokenAuthentication.
+        author (User): Автор, на которого пользователь не подписан.
+        own_recipe_id (int): Рецепт, принадлежащий пользователю.
+        free_recipe_id (int): Рецепт не в избранном и не в корзине.
+        free_recipe_ids (list[int]): Рецепты не в избранном и не
+            в корзине для пакетных сценариев.
+        recipe_ids (list[int]): Все сгенерированные рецепты.
+        tag_ids (list[int]): Все сгенерированные теги.
+        tag_slugs (list[str]): Slug'и сгенерированных тегов.
+        ingredient_ids (list[int]): Все сгенерированные ингредиенты.
+        disposable_recipe_id (int | None): Рецепт, созданный для удаления.
+    """
+
+    user: User
+    token: Token
+    author: User
+    own_recipe_id: int
+    free_recipe_id: int
+    free_recipe_ids: list[int] = field(default_factory=list)
+    recipe_ids: list[int] = field(default_factory=list)
+    tag_ids: list[int] = field(default_factory=list)
+    tag_slugs: list[str] = field(default_factory=list)
+    ingredient_ids: list[int] = field(default_factory=list)
+    disposable_recipe_id: int | None = None
+
+
+def _letters(number: int) -> str:
+    """Кодирует число буквами, т.к. имена допускают только буквы."""
+    result = ''
+    number += 1
+    while number:
+        number, rest = divmod(number - 1, 26)
+        result = chr(ord('a') + rest) + result
+    return result
+
+
+def _create_users(count: int) -> list:
+    password = make_password(BENCHMARK_PASSWORD)
+    return User.objects.bulk_create(
+        User(
+            username=f'bench_user_{index}',
+            email=f'bench_user_{index}@example.com',
+            first_name=f'Bench{_letters(index)}',
+            last_name=f'User{_letters(index)}',
+            password=password,
+        )
+        for index in range(count)
+    )
+
+
+def _create_catalog(ingredients_count: int) -> tuple[list, list]:
+    units = MeasurementUnit.objects.bulk_create(
+        MeasurementUnit(name=f'bench unit {index}')
+        for index in range(UNITS_COUNT)
+    )
+    ingredients = Ingredient.objects.bulk_create(
+        Ingredient(
+            name=f'bench ingredient {index}',
+            measurement_unit=units[index % len(units)],
+        )
+        for index in range(ingredients_count)
+    )
+    tags = Tag.objects.bulk_create(
+        Tag(name=f'bench tag {index}', slug=f'bench-tag-{index}', bit=index)
+        for index in range(TAGS_COUNT)
+    )
+    return ingredients, tags
+
+
+def _create_recipes(rng, count: int, authors, ingredients, tags) -> list:
+    recipes = Recipe.objects.bulk_create(
+        Recipe(
+            name=f'Bench recipe {index}',
+            author=authors[index % len(authors)],
+            text=f'Bench recipe {index} instructions. ' * rng.randint(5, 60),
+            image=BENCHMARK_IMAGE,
+            cooking_time=rng.randint(5, 180),
+            short_code=f'B{index:07d}',
+        )
+        for index in range(count)
+    )
+    RecipeIngredient.objects.bulk_create(
+        RecipeIngredient(
+            recipe=recipe, ingredient=ingredient, amount=rng.randint(1, 500)
+        )
+        for recipe in recipes
+        for ingredient in rng.sample(
+            ingredients, rng.randint(*INGREDIENTS_PER_RECIPE)
+        )
+    )
+    Recipe.tags.through.objects.bulk_create(
+        Recipe.tags.through(recipe_id=recipe.pk, tag_id=tag.pk)
+        for recipe in recipes
+        for tag in rng.sample(tags, rng.randint(*TAGS_PER_RECIPE))
+    )
+    update_tags_masks([recipe.pk for recipe in recipes])
+    return recipes
+
+
+def _create_relations(rng, users, recipes) -> None:
+    Favorite.objects.bulk_create(
+        Favorite(user=user, recipe=recipe)
+        for user in users
+        for recipe in rng.sample(recipes, RELATIONS_PER_USER)
+    )
+    Cart.objects.bulk_create(
+        Cart(user=user, recipe=recipe)
+        for user in users
+        for recipe in rng.sample(recipes, RELATIONS_PER_USER)
+    )
+    Subscribe.objects.bulk_create(
+        Subscribe(user=user, author=author)
+        for user in users
+        for author in rng.sample(users, SUBSCRIPTIONS_PER_USER + 1)
+        if author != user
+    )
+
+
+def generate_dataset(scale: int = 1, seed: int = 0) -> BenchmarkDataset:
+    """
+    Заполняет БД воспроизводимым набором данных для замеров.
+
+    Рассчитана на пустую (тестовую) БД: объекты создаются через
+    bulk_create без вызова save() и сигналов.
+
+    Args:
+        scale (int): Множитель объёма данных.
+        seed (int): Зерно генератора случайных чисел.
+
+    Returns:
+        BenchmarkDataset: Пользователь для запросов и идентификаторы.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    users = _create_users(USERS_PER_SCALE * scale)
+    ingredients, tags = _create_catalog(INGREDIENTS_PER_SCALE * scale)
+    recipes = _create_recipes(
+        rng, RECIPES_PER_SCALE * scale, users, ingredients, tags
+    )
+    _create_relations(rng, users, recipes)
+
+    user = users[0]
+    subscribed = set(
+        Subscribe.objects.filter(user=user).values_list('author', flat=True)
+    )
+    author = next(other for other in users[1:] if other.pk not in subscribed)
+    related = set(
+        Favorite.objects.filter(user=user).values_list('recipe', flat=True)
+    ) | set(Cart.objects.filter(user=user).values_list('recipe', flat=True))
+    free_recipe_ids = [
+        recipe.pk for recipe in recipes if recipe.pk not in related
+    ][:BULK_RELATION_IDS]
+
+    return BenchmarkDataset(
+        user=user,
+        token=Token.objects.create(user=user),
+        author=author,
+        own_recipe_id=next(
+            recipe.pk for recipe in recipes if recipe.author_id == user.pk
+        ),
+        free_recipe_id=free_recipe_ids[0],
+        free_recipe_ids=free_recipe_ids,
+        recipe_ids=[recipe.pk for recipe in recipes],
+        tag_ids=[tag.pk for tag in tags],
+        tag_slugs=[tag.slug for tag in tags],
+        ingredient_ids=[ingredient.pk for ingredient in ingredients],
+    )
@@ -0,0 +1,404 @@
+import io
+import statistics
+import time
+import tracemalloc
+
+from contextlib import ExitStack
+
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import prefetch_related_objects
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.api.parsers import FastJSONParser
+from apps.api.renderers import FastJSONRenderer, orjson
+from apps.api.serializers import LeanRecipeReadSerializer, RecipeReadSerializer
+from apps.api.views import RecipeViewSet
+from apps.core.benchmark.dataset import BenchmarkDataset
+from apps.core.benchmark.scenarios import Endpoint
+
+PERCENTILES = (50, 90, 99)
+MEMORY_ITERATIONS = 3
+
+
+def _make_client(endpoint: Endpoint, dataset: BenchmarkDataset) -> APIClient:
+    """
+    Создаёт клиент c учётом настроенных классов аутентификации.
+
+    Бюджеты запросов рассчитаны на TokenAuthentication (production):
+    если она включена, запросы идут c заголовком `Authorization: Token ...`
+    и проверка токена попадает в замер. Иначе (режим разработки)
+    аутентификация принудительная и запросов не добавляет.
+    """
+    client = APIClient()
+    if not endpoint.auth:
+        return client
+    token_auth = any(
+        issubclass(auth_class, TokenAuthentication)
+        for auth_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    )
+    if token_auth:
+        client.credentials(HTTP_AUTHORIZATION=f'Token {dataset.token.key}')
+    else:
+        client.force_authenticate(dataset.user)
+    return client
+
+
+def _send(client: APIClient, endpoint: Endpoint, dataset: BenchmarkDataset):
+    if endpoint.setup:
+        endpoint.setup(dataset)
+    path = reverse(
+        f'api_v1:{endpoint.url_name}',
+        kwargs=endpoint.url_kwargs(dataset) if endpoint.url_kwargs else None,
+    )
+    if endpoint.method == 'get':
+        data = endpoint.params(dataset) if endpoint.params else None
+        headers = {}
+        if endpoint.accept_encoding:
+            headers['HTTP_ACCEPT_ENCODING'] = endpoint.accept_encoding
+        if endpoint.revalidate:
+            previous = client.get(path, data, **headers)
+            headers['HTTP_IF_NONE_MATCH'] = previous['ETag']
+        return path, lambda: client.get(path, data, **headers)
+    data = endpoint.payload(dataset) if endpoint.payload else None
+    method = getattr(client, endpoint.method)
+    return path, lambda: method(path, data, format='json')
+
+
+def _finish(endpoint: Endpoint, dataset: BenchmarkDataset, response) -> None:
+    if endpoint.teardown:
+        endpoint.teardown(dataset, response)
+    if response.status_code != endpoint.status:
+        msg = (
+            f'{endpoint.name}: ожидался статус {endpoint.status}, '
+            f'получен {response.status_code}: {response.content[:300]!r}'
+        )
+        raise AssertionError(msg)
+
+
+def _percentiles(samples: list[float]) -> dict:
+    if len(samples) < 2:  # noqa: PLR2004
+        value = samples[0] if samples else 0.0
+        return {f'p{percent}': value for percent in PERCENTILES}
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {f'p{percent}': cuts[percent - 1] for percent in PERCENTILES}
+
+
+def explain_queries(queries: list[tuple[str, str]]) -> list[dict]:
+    """
+    Возвращает планы выполнения SELECT-запросов.
+
+    Args:
+        queries (list[tuple[str, str]]): Алиас БД и SQL c подставленными
+            параметрами, как в `CaptureQueriesContext`.
+
+    Returns:
+        list[dict]: SQL (`sql`) и строки плана (`plan`) по запросам.
+    """
+    plans = []
+    for alias, sql in queries:
+        if not sql.lstrip().upper().startswith('SELECT'):
+            continue
+        connection = connections[alias]
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}')
+            plan = [' '.join(map(str, row)) for row in cursor.fetchall()]
+        plans.append({'sql': sql, 'plan': plan})
+    return plans
+
+
+def run_endpoint(
+    endpoint: Endpoint,
+    dataset: BenchmarkDataset,
+    iterations: int,
+    warmup: int = 1,
+    explain: bool = False,
+) -> dict:
+    """
+    Замеряет один сценарий.
+
+    Перед сценарием кэш очищается, чтобы лимиты throttling не влияли
+    на результат. Прогоны делятся на три фазы: прогрев, замер времени
+    и SQL-запросов, замер памяти через tracemalloc (отдельно, т.к.
+    tracemalloc заметно замедляет выполнение).
+
+    Args:
+        endpoint (Endpoint): Сценарий.
+        dataset (BenchmarkDataset): Набор данных.
+        iterations (int): Количество замеряемых запросов.
+        warmup (int): Количество запросов прогрева.
+        explain (bool): Добавить в результат планы выполнения
+            SELECT-запросов (`plans`).
+
+    Returns:
+        dict: Результаты сценария, пригодные для сериализации в JSON.
+
+    Raises:
+        AssertionError: Если эндпоинт вернул неожиданный статус.
+    """
+    cache.clear()
+    client = _make_client(endpoint, dataset)
+
+    for _ in range(warmup):
+        _, request = _send(client, endpoint, dataset)
+        _finish(endpoint, dataset, request())
+
+    latencies, query_counts = [], []
+    slowest_queries = []
+    for _ in range(iterations):
+        path, request = _send(client, endpoint, dataset)
+        with ExitStack() as stack:
+            contexts = [
+                stack.enter_context(CaptureQueriesContext(connection))
+                for connection in connections.all()
+            ]
+            start = time.perf_counter()
+            response = request()
+            latencies.append((time.perf_counter() - start) * 1000)
+        _finish(endpoint, dataset, response)
+        queries = [
+            (ctx.connection.alias, query['sql'])
+            for ctx in contexts
+            for query in ctx.captured_queries
+        ]
+        query_counts.append(len(queries))
+        if len(queries) >= len(slowest_queries):
+            slowest_queries = queries
+
+    peaks = []
+    for _ in range(MEMORY_ITERATIONS):
+        _, request = _send(client, endpoint, dataset)
+        tracemalloc.start()
+        try:
+            response = request()
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+        _finish(endpoint, dataset, response)
+
+    result = {
+        'name': endpoint.name,
+        'method': endpoint.method.upper(),
+        'path': path,
+        'status': endpoint.status,
+        'iterations': iterations,
+        'latency_ms': {
+            'mean': statistics.fmean(latencies),
+            'min': min(latencies),
+            'max': max(latencies),
+            **_percentiles(latencies),
+        },
+        'memory_peak_kb': max(peaks) / 1024,
+        'size_kb': len(response.content) / 1024,
+        'content_encoding': response.get('Content-Encoding', ''),
+        'queries': max(query_counts),
+        'query_budget': endpoint.query_budget,
+        'over_budget': max(query_counts) > endpoint.query_budget,
+        'sql': [sql for _, sql in slowest_queries],
+    }
+    if endpoint.order_by_budget is not None:
+        ordered = sum('ORDER BY' in sql for _, sql in slowest_queries)
+        result['ordered_queries'] = ordered
+        result['order_by_budget'] = endpoint.order_by_budget
+        result['over_budget'] |= ordered > endpoint.order_by_budget
+    if explain:
+        result['plans'] = explain_queries(slowest_queries)
+    return result
+
+
+def _median_ms(func, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run_renderers(
+    endpoint: Endpoint, dataset: BenchmarkDataset, iterations: int
+) -> dict | None:
+    """
+    Сравнивает JSONRenderer/JSONParser DRF c FastJSONRenderer/Parser.
+
+    Данные берутся из настоящего ответа GET-сценария; замеряется только
+    сериализация в JSON и разбор результата обратно.
+
+    Args:
+        endpoint (Endpoint): Сценарий.
+        dataset (BenchmarkDataset): Набор данных.
+        iterations (int): Количество замеров каждой операции.
+
+    Returns:
+        dict | None: Медианы времени, размер ответа и совпадение вывода
+            обоих рендереров или None, если у сценария нет тела ответа.
+    """
+    if endpoint.method != 'get' or endpoint.revalidate:
+        return None
+    cache.clear()
+    client = _make_client(endpoint, dataset)
+    _, request = _send(client, endpoint, dataset)
+    response = request()
+    _finish(endpoint, dataset, response)
+    data = getattr(response, 'data', None)
+    if data is None:
+        return None
+
+    renderers = {'json': JSONRenderer(), 'fast': FastJSONRenderer()}
+    parsers = {'json': JSONParser(), 'fast': FastJSONParser()}
+    outputs = {
+        name: renderer.render(data, 'application/json')
+        for name, renderer in renderers.items()
+    }
+    return {
+        'name': endpoint.name,
+        'backend': 'orjson' if orjson is not None else 'json',
+        'size_kb': len(outputs['json']) / 1024,
+        'identical': outputs['json'] == outputs['fast'],
+        'render_ms': {
+            name: _median_ms(
+                lambda renderer=renderer: renderer.render(
+                    data, 'application/json'
+                ),
+                iterations,
+            )
+            for name, renderer in renderers.items()
+        },
+        'parse_ms': {
+            name: _median_ms(
+                lambda parser=parser: parser.parse(
+                    io.BytesIO(outputs['json'])
+                ),
+                iterations,
+            )
+            for name, parser in parsers.items()
+        },
+    }
+
+
+def check_lean_serializers(
+    endpoint: Endpoint, dataset: BenchmarkDataset
+) -> bool | None:
+    """
+    Сравнивает ответы GET-сценария c облегчёнными и обычными
+    сериализаторами (кэши ответов и фрагментов отключены).
+
+    Returns:
+        bool | None: Совпадают ли ответы побайтно; None, если сценарий
+            не возвращает тело ответа.
+    """
+    if endpoint.method != 'get' or endpoint.revalidate:
+        return None
+    client = _make_client(endpoint, dataset)
+    contents = []
+    for lean in (False, True):
+        cache.clear()
+        with override_settings(
+            API_LEAN_SERIALIZERS=lean,
+            RECIPE_LIST_CACHE_TIMEOUT=0,
+            RECIPE_FRAGMENT_CACHE_TIMEOUT=0,
+        ):
+            _, request = _send(client, endpoint, dataset)
+            response = request()
+        _finish(endpoint, dataset, response)
+        contents.append(response.content)
+    if not contents[0]:
+        return None
+    return contents[0] == contents[1]
+
+
+def run_recipe_page(
+    dataset: BenchmarkDataset, iterations: int, page_size: int = 50
+) -> dict:
+    """
+    Замеряет сериализацию страницы рецептов без кэша фрагментов.
+
+    Рецепты c аннотациями пользователя и связанными объектами
+    загружаются заранее, поэтому замеряется только работа
+    сериализаторов `RecipeReadSerializer` и `LeanRecipeReadSerializer`.
+
+    Args:
+        dataset (BenchmarkDataset): Набор данных.
+        iterations (int): Количество замеров.
+        page_size (int): Количество рецептов на странице.
+
+    Returns:
+        dict: Медианы времени и побайтное совпадение JSON.
+    """
+    request = Request(
+        APIRequestFactory().get('/api/v1/recipes/', HTTP_HOST='localhost')
+    )
+    request.user = dataset.user
+    view = RecipeViewSet(request=request, format_kwarg=None, action='list')
+    recipes = list(view.get_queryset()[:page_size])
+    prefetch_related_objects(recipes, *RecipeReadSerializer.prefetch_lookups)
+    context = {'request': request, 'view': view}
+    serializers = {
+        'drf': RecipeReadSerializer,
+        'lean': LeanRecipeReadSerializer,
+    }
+    with override_settings(RECIPE_FRAGMENT_CACHE_TIMEOUT=0):
+        outputs = {
+            name: JSONRenderer().render(
+                serializer(recipes, many=True, context=context).data
+            )
+            for name, serializer in serializers.items()
+        }
+        timings = {
+            name: _median_ms(
+                lambda serializer=serializer: serializer(
+                    recipes, many=True, context=context
+                ).data,
+                iterations,
+            )
+            for name, serializer in serializers.items()
+        }
+    return {
+        'name': f'recipes-page-{page_size}',
+        'identical': outputs['drf'] == outputs['lean'],
+        'serialize_ms': timings,
+    }
+
+
+def compare_results(
+    current: list[dict], baseline: list[dict], tolerance: float
+) -> list[str]:
+    """
+    Сравнивает результаты прогона c сохранённым baseline.
+
+    Регрессией считается рост числа запросов или рост медианной
+    задержки больше чем на `tolerance` (доля от baseline).
+
+    Args:
+        current (list[dict]): Результаты текущего прогона.
+        baseline (list[dict]): Результаты предыдущего прогона.
+        tolerance (float): Допустимый относительный рост задержки.
+
+    Returns:
+        list[str]: Описания найденных регрессий.
+    """
+    previous = {result['name']: result for result in baseline}
+    regressions = []
+    for result in current:
+        before = previous.get(result['name'])
+        if before is None:
+            continue
+        if result['queries'] > before['queries']:
+            regressions.append(
+                f'{result["name"]}: запросов {before["queries"]} → '
+                f'{result["queries"]}'
+            )
+        p50 = result['latency_ms']['p50']
+        p50_before = before['latency_ms']['p50']
+        if p50 > p50_before * (1 + tolerance):
+            regressions.append(
+                f'{result["name"]}: p50 {p50_before:.2f} → {p50:.2f} мс'
+            )
+    return regressions
@@ -0,0 +1,499 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from http import HTTPStatus
+
+from django.core.cache import cache
+
+from apps.core.benchmark.dataset import BenchmarkDataset
+from apps.recipes.cache import bump_content_version, bump_user_state_version
+from apps.recipes.models import Recipe
+from apps.users.models import Cart, Favorite, Subscribe
+
+PNG_1PX = (
+    'data:image/png;base64,'
+    'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGA'
+    'hKmMIQAAAABJRU5ErkJggg=='
+)
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """
+    Сценарий замера одного эндпоинта router_v1.
+
+    Attributes:
+        name (str): Уникальное имя сценария в отчёте.
+        url_name (str): Имя маршрута без пространства имён `api_v1`.
+        query_budget (int): Максимально допустимое число SQL-запросов.
+        method (str): HTTP-метод.
+        auth (bool): Выполнять запрос от имени пользователя набора данных.
+        status (int): Ожидаемый код ответа.
+        url_kwargs (Callable): Аргументы reverse() по набору данных.
+        params (Callable): GET-параметры по набору данных.
+        payload (Callable): Тело запроса по набору данных.
+        setup (Callable): Подготовка перед каждым запросом (не замеряется).
+        teardown (Callable): Откат изменений после каждого запроса.
+        revalidate (bool): Отправлять `If-None-Match` c ETag предыдущего
+            ответа (замеряется ответ 304).
+        accept_encoding (str): Значение заголовка `Accept-Encoding`.
+        order_by_budget (int | None): Максимально допустимое число
+            SQL-запросов c ORDER BY; None — не проверяется.
+    """
+
+    name: str
+    url_name: str
+    query_budget: int
+    method: str = 'get'
+    auth: bool = False
+    status: int = HTTPStatus.OK
+    url_kwargs: Callable[[BenchmarkDataset], dict] | None = None
+    params: Callable[[BenchmarkDataset], dict] | None = None
+    payload: Callable[[BenchmarkDataset], dict] | None = None
+    setup: Callable[[BenchmarkDataset], None] | None = None
+    teardown: Callable[[BenchmarkDataset, object], None] | None = None
+    revalidate: bool = False
+    accept_encoding: str = ''
+    order_by_budget: int | None = None
+
+
+def _recipe_payload(ds: BenchmarkDataset) -> dict:
+    return {
+        'ingredients': [
+            {'id': ingredient_id, 'amount': 10}
+            for ingredient_id in ds.ingredient_ids[:5]
+        ],
+        'tags': ds.tag_ids[:2],
+        'image': PNG_1PX,
+        'name': 'Benchmark created recipe',
+        'text': 'Benchmark created recipe instructions.',
+        'cooking_time': 30,
+    }
+
+
+def _delete_created_recipe(ds: BenchmarkDataset, response) -> None:
+    recipes = Recipe.objects.filter(pk=response.data['id'])
+    recipes.update(image='')
+    recipes.delete()
+
+
+def _create_disposable_recipe(ds: BenchmarkDataset) -> None:
+    recipe = Recipe.objects.create(
+        name='Benchmark disposable recipe',
+        author=ds.user,
+        text='Benchmark disposable recipe instructions.',
+        cooking_time=10,
+    )
+    ds.disposable_recipe_id = recipe.pk
+
+
+def _delete_created_user(ds: BenchmarkDataset, response) -> None:
+    type(ds.user).objects.filter(pk=response.data['id']).delete()
+
+
+def _invalidate_recipe_cache(ds: BenchmarkDataset) -> None:
+    bump_content_version()
+    bump_user_state_version(ds.user.pk)
+
+
+def _invalidate_user_state(ds: BenchmarkDataset) -> None:
+    bump_user_state_version(ds.user.pk)
+
+
+def _recipe_kwargs(ds: BenchmarkDataset) -> dict:
+    return {'pk': ds.free_recipe_id}
+
+
+def _relation_fixtures(model, field: str, target: Callable):
+    def create(ds: BenchmarkDataset) -> None:
+        model.objects.get_or_create(user=ds.user, **{field: target(ds)})
+
+    def delete(ds: BenchmarkDataset, response=None) -> None:
+        model.objects.filter(user=ds.user, **{field: target(ds)}).delete()
+
+    return create, delete
+
+
+def _bulk_relation_fixtures(model):
+    def create(ds: BenchmarkDataset) -> None:
+        model.objects.bulk_create(
+            [
+                model(user=ds.user, recipe_id=recipe_id)
+                for recipe_id in ds.free_recipe_ids
+            ],
+            ignore_conflicts=True,
+        )
+
+    def delete(ds: BenchmarkDataset, response=None) -> None:
+        model.objects.filter(
+            user=ds.user, recipe_id__in=ds.free_recipe_ids
+        ).delete()
+
+    return create, delete
+
+
+def _bulk_recipes_payload(ds: BenchmarkDataset) -> dict:
+    return {'ids': ds.free_recipe_ids}
+
+
+_favorite_create, _favorite_delete = _relation_fixtures(
+    Favorite, 'recipe_id', lambda ds: ds.free_recipe_id
+)
+_cart_create, _cart_delete = _relation_fixtures(
+    Cart, 'recipe_id', lambda ds: ds.free_recipe_id
+)
+_favorite_bulk_create, _favorite_bulk_delete = _bulk_relation_fixtures(
+    Favorite
+)
+_cart_bulk_create, _cart_bulk_delete = _bulk_relation_fixtures(Cart)
+_subscribe_create, _subscribe_delete = _relation_fixtures(
+    Subscribe, 'author_id', lambda ds: ds.author.pk
+)
+
+
+ENDPOINTS: tuple[Endpoint, ...] = (
+    # --- Теги и ингредиенты ---
+    Endpoint('tags-list', 'tags-list', query_budget=1),
+    Endpoint(
+        'tags-detail',
+        'tags-detail',
+        query_budget=1,
+        url_kwargs=lambda ds: {'pk': ds.tag_ids[0]},
+    ),
+    Endpoint('ingredients-list', 'ingredients-list', query_budget=1),
+    Endpoint(
+        'ingredients-list-gzip',
+        'ingredients-list',
+        query_budget=1,
+        accept_encoding='gzip',
+    ),
+    Endpoint(
+        'ingredients-search',
+        'ingredients-list',
+        query_budget=1,
+        params=lambda ds: {'name': 'bench ingredient 1'},
+    ),
+    Endpoint(
+        'ingredients-detail',
+        'ingredients-detail',
+        query_budget=1,
+        url_kwargs=lambda ds: {'pk': ds.ingredient_ids[0]},
+    ),
+    # --- Рецепты: чтение ---
+    Endpoint('recipes-list', 'recipes-list', query_budget=1),
+    Endpoint(
+        'recipes-list-limit-50',
+        'recipes-list',
+        query_budget=1,
+        params=lambda ds: {'limit': 50},
+    ),
+    Endpoint(
+        'recipes-list-limit-50-gzip',
+        'recipes-list',
+        query_budget=1,
+        params=lambda ds: {'limit': 50},
+        accept_encoding='gzip',
+    ),
+    Endpoint(
+        'recipes-list-tags',
+        'recipes-list',
+        query_budget=1,
+        params=lambda ds: {'tags': ds.tag_slugs[:3]},
+    ),
+    Endpoint(
+        'recipes-list-tags-all',
+        'recipes-list',
+        query_budget=1,
+        params=lambda ds: {'tags': ds.tag_slugs[:2], 'tags_match': 'all'},
+    ),
+    Endpoint('recipes-list-auth', 'recipes-list', query_budget=1, auth=True),
+    Endpoint(
+        'recipes-list-cold',
+        'recipes-list',
+        query_budget=2,
+        setup=_invalidate_recipe_cache,
+    ),
+    Endpoint(
+        'recipes-list-uncached',
+        'recipes-list',
+        query_budget=4,
+        setup=lambda ds: cache.clear(),
+        order_by_budget=3,
+    ),
+    Endpoint(
+        'recipes-list-sparse-uncached',
+        'recipes-list',
+        query_budget=3,
+        auth=True,
+        params=lambda ds: {'fields': 'id,name,image,cooking_time'},
+        setup=lambda ds: cache.clear(),
+        order_by_budget=1,
+    ),
+    Endpoint(
+        'recipes-list-auth-cold',
+        'recipes-list',
+        query_budget=2,
+        auth=True,
+        setup=_invalidate_recipe_cache,
+    ),
+    Endpoint(
+        'recipes-list-auth-relations-miss',
+        'recipes-list',
+        query_budget=2,
+        auth=True,
+        setup=_invalidate_user_state,
+    ),
+    Endpoint(
+        'recipes-list-auth-limit-50',
+        'recipes-list',
+        query_budget=1,
+        auth=True,
+        params=lambda ds: {'limit': 50},
+    ),
+    Endpoint(
+        'recipes-list-favorited',
+        'recipes-list',
+        query_budget=1,
+        auth=True,
+        params=lambda ds: {'is_favorited': 1},
+    ),
+    Endpoint(
+        'recipes-list-in-cart',
+        'recipes-list',
+        query_budget=1,
+        auth=True,
+        params=lambda ds: {'is_in_shopping_cart': 1},
+    ),
+    Endpoint(
+        'recipes-list-not-favorited',
+        'recipes-list',
+        query_budget=1,
+        auth=True,
+        params=lambda ds: {'is_favorited': 0},
+    ),
+    Endpoint(
+        'recipes-list-not-in-cart',
+        'recipes-list',
+        query_budget=1,
+        auth=True,
+        params=lambda ds: {'is_in_shopping_cart': 0},
+    ),
+    Endpoint(
+        'recipes-detail',
+        'recipes-detail',
+        query_budget=0,
+        url_kwargs=_recipe_kwargs,
+    ),
+    Endpoint(
+        'recipes-detail-uncached',
+        'recipes-detail',
+        query_budget=4,
+        url_kwargs=_recipe_kwargs,
+        setup=lambda ds: cache.clear(),
+        order_by_budget=2,
+    ),
+    Endpoint(
+        'recipes-detail-auth',
+        'recipes-detail',
+        query_budget=0,
+        auth=True,
+        url_kwargs=_recipe_kwargs,
+    ),
+    Endpoint(
+        'recipes-list-not-modified',
+        'recipes-list',
+        query_budget=1,
+        status=HTTPStatus.NOT_MODIFIED,
+        revalidate=True,
+    ),
+    Endpoint(
+        'recipes-list-auth-not-modified',
+        'recipes-list',
+        query_budget=1,
+        auth=True,
+        status=HTTPStatus.NOT_MODIFIED,
+        revalidate=True,
+    ),
+    Endpoint(
+        'recipes-detail-not-modified',
+        'recipes-detail',
+        query_budget=0,
+        auth=True,
+        status=HTTPStatus.NOT_MODIFIED,
+        url_kwargs=_recipe_kwargs,
+        revalidate=True,
+    ),
+    Endpoint(
+        'recipes-get-link',
+        'recipes-get-link',
+        query_budget=1,
+        url_kwargs=_recipe_kwargs,
+    ),
+    Endpoint(
+        'recipes-download-shopping-cart',
+        'recipes-download_shopping_cart',
+        query_budget=2,
+        auth=True,
+        order_by_budget=1,
+    ),
+    # --- Рецепты: запись ---
+    Endpoint(
+        'recipes-create',
+        'recipes-list',
+        query_budget=25,
+        method='post',
+        auth=True,
+        status=HTTPStatus.CREATED,
+        payload=_recipe_payload,
+        teardown=_delete_created_recipe,
+    ),
+    Endpoint(
+        'recipes-update',
+        'recipes-detail',
+        query_budget=20,
+        method='patch',
+        auth=True,
+        url_kwargs=lambda ds: {'pk': ds.own_recipe_id},
+        payload=lambda ds: {
+            **_recipe_payload(ds),
+            'name': 'Benchmark updated recipe',
+        },
+    ),
+    Endpoint(
+        'recipes-delete',
+        'recipes-detail',
+        query_budget=8,
+        method='delete',
+        auth=True,
+        status=HTTPStatus.NO_CONTENT,
+        url_kwargs=lambda ds: {'pk': ds.disposable_recipe_id},
+        setup=_create_disposable_recipe,
+    ),
+    Endpoint(
+        'recipes-favorite-add',
+        'recipes-favorite',
+        query_budget=2,
+        method='post',
+        auth=True,
+        status=HTTPStatus.CREATED,
+        url_kwargs=_recipe_kwargs,
+        teardown=_favorite_delete,
+    ),
+    Endpoint(
+        'recipes-favorite-remove',
+        'recipes-favorite',
+        query_budget=4,
+        method='delete',
+        auth=True,
+        status=HTTPStatus.NO_CONTENT,
+        url_kwargs=_recipe_kwargs,
+        setup=_favorite_create,
+    ),
+    Endpoint(
+        'recipes-shopping-cart-add',
+        'recipes-shopping_cart',
+        query_budget=2,
+        method='post',
+        auth=True,
+        status=HTTPStatus.CREATED,
+        url_kwargs=_recipe_kwargs,
+        teardown=_cart_delete,
+    ),
+    Endpoint(
+        'recipes-shopping-cart-remove',
+        'recipes-shopping_cart',
+        query_budget=4,
+        method='delete',
+        auth=True,
+        status=HTTPStatus.NO_CONTENT,
+        url_kwargs=_recipe_kwargs,
+        setup=_cart_create,
+    ),
+    Endpoint(
+        'recipes-favorite-bulk-add',
+        'recipes-favorite_bulk',
+        query_budget=3,
+        method='post',
+        auth=True,
+        payload=_bulk_recipes_payload,
+        teardown=_favorite_bulk_delete,
+    ),
+    Endpoint(
+        'recipes-shopping-cart-bulk-remove',
+        'recipes-shopping_cart_bulk',
+        query_budget=5,
+        method='delete',
+        auth=True,
+        payload=_bulk_recipes_payload,
+        setup=_cart_bulk_create,
+    ),
+    # --- Пользователи ---
+    Endpoint('users-list', 'users-list', query_budget=2),
+    Endpoint(
+        'users-list-sparse',
+        'users-list',
+        query_budget=2,
+        auth=True,
+        params=lambda ds: {'fields': 'id,username'},
+    ),
+    Endpoint(
+        'users-detail',
+        'users-detail',
+        query_budget=1,
+        url_kwargs=lambda ds: {'id': ds.author.pk},
+    ),
+    Endpoint('users-me', 'users-me', query_budget=1, auth=True),
+    Endpoint(
+        'users-subscriptions',
+        'users-subscriptions',
+        query_budget=3,
+        auth=True,
+        params=lambda ds: {'recipes_limit': 3},
+        order_by_budget=1,
+    ),
+    Endpoint(
+        'users-subscribe-add',
+        'users-subscribe',
+        query_budget=3,
+        method='post',
+        auth=True,
+        status=HTTPStatus.CREATED,
+        url_kwargs=lambda ds: {'id': ds.author.pk},
+        teardown=_subscribe_delete,
+    ),
+    Endpoint(
+        'users-subscribe-remove',
+        'users-subscribe',
+        query_budget=4,
+        method='delete',
+        auth=True,
+        status=HTTPStatus.NO_CONTENT,
+        url_kwargs=lambda ds: {'id': ds.author.pk},
+        setup=_subscribe_create,
+    ),
+    Endpoint(
+        'users-avatar-put',
+        'users-me_avatar',
+        query_budget=7,
+        method='put',
+        auth=True,
+        payload=lambda ds: {'avatar': PNG_1PX},
+    ),
+    Endpoint(
+        'users-create',
+        'users-list',
+        query_budget=8,
+        method='post',
+        status=HTTPStatus.CREATED,
+        payload=lambda ds: {
+            'email': 'bench-new@example.com',
+            'username': 'bench_new_user',
+            'first_name': 'Bench',
+            'last_name': 'Newcomer',
+            'password': 'Bench-new-password-1',
+            're_password': 'Bench-new-password-1',
+        },
+        teardown=_delete_created_user,
+    ),
+    # `users-set-password` не замеряется: смена пароля сбрасывает
+    # сессию клиента, a стоимость хэширования пароля заложена намеренно.
+)
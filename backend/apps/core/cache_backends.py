@@ -0,0 +1,332 @@
+"""
+Бэкенды кэша проекта.
+
+- `SQLiteCache` — общий для всех воркеров gunicorn кэш в файле SQLite
+  (WAL): не требует внешних сервисов, поддерживает вытеснение по LRU,
+  атомарный `incr` и версии ключей Django.
+- `Instrumented*` — те же бэкенды c учётом попаданий и промахов
+  в метрике `foodgram_cache_requests_total`.
+
+Бэкенд выбирается переменной окружения `CACHE_BACKEND`
+(см. `config/settings/base.py`).
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from apps.core.metrics import registry
+
+_MISSING = object()
+
+SQLITE_INT_MIN, SQLITE_INT_MAX = -(2**63), 2**63 - 1
+
+
+class InstrumentedCacheMixin:
+    """
+    Считает попадания и промахи кэша для метрики
+    `foodgram_cache_requests_total`.
+    """
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        self._record(hit=value is not _MISSING)
+        return default if value is _MISSING else value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = super().get_many(keys, version)
+        self._record(hit=True, count=len(values))
+        self._record(hit=False, count=len(keys) - len(values))
+        return values
+
+    @staticmethod
+    def _record(hit: bool, count: int = 1) -> None:
+        if count:
+            registry.inc(
+                'foodgram_cache_requests_total',
+                {'result': 'hit' if hit else 'miss'},
+                count,
+            )
+
+
+class SQLiteCache(BaseCache):
+    """
+    Кэш в файле SQLite, общий для процессов на одной машине.
+
+    Целые числа хранятся как INTEGER, поэтому `incr` выполняется одним
+    атомарным `UPDATE ... RETURNING`. Остальные значения сериализуются
+    pickle. Время последнего обращения обновляется не чаще, чем раз
+    в `ACCESS_RESOLUTION` секунд, чтобы чтения не превращались в записи;
+    при превышении `MAX_ENTRIES` вытесняются давно не читанные ключи.
+
+    Соединения открываются по одному на поток и процесс.
+    """
+
+    ACCESS_RESOLUTION = 1.0
+    CULL_CHECK_EVERY = 16
+    BUSY_TIMEOUT = 5.0
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._location = location
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+        connection = sqlite3.connect(
+            self._location,
+            timeout=self.BUSY_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+            'expires REAL, accessed REAL NOT NULL) WITHOUT ROWID'
+        )
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)'
+        )
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    @staticmethod
+    def _encode(value):
+        if type(value) is int and SQLITE_INT_MIN <= value <= SQLITE_INT_MAX:
+            return value
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _decode(value):
+        if isinstance(value, bytes):
+            return pickle.loads(value)  # noqa: S301
+        return value
+
+    def _after_write(self) -> None:
+        self._writes += 1
+        if self._writes % self.CULL_CHECK_EVERY == 0:
+            self._cull()
+
+    def _cull(self) -> None:
+        """Удаляет устаревшие и давно не читанные ключи."""
+        with self._transaction() as connection:
+            count = connection.execute('SELECT COUNT(*) FROM cache').fetchone()
+            if count[0] <= self._max_entries:
+                return
+            connection.execute(
+                'DELETE FROM cache WHERE expires <= ?', (time.time(),)
+            )
+            count = connection.execute('SELECT COUNT(*) FROM cache').fetchone()
+            if count[0] <= self._max_entries:
+                return
+            if self._cull_frequency == 0:
+                connection.execute('DELETE FROM cache')
+                return
+            connection.execute(
+                'DELETE FROM cache WHERE key IN '
+                '(SELECT key FROM cache ORDER BY accessed LIMIT ?)',
+                (
+                    count[0]
+                    - self._max_entries
+                    + self._max_entries // self._cull_frequency,
+                ),
+            )
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        cursor = self._connection().execute(
+            'INSERT INTO cache (key, value, expires, accessed) '
+            'VALUES (?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET '
+            'value = excluded.value, expires = excluded.expires, '
+            'accessed = excluded.accessed WHERE cache.expires <= ?',
+            (
+                key,
+                self._encode(value),
+                self.get_backend_timeout(timeout),
+                now,
+                now,
+            ),
+        )
+        self._after_write()
+        return cursor.rowcount > 0
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        connection = self._connection()
+        row = connection.execute(
+            'SELECT value, accessed FROM cache '
+            'WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, now),
+        ).fetchone()
+        if row is None:
+            return default
+        if now - row[1] > self.ACCESS_RESOLUTION:
+            connection.execute(
+                'UPDATE cache SET accessed = ? WHERE key = ?', (now, key)
+            )
+        return self._decode(row[0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._connection().execute(
+            'INSERT OR REPLACE INTO cache (key, value, expires, accessed) '
+            'VALUES (?, ?, ?, ?)',
+            (
+                key,
+                self._encode(value),
+                self.get_backend_timeout(timeout),
+                time.time(),
+            ),
+        )
+        self._after_write()
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute(
+            'UPDATE cache SET expires = ? '
+            'WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self.get_backend_timeout(timeout), key, time.time()),
+        )
+        return cursor.rowcount > 0
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute(
+            'DELETE FROM cache WHERE key = ?', (key,)
+        )
+        return cursor.rowcount > 0
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = (
+            self._connection()
+            .execute(
+                'SELECT 1 FROM cache '
+                'WHERE key = ? AND (expires IS NULL OR expires > ?)',
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return row is not None
+
+    def incr(self, key, delta=1, version=None):
+        cache_key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        row = (
+            self._connection()
+            .execute(
+                'UPDATE cache SET value = value + ? '
+                "WHERE key = ? AND typeof(value) = 'integer' "
+                'AND (expires IS NULL OR expires > ?) RETURNING value',
+                (delta, cache_key, now),
+            )
+            .fetchone()
+        )
+        if row is not None:
+            return row[0]
+        with self._transaction() as connection:
+            row = connection.execute(
+                'SELECT value FROM cache '
+                'WHERE key = ? AND (expires IS NULL OR expires > ?)',
+                (cache_key, now),
+            ).fetchone()
+            if row is None:
+                msg = f"Key '{key}' not found"
+                raise ValueError(msg)
+            new_value = self._decode(row[0]) + delta
+            connection.execute(
+                'UPDATE cache SET value = ? WHERE key = ?',
+                (self._encode(new_value), cache_key),
+            )
+        return new_value
+
+    def get_many(self, keys, version=None):
+        keys = {
+            self.make_and_validate_key(key, version=version): key
+            for key in keys
+        }
+        if not keys:
+            return {}
+        placeholders = ', '.join('?' * len(keys))
+        sql = (
+            'SELECT key, value FROM cache '  # noqa: S608
+            f'WHERE key IN ({placeholders}) '
+            'AND (expires IS NULL OR expires > ?)'
+        )
+        rows = self._connection().execute(sql, (*keys, time.time())).fetchall()
+        return {keys[key]: self._decode(value) for key, value in rows}
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_backend_timeout(timeout)
+        now = time.time()
+        with self._transaction() as connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO cache (key, value, expires, accessed) '
+                'VALUES (?, ?, ?, ?)',
+                [
+                    (
+                        self.make_and_validate_key(key, version=version),
+                        self._encode(value),
+                        expires,
+                        now,
+                    )
+                    for key, value in data.items()
+                ],
+            )
+        self._after_write()
+        return []
+
+    def delete_many(self, keys, version=None):
+        keys = [
+            self.make_and_validate_key(key, version=version) for key in keys
+        ]
+        if not keys:
+            return
+        placeholders = ', '.join('?' * len(keys))
+        self._connection().execute(
+            f'DELETE FROM cache WHERE key IN ({placeholders})',  # noqa: S608
+            keys,
+        )
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache')
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    """LocMemCache c метриками попаданий и промахов."""
+
+
+class InstrumentedSQLiteCache(InstrumentedCacheMixin, SQLiteCache):
+    """SQLiteCache c метриками попаданий и промахов."""
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    """RedisCache c метриками попаданий и промахов (нужен пакет redis)."""
@@ -0,0 +1,129 @@
+"""
+Сжатие ответов и кэш готовых тел ответов.
+
+Кодировка выбирается по заголовку `Accept-Encoding` (c учётом `q`):
+brotli, если установлен пакет `brotli`, иначе gzip. Сжимаются только
+ответы на GET/HEAD c типом из `COMPRESSION['CONTENT_TYPES']` и телом
+не короче `COMPRESSION['MIN_LENGTH']`, см. `CompressionMiddleware`.
+
+Тела ответов, помеченных ключом `body_cache_key`, сохраняются в кэше
+вместе co сжатыми вариантами (`identity`, `gzip`, `br`). Повторный
+запрос c тем же ключом получает готовое тело, и сжатие выполняется один
+раз на заполнение кэша, a не на каждый запрос. Ключ строится из
+полного URL запроса и ETag ответа, поэтому устаревает вместе c ним.
+"""
+
+import gzip
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli не установлен
+    brotli = None
+
+IDENTITY = 'identity'
+BODY_KEY = 'responses:body:{digest}'
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Возвращает поддерживаемые кодировки в порядке предпочтения."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """
+    Выбирает кодировку ответа по заголовку `Accept-Encoding`.
+
+    Args:
+        accept_encoding (str): Значение заголовка.
+
+    Returns:
+        str | None: `br`, `gzip` или None, если клиент не принимает
+            ни одну из поддерживаемых кодировок.
+    """
+    weights = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip().lower()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    chosen, chosen_weight = None, 0.0
+    for encoding in available_encodings():
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > chosen_weight:
+            chosen, chosen_weight = encoding, weight
+    return chosen
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Сжимает тело ответа в кодировке `br` или `gzip`."""
+    if encoding == 'br':
+        return brotli.compress(
+            body, quality=settings.COMPRESSION['BROTLI_QUALITY']
+        )
+    return gzip.compress(
+        body, compresslevel=settings.COMPRESSION['GZIP_LEVEL'], mtime=0
+    )
+
+
+def is_compressible(request, response) -> bool:
+    """Проверяет, можно ли сжимать ответ на запрос."""
+    if request.method not in {'GET', 'HEAD'}:
+        return False
+    if response.streaming or response.has_header('Content-Encoding'):
+        return False
+    content_type = response.get('Content-Type', '').lower()
+    return content_type.startswith(settings.COMPRESSION['CONTENT_TYPES'])
+
+
+def make_body_cache_key(request, etag: str) -> str:
+    """Вычисляет ключ кэша тела ответа по URL запроса и ETag."""
+    raw = f'{request.build_absolute_uri()}:{etag}'
+    digest = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+    return BODY_KEY.format(digest=digest)
+
+
+def get_cached_response(key: str) -> HttpResponse | None:
+    """
+    Возвращает ответ из кэша тел или None.
+
+    Сжатые варианты тела передаются `CompressionMiddleware`
+    в атрибуте `encoded_bodies`.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    content_type, bodies = entry
+    response = HttpResponse(bodies[IDENTITY], content_type=content_type)
+    response.body_cache_key = key
+    response.encoded_bodies = bodies
+    return response
+
+
+def set_cached_body(key: str, content_type: str, bodies: dict) -> None:
+    """
+    Сохраняет тело ответа и его сжатые варианты.
+
+    Args:
+        key (str): Ключ из `make_body_cache_key`.
+        content_type (str): Значение заголовка `Content-Type`.
+        bodies (dict[str, bytes]): Тела по кодировкам, включая `identity`.
+    """
+    cache.set(
+        key,
+        (content_type, bodies),
+        timeout=settings.RESPONSE_BODY_CACHE_TIMEOUT,
+    )
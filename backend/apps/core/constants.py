@@ -6,6 +6,8 @@ RECIPE_SHORT_CODE_MAX_LENGTH = 8
 
 # --- Ограничения для полей модели Tag ---
 TAG_NAME_MAX_LENGTH = TAG_SLUG_MAX_LENGTH = 32
+# Биты маски тегов рецепта: BigIntegerField без знакового бита
+TAG_BITMASK_SIZE = 63
 
 # --- Ограничения для полей модели Ingredient ---
 INGREDIENT_NAME_MAX_LENGTH = 128
@@ -36,6 +38,7 @@ MAX_ATTEMPTS = 1000
 ARCHIVE_ROOT = 'archive'
 UUID_FILENAME_LENGTH = 10
 SHORT_LINK_PREFIX = 's'
+BULK_UPDATE_BATCH_SIZE = 500
 
 # --- API ---
 DISABLED_ACTIONS_DJOSER = [
@@ -49,6 +52,13 @@ DISABLED_ACTIONS_DJOSER = [
 ]
 PAGE_SIZE_PAGINATION = 10
 MAX_PAGE_SIZE_PAGINATION = 50
+MAX_BULK_RELATION_IDS = 100
+# Статусы ID в ответах пакетных эндпоинтов избранного, корзины и подписок
+RELATION_CREATED = 'created'
+RELATION_EXISTS = 'exists'
+RELATION_DELETED = 'deleted'
+RELATION_NOT_FOUND = 'not_found'
+RELATION_INVALID = 'invalid'
 
 # --- Help texts для моделей приложения users ---
 USER_USERNAME_HELP = (
@@ -0,0 +1,311 @@
+import json
+
+from contextlib import contextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.core.benchmark import (
+    ENDPOINTS,
+    check_lean_serializers,
+    compare_results,
+    generate_dataset,
+    run_endpoint,
+    run_recipe_page,
+    run_renderers,
+)
+from apps.core.cache_backends import SQLiteCache
+
+DEFAULT_OUTPUT_DIR = Path(settings.BASE_DIR) / 'logs' / 'benchmark'
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер эндпоинтов API на сгенерированных данных: задержка, память '
+        'и число SQL-запросов c проверкой бюджетов запросов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations', type=int, default=20, help='Замеров на эндпоинт'
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=2, help='Запросов прогрева'
+        )
+        parser.add_argument(
+            '--scale', type=int, default=1, help='Множитель объёма данных'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0, help='Зерно генератора данных'
+        )
+        parser.add_argument(
+            '--only',
+            nargs='*',
+            default=None,
+            help='Имена сценариев для замера (по умолчанию все)',
+        )
+        parser.add_argument(
+            '--output', type=Path, default=None, help='Путь к JSON-отчёту'
+        )
+        parser.add_argument(
+            '--baseline',
+            type=Path,
+            default=None,
+            help='JSON-отчёт предыдущего прогона для сравнения',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.25,
+            help='Допустимый рост медианной задержки относительно baseline',
+        )
+        parser.add_argument(
+            '--explain',
+            action='store_true',
+            help='Добавить в отчёт планы выполнения SELECT-запросов',
+        )
+        parser.add_argument(
+            '--renderers',
+            action='store_true',
+            help=(
+                'Сравнить JSON-рендереры и парсеры на ответах GET-сценариев '
+                'вместо замера эндпоинтов'
+            ),
+        )
+        parser.add_argument(
+            '--serializers',
+            action='store_true',
+            help=(
+                'Сравнить ответы облегчённых и обычных сериализаторов '
+                'и замерить сериализацию страницы из 50 рецептов'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        endpoints = [
+            endpoint
+            for endpoint in ENDPOINTS
+            if not options['only'] or endpoint.name in options['only']
+        ]
+        if not endpoints:
+            msg = 'Не найдено ни одного сценария для замера.'
+            raise CommandError(msg)
+
+        if options['renderers']:
+            self.handle_renderers(endpoints, options)
+            return
+        if options['serializers']:
+            self.handle_serializers(endpoints, options)
+            return
+
+        baseline = None
+        if options['baseline']:
+            try:
+                baseline = json.loads(options['baseline'].read_text())
+            except (OSError, ValueError) as e:
+                msg = f'Не удалось прочитать baseline: {e}'
+                raise CommandError(msg) from e
+
+        results = self.run(endpoints, options)
+        report = {
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'iterations': options['iterations'],
+            'scale': options['scale'],
+            'seed': options['seed'],
+            'results': results,
+        }
+        output = options['output'] or DEFAULT_OUTPUT_DIR / (
+            f'api-{timezone.now():%Y%m%d-%H%M%S}.json'
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, ensure_ascii=False, indent=2))
+        self.stdout.write(self.style.MIGRATE_LABEL(f'Отчёт: {output}'))
+
+        failures = [
+            self.format_budget_failure(result)
+            for result in results
+            if result['over_budget']
+        ]
+        if baseline is not None:
+            failures += compare_results(
+                results, baseline['results'], options['tolerance']
+            )
+        if failures:
+            for failure in failures:
+                self.stderr.write(self.style.ERROR(failure))
+            msg = f'Обнаружено регрессий: {len(failures)}'
+            raise CommandError(msg)
+        self.stdout.write(self.style.SUCCESS('Все бюджеты соблюдены.'))
+
+    def handle_renderers(self, endpoints, options) -> None:
+        """Сравнивает JSON-рендереры и проверяет совпадение их вывода."""
+        results = []
+        with self.environment(options) as dataset:
+            for endpoint in endpoints:
+                try:
+                    result = run_renderers(
+                        endpoint, dataset, options['iterations']
+                    )
+                except AssertionError as e:
+                    raise CommandError(str(e)) from e
+                if result is None:
+                    continue
+                results.append(result)
+                self.write_renderer_result(result)
+        if options['output']:
+            options['output'].parent.mkdir(parents=True, exist_ok=True)
+            options['output'].write_text(
+                json.dumps(results, ensure_ascii=False, indent=2)
+            )
+        mismatches = [
+            result['name'] for result in results if not result['identical']
+        ]
+        if mismatches:
+            msg = f'Вывод рендереров различается: {", ".join(mismatches)}'
+            raise CommandError(msg)
+        self.stdout.write(self.style.SUCCESS('Вывод рендереров совпадает.'))
+
+    def handle_serializers(self, endpoints, options) -> None:
+        """Проверяет совпадение ответов облегчённых сериализаторов."""
+        mismatches = []
+        with self.environment(options) as dataset:
+            for endpoint in endpoints:
+                try:
+                    identical = check_lean_serializers(endpoint, dataset)
+                except AssertionError as e:
+                    raise CommandError(str(e)) from e
+                if identical is None:
+                    continue
+                if not identical:
+                    mismatches.append(endpoint.name)
+                style = self.style.SUCCESS if identical else self.style.ERROR
+                self.stdout.write(
+                    f'{endpoint.name:<34} ' + style('=' if identical else '≠')
+                )
+            page = run_recipe_page(dataset, options['iterations'])
+        timings = page['serialize_ms']
+        self.stdout.write(
+            f'{page["name"]:<34} serialize {timings["drf"]:8.2f} → '
+            f'{timings["lean"]:8.2f} мс  '
+            + ('=' if page['identical'] else '≠')
+        )
+        if not page['identical']:
+            mismatches.append(page['name'])
+        if mismatches:
+            msg = f'Ответы сериализаторов различаются: {", ".join(mismatches)}'
+            raise CommandError(msg)
+        self.stdout.write(
+            self.style.SUCCESS('Ответы облегчённых сериализаторов совпадают.')
+        )
+
+    @contextmanager
+    def environment(self, options):
+        """Создаёт временную тестовую БД c набором данных."""
+        setup_test_environment(debug=False)
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with (
+                TemporaryDirectory() as media_root,
+                override_settings(
+                    MEDIA_ROOT=media_root,
+                    CACHES=self.isolated_caches(media_root),
+                ),
+            ):
+                yield generate_dataset(options['scale'], options['seed'])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def run(self, endpoints, options) -> list[dict]:
+        """Прогоняет сценарии на временной тестовой БД."""
+        results = []
+        with self.environment(options) as dataset:
+            for endpoint in endpoints:
+                try:
+                    result = run_endpoint(
+                        endpoint,
+                        dataset,
+                        options['iterations'],
+                        options['warmup'],
+                        options['explain'],
+                    )
+                except AssertionError as e:
+                    raise CommandError(str(e)) from e
+                results.append(result)
+                self.write_result(result)
+                for plan in result.get('plans', ()):
+                    self.write_plan(plan)
+        return results
+
+    @staticmethod
+    def isolated_caches(directory: str) -> dict:
+        """Переносит файловый кэш SQLite во временный каталог."""
+        caches = {}
+        for alias, options in settings.CACHES.items():
+            caches[alias] = options
+            if issubclass(import_string(options['BACKEND']), SQLiteCache):
+                caches[alias] = {
+                    **options,
+                    'LOCATION': str(Path(directory) / f'cache-{alias}.db'),
+                }
+        return caches
+
+    def write_result(self, result: dict) -> None:
+        """Выводит строку результата сценария."""
+        latency = result['latency_ms']
+        style = (
+            self.style.ERROR if result['over_budget'] else self.style.SUCCESS
+        )
+        queries = style(f'{result["queries"]:>3}/{result["query_budget"]:<3}')
+        self.stdout.write(
+            f'{result["name"]:<34} SQL {queries} '
+            f'p50 {latency["p50"]:8.2f} мс  '
+            f'p90 {latency["p90"]:8.2f} мс  '
+            f'p99 {latency["p99"]:8.2f} мс  '
+            f'mem {result["memory_peak_kb"]:9.1f} КБ  '
+            f'size {result["size_kb"]:8.1f} КБ {result["content_encoding"]}'
+        )
+
+    @staticmethod
+    def format_budget_failure(result: dict) -> str:
+        """Описывает превышение бюджета запросов сценарием."""
+        failure = (
+            f'{result["name"]}: {result["queries"]} запросов '
+            f'при бюджете {result["query_budget"]}'
+        )
+        if 'order_by_budget' in result:
+            failure += (
+                f', c ORDER BY {result["ordered_queries"]} '
+                f'при бюджете {result["order_by_budget"]}'
+            )
+        return failure
+
+    def write_plan(self, plan: dict) -> None:
+        """Выводит план выполнения запроса."""
+        self.stdout.write(f'    {plan["sql"][:120]}')
+        for line in plan['plan']:
+            self.stdout.write(f'      {line}')
+
+    def write_renderer_result(self, result: dict) -> None:
+        """Выводит строку сравнения рендереров."""
+        render, parse = result['render_ms'], result['parse_ms']
+        style = self.style.SUCCESS if result['identical'] else self.style.ERROR
+        self.stdout.write(
+            f'{result["name"]:<34} {result["size_kb"]:8.1f} КБ  '
+            f'render {render["json"]:7.3f} → {render["fast"]:7.3f} мс  '
+            f'parse {parse["json"]:7.3f} → {parse["fast"]:7.3f} мс  '
+            + style('=' if result['identical'] else '≠')
+        )
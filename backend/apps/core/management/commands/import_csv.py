@@ -13,6 +13,7 @@ from apps.recipes.models import (
     RecipeIngredient,
     Tag,
 )
+from apps.recipes.services import sync_tags_masks
 from apps.users.models import Cart, Favorite, Subscribe
 
 User = get_user_model()
@@ -87,6 +88,8 @@ class Command(BaseCommand):
         try:
             if bulk_objects:
                 modelclass.objects.bulk_create(bulk_objects)
+                if modelclass in {Tag, Recipe.tags.through}:
+                    sync_tags_masks()
                 self.stdout.write(
                     self.style.SUCCESS(
                         f'Успешно загружено {len(bulk_objects)} '
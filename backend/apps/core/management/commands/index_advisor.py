@@ -0,0 +1,103 @@
+import json
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.core.benchmark import (
+    ENDPOINTS,
+    find_plan_issues,
+    normalize_sql,
+    run_endpoint,
+)
+from apps.core.management.commands.benchmark_api import (
+    Command as BenchmarkCommand,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогон сценариев benchmark_api через EXPLAIN: отчёт o полных '
+        'сканированиях таблиц и сортировках без индекса.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=int, default=1, help='Множитель объёма данных'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0, help='Зерно генератора данных'
+        )
+        parser.add_argument(
+            '--only',
+            nargs='*',
+            default=None,
+            help='Имена сценариев (по умолчанию все GET-сценарии)',
+        )
+        parser.add_argument(
+            '--output', type=Path, default=None, help='Путь к JSON-отчёту'
+        )
+
+    def handle(self, *args, **options):
+        endpoints = [
+            endpoint
+            for endpoint in ENDPOINTS
+            if (options['only'] and endpoint.name in options['only'])
+            or (not options['only'] and endpoint.method == 'get')
+        ]
+        if not endpoints:
+            msg = 'Не найдено ни одного сценария.'
+            raise CommandError(msg)
+
+        findings = {}
+        with BenchmarkCommand().environment(options) as dataset:
+            tables = {
+                table
+                for connection in connections.all()
+                for table in connection.introspection.table_names()
+            }
+            for endpoint in endpoints:
+                try:
+                    result = run_endpoint(
+                        endpoint, dataset, iterations=1, warmup=0, explain=True
+                    )
+                except AssertionError as e:
+                    raise CommandError(str(e)) from e
+                for plan in result['plans']:
+                    issues = find_plan_issues(plan['plan'], tables)
+                    if not issues:
+                        continue
+                    finding = findings.setdefault(
+                        normalize_sql(plan['sql']),
+                        {
+                            'sql': plan['sql'],
+                            'issues': issues,
+                            'plan': plan['plan'],
+                            'scenarios': [],
+                        },
+                    )
+                    if endpoint.name not in finding['scenarios']:
+                        finding['scenarios'].append(endpoint.name)
+
+        for finding in findings.values():
+            self.write_finding(finding)
+        if options['output']:
+            options['output'].parent.mkdir(parents=True, exist_ok=True)
+            options['output'].write_text(
+                json.dumps(
+                    list(findings.values()), ensure_ascii=False, indent=2
+                )
+            )
+        style = self.style.WARNING if findings else self.style.SUCCESS
+        self.stdout.write(style(f'Запросов c замечаниями: {len(findings)}'))
+
+    def write_finding(self, finding: dict) -> None:
+        """Выводит запрос c замечаниями и сценарии, в которых он встречен."""
+        self.stdout.write(
+            self.style.WARNING(', '.join(sorted(set(finding['issues']))))
+            + f'  [{", ".join(finding["scenarios"])}]'
+        )
+        self.stdout.write(f'    {finding["sql"][:160]}')
+        for line in finding['plan']:
+            self.stdout.write(f'      {line}')
@@ -0,0 +1,367 @@
+"""
+Метрики приложения в формате Prometheus без внешних сервисов.
+
+Каждый процесс (воркер gunicorn) копит метрики в памяти и периодически
+сбрасывает снимок в файл `<METRICS['DIR']>/metrics-<pid>.json`.
+Эндпоинт `/metrics` объединяет снимки всех процессов: счётчики
+и гистограммы суммируются, gauge-метрики выводятся только для живых
+процессов c меткой `pid`. Снимки завершившихся процессов сворачиваются
+в общий файл, чтобы счётчики не обнулялись после перезапуска воркеров.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from contextlib import contextmanager, suppress
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+HISTOGRAM = 'histogram'
+
+DURATION_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+METRICS = {
+    'foodgram_http_request_duration_seconds': (
+        HISTOGRAM,
+        'Время обработки запроса по view.',
+    ),
+    'foodgram_db_queries_total': (COUNTER, 'Количество SQL-запросов по view.'),
+    'foodgram_db_query_duration_seconds_total': (
+        COUNTER,
+        'Суммарное время SQL-запросов по view.',
+    ),
+    'foodgram_cache_requests_total': (
+        COUNTER,
+        'Обращения к кэшу по результату (hit/miss).',
+    ),
+    'foodgram_throttled_requests_total': (
+        COUNTER,
+        'Запросы, отклонённые throttling, по scope.',
+    ),
+    'foodgram_statement_timeouts_total': (
+        COUNTER,
+        'SQL-запросы, прерванные по лимиту времени view.',
+    ),
+    'foodgram_shed_requests_total': (
+        COUNTER,
+        'Запросы, отклонённые при перегрузке воркера, по приоритету.',
+    ),
+    'foodgram_process_resident_memory_bytes': (
+        GAUGE,
+        'Резидентная память процесса (воркера).',
+    ),
+    'foodgram_db_pool_size': (
+        GAUGE,
+        'Соединений в пуле БД (выданных и свободных).',
+    ),
+    'foodgram_db_pool_available': (GAUGE, 'Свободных соединений в пуле БД.'),
+    'foodgram_db_pool_requests_waiting': (
+        GAUGE,
+        'Запросов соединения, ожидающих в очереди пула БД.',
+    ),
+    'foodgram_db_pool_connections_total': (
+        COUNTER,
+        'Попыток пула БД открыть соединение.',
+    ),
+    'foodgram_db_pool_wait_seconds_total': (
+        COUNTER,
+        'Суммарное время ожидания соединения из пула БД.',
+    ),
+    'foodgram_db_pool_errors_total': (
+        COUNTER,
+        'Запросы соединения, завершившиеся ошибкой или таймаутом.',
+    ),
+}
+
+# Счётчики `ConnectionPool.pop_stats()` и соответствующие метрики
+POOL_COUNTERS = {
+    'connections_num': ('foodgram_db_pool_connections_total', 1),
+    'requests_wait_ms': ('foodgram_db_pool_wait_seconds_total', 0.001),
+    'requests_errors': ('foodgram_db_pool_errors_total', 1),
+}
+
+DEAD_PROCESSES_FILE = 'metrics-dead.json'
+
+
+def _key(labels: dict | None) -> str:
+    return json.dumps(sorted((labels or {}).items()))
+
+
+def _resident_memory() -> int:
+    """Возвращает RSS текущего процесса в байтах."""
+    with suppress(OSError, ValueError, IndexError):
+        pages = Path('/proc/self/statm').read_text().split()[1]
+        return int(pages) * os.sysconf('SC_PAGE_SIZE')
+    import resource  # noqa: PLC0415
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MetricsRegistry:
+    """
+    Потокобезопасное хранилище метрик одного процесса.
+
+    Значения хранятся как `{имя метрики: {json меток: значение}}`.
+    Для гистограмм значение — список счётчиков по корзинам
+    `DURATION_BUCKETS` плюс `+Inf`, сумма и количество наблюдений.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: dict[str, dict[str, object]] = {}
+        self._last_flush = 0.0
+
+    def inc(self, name: str, labels: dict | None = None, value=1) -> None:
+        """Увеличивает счётчик."""
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            key = _key(labels)
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value, labels: dict | None = None) -> None:
+        """Устанавливает значение gauge-метрики."""
+        with self._lock:
+            self._values.setdefault(name, {})[_key(labels)] = value
+
+    def observe(self, name: str, value: float, labels: dict | None = None):
+        """Добавляет наблюдение в гистограмму."""
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            key = _key(labels)
+            if key not in series:
+                series[key] = [0] * (len(DURATION_BUCKETS) + 1) + [0.0, 0]
+            histogram = series[key]
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if value <= bound:
+                    histogram[index] += 1
+                    break
+            else:
+                histogram[len(DURATION_BUCKETS)] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def snapshot(self) -> dict:
+        """Возвращает копию текущих значений."""
+        with self._lock:
+            return json.loads(json.dumps(self._values))
+
+    def flush(self, force: bool = False) -> None:
+        """
+        Сбрасывает снимок метрик процесса в файл.
+
+        Без `force` запись происходит не чаще, чем раз в
+        `METRICS['FLUSH_INTERVAL']` секунд.
+        """
+        now = time.monotonic()
+        if not force and (
+            now - self._last_flush < settings.METRICS['FLUSH_INTERVAL']
+        ):
+            return
+        self._last_flush = now
+        self.set('foodgram_process_resident_memory_bytes', _resident_memory())
+        self.record_pool_stats()
+        directory = Path(settings.METRICS['DIR'])
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            _write_json(
+                directory / f'metrics-{os.getpid()}.json', self.snapshot()
+            )
+        except OSError:
+            logger.exception('Не удалось сохранить метрики процесса')
+
+    def record_pool_stats(self) -> None:
+        """
+        Записывает статистику пулов соединений БД (psycopg_pool).
+
+        Счётчики пула обнуляются при чтении (`pop_stats`), поэтому
+        к метрикам прибавляется прирост c прошлого сброса.
+        """
+        for alias in connections:
+            pool = getattr(connections[alias], 'pool', None)
+            if pool is None or pool.closed:
+                continue
+            stats = pool.pop_stats()
+            labels = {'alias': alias}
+            self.set('foodgram_db_pool_size', stats['pool_size'], labels)
+            self.set(
+                'foodgram_db_pool_available', stats['pool_available'], labels
+            )
+            self.set(
+                'foodgram_db_pool_requests_waiting',
+                stats['requests_waiting'],
+                labels,
+            )
+            for stat, (name, scale) in POOL_COUNTERS.items():
+                if stats.get(stat):
+                    self.inc(name, labels, stats[stat] * scale)
+
+
+registry = MetricsRegistry()
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+    tmp_path.write_text(json.dumps(data))
+    tmp_path.replace(path)
+
+
+def _read_json(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge(target: dict, source: dict, with_gauges: bool) -> None:
+    """Суммирует счётчики и гистограммы `source` в `target`."""
+    for name, series in source.items():
+        kind = METRICS.get(name, (COUNTER,))[0]
+        if kind == GAUGE and not with_gauges:
+            continue
+        merged = target.setdefault(name, {})
+        for key, value in series.items():
+            if kind == HISTOGRAM:
+                current = merged.get(key, [0] * len(value))
+                merged[key] = [
+                    a + b for a, b in zip(current, value, strict=True)
+                ]
+            elif kind == GAUGE:
+                merged[key] = value
+            else:
+                merged[key] = merged.get(key, 0) + value
+
+
+@contextmanager
+def _directory_lock(directory: Path):
+    if fcntl is None:
+        yield
+        return
+    with (directory / '.lock').open('w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def collect() -> dict:
+    """
+    Собирает метрики всех процессов.
+
+    Снимки завершившихся процессов сворачиваются в `metrics-dead.json`
+    (их gauge-метрики отбрасываются), после чего файлы удаляются.
+
+    Returns:
+        dict: Объединённые значения `{имя: {json меток: значение}}`.
+    """
+    registry.flush(force=True)
+    directory = Path(settings.METRICS['DIR'])
+    result: dict = {}
+    with _directory_lock(directory):
+        dead_path = directory / DEAD_PROCESSES_FILE
+        dead = _read_json(dead_path)
+        compacted = False
+        for path in directory.glob('metrics-*.json'):
+            if path.name == DEAD_PROCESSES_FILE:
+                continue
+            pid = int(path.stem.removeprefix('metrics-'))
+            snapshot = _read_json(path)
+            if _is_alive(pid):
+                for series in (
+                    snapshot.get(name, {})
+                    for name, (kind, _) in METRICS.items()
+                    if kind == GAUGE
+                ):
+                    for key in list(series):
+                        labels = dict(json.loads(key))
+                        series[_key({**labels, 'pid': str(pid)})] = series.pop(
+                            key
+                        )
+                _merge(result, snapshot, with_gauges=True)
+            else:
+                _merge(dead, snapshot, with_gauges=False)
+                path.unlink(missing_ok=True)
+                compacted = True
+        if compacted:
+            _write_json(dead_path, dead)
+    _merge(result, dead, with_gauges=False)
+    return result
+
+
+def _escape(value) -> str:
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ''
+    pairs = (
+        f'{name}="{_escape(value)}"' for name, value in sorted(labels.items())
+    )
+    return '{' + ','.join(pairs) + '}'
+
+
+def render_prometheus(values: dict) -> str:
+    """Форматирует метрики в текстовый формат экспозиции Prometheus."""
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        series = values.get(name)
+        if not series:
+            continue
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for key, value in sorted(series.items()):
+            labels = dict(json.loads(key))
+            if kind != HISTOGRAM:
+                lines.append(f'{name}{_format_labels(labels)} {value}')
+                continue
+            cumulative = 0
+            bounds = [*map(str, DURATION_BUCKETS), '+Inf']
+            for bound, count in zip(bounds, value[:-2], strict=True):
+                cumulative += count
+                bucket_labels = _format_labels({**labels, 'le': bound})
+                lines.append(f'{name}_bucket{bucket_labels} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {value[-2]}')
+            lines.append(f'{name}_count{_format_labels(labels)} {value[-1]}')
+    return '\n'.join(lines) + '\n'
@@ -1,8 +1,47 @@
+import cProfile
+import hashlib
+import logging
+import random
+import time
+
+from collections import Counter
+from contextlib import ExitStack
+from http import HTTPStatus
+
+from django.conf import settings
 from django.contrib import messages
+from django.core.cache import cache
+from django.db import connections
+from django.http import JsonResponse
 from django.shortcuts import redirect
+from django.utils.cache import patch_vary_headers
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.module_loading import import_string
+from rest_framework.permissions import SAFE_METHODS
 
+from apps.core.admission import Priority, controller, parse_request_start
+from apps.core.compression import (
+    IDENTITY,
+    compress,
+    is_compressible,
+    negotiate,
+    set_cached_body,
+)
 from apps.core.exceptions import ProjectError
+from apps.core.metrics import registry
+from apps.core.profiling import get_trigger, save_profile
+from config.routers import use_replicas
+
+logger = logging.getLogger(__name__)
+
+REPLICA_STICKY_KEY = 'db:sticky:{client}'
+
+
+def get_credentials(request) -> str | None:
+    """Возвращает заголовок Authorization или cookie сессии клиента."""
+    return request.META.get('HTTP_AUTHORIZATION') or (
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    )
 
 
 class ProjectExceptionMiddleware(MiddlewareMixin):
@@ -17,3 +56,377 @@ class ProjectExceptionMiddleware(MiddlewareMixin):
             return redirect(request.META.get('HTTP_REFERER', '/admin/'))
 
         return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Направляет чтение запросов безопасными методами на реплики БД.
+
+    После запроса, изменяющего данные, клиент (токен или сессия) ещё
+    `READ_REPLICAS['STICKY_SECONDS']` секунд читает из основной базы,
+    чтобы видеть свои изменения несмотря на задержку репликации.
+    Без настроенных реплик ничего не делает.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = settings.READ_REPLICAS
+
+    def __call__(self, request):
+        if not self.config['ALIASES']:
+            return self.get_response(request)
+
+        client = self.client_key(request)
+        sticky_key = REPLICA_STICKY_KEY.format(client=client)
+        if request.method not in SAFE_METHODS:
+            try:
+                return self.get_response(request)
+            finally:
+                if client is not None:
+                    cache.set(
+                        sticky_key, 1, timeout=self.config['STICKY_SECONDS']
+                    )
+
+        sticky = client is not None and cache.get(sticky_key) is not None
+        with use_replicas(not sticky):
+            return self.get_response(request)
+
+    @staticmethod
+    def client_key(request) -> str | None:
+        """Возвращает хэш токена или сессии клиента; без них — None."""
+        credentials = get_credentials(request)
+        if not credentials:
+            return None
+        return hashlib.sha256(credentials.encode()).hexdigest()
+
+
+class AdmissionControlMiddleware:
+    """
+    Отклоняет низкоприоритетные запросы, когда воркер перегружен.
+
+    Приоритет берётся из словаря `ADMISSION_CONTROL['ROUTE_PRIORITIES']`
+    по имени маршрута; запросы небезопасными методами всегда `HIGH`.
+    Отклонённый запрос получает 503 c заголовком `Retry-After`, не
+    доходя до view. Нагрузку оценивает `apps.core.admission.controller`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = settings.ADMISSION_CONTROL
+        self.priorities = (
+            import_string(self.config['ROUTE_PRIORITIES'])
+            if self.config['ENABLED']
+            else {}
+        )
+
+    def __call__(self, request):
+        if not self.config['ENABLED']:
+            return self.get_response(request)
+
+        controller.started()
+        start = time.perf_counter()
+        duration_ms = None
+        try:
+            response = self.get_response(request)
+            if getattr(request, 'admission_priority', None) not in (
+                None,
+                Priority.HIGH,
+            ):
+                duration_ms = (time.perf_counter() - start) * 1000
+        finally:
+            controller.finished(duration_ms)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.config['ENABLED']:
+            return None
+        priority = self.get_priority(request)
+        queue_ms = parse_request_start(
+            request.META.get('HTTP_X_REQUEST_START')
+        )
+        if controller.admits(priority, queue_ms):
+            request.admission_priority = priority
+            return None
+
+        registry.inc(
+            'foodgram_shed_requests_total',
+            {
+                'view': request.resolver_match.view_name,
+                'priority': priority.name.lower(),
+            },
+        )
+        response = JsonResponse(
+            {'detail': 'Сервер перегружен, повторите запрос позже.'},
+            status=HTTPStatus.SERVICE_UNAVAILABLE,
+        )
+        response['Retry-After'] = str(self.config['RETRY_AFTER'])
+        return response
+
+    def get_priority(self, request) -> Priority:
+        """Возвращает приоритет запроса по маршруту и учётным данным."""
+        if request.method not in SAFE_METHODS:
+            return Priority.HIGH
+        route = self.priorities.get(request.resolver_match.view_name)
+        if route is None:
+            return Priority.NORMAL
+        if route.anonymous is not None and not get_credentials(request):
+            return route.anonymous
+        return route.default
+
+
+class QueryCollector:
+    """
+    Обёртка для `connection.execute_wrapper`, считающая SQL-запросы.
+
+    Запоминает количество, суммарное время и повторы одинакового SQL
+    (c плейсхолдерами вместо параметров), что является признаком N+1.
+
+    Attributes:
+        count (int): Количество выполненных запросов.
+        duration (float): Суммарное время запросов в секундах.
+        statements (Counter): Количество выполнений каждого SQL.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self) -> int:
+        """Количество повторных выполнений одного и того же SQL."""
+        return sum(count - 1 for count in self.statements.values())
+
+    def most_repeated(self, limit: int) -> list[tuple[str, int]]:
+        """Возвращает самые часто повторяющиеся SQL-запросы."""
+        return [
+            (sql, count)
+            for sql, count in self.statements.most_common(limit)
+            if count > 1
+        ]
+
+
+class QueryProfilingMiddleware:
+    """
+    Профилирует запросы: число и время SQL-запросов, общее время ответа.
+
+    Работает на доле запросов `REQUEST_PROFILING['SAMPLE_RATE']`.
+    Для профилируемых запросов добавляет заголовок `Server-Timing`
+    и пишет в лог запросы, превысившие пороги по времени, числу
+    SQL-запросов или числу повторов одинакового SQL.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = settings.REQUEST_PROFILING
+
+    def __call__(self, request):
+        if not self.config['ENABLED'] or (
+            random.random() >= self.config['SAMPLE_RATE']  # noqa: S311
+        ):
+            return self.get_response(request)
+
+        collector = QueryCollector()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        if self.config['SERVER_TIMING']:
+            response['Server-Timing'] = self.server_timing(collector, total)
+        self.log_if_slow(request, collector, total)
+        return response
+
+    @staticmethod
+    def server_timing(collector: QueryCollector, total: float) -> str:
+        """Формирует значение заголовка Server-Timing."""
+        db_ms = collector.duration * 1000
+        total_ms = total * 1000
+        return (
+            f'db;dur={db_ms:.1f};desc="{collector.count} queries", '
+            f'app;dur={total_ms - db_ms:.1f}, '
+            f'total;dur={total_ms:.1f}'
+        )
+
+    def log_if_slow(
+        self, request, collector: QueryCollector, total: float
+    ) -> None:
+        """Пишет предупреждение, если запрос превысил пороги."""
+        if (
+            total * 1000 < self.config['SLOW_REQUEST_MS']
+            and collector.count <= self.config['MAX_QUERIES']
+            and collector.duplicates <= self.config['MAX_DUPLICATES']
+        ):
+            return
+        repeated = '\n'.join(
+            f'  x{count}: {sql}'
+            for sql, count in collector.most_repeated(
+                self.config['TOP_REPEATED']
+            )
+        )
+        logger.warning(
+            'Медленный запрос %s %s: %.1f мс, SQL: %d (%.1f мс), '
+            'повторов: %d\n%s',
+            request.method,
+            request.get_full_path(),
+            total * 1000,
+            collector.count,
+            collector.duration * 1000,
+            collector.duplicates,
+            repeated,
+        )
+
+
+class MetricsMiddleware:
+    """
+    Собирает метрики запросов для эндпоинта `/metrics`.
+
+    Для каждого view (по имени маршрута) записывает гистограмму
+    времени ответа, число и суммарное время SQL-запросов.
+    Снимок метрик процесса периодически сбрасывается на диск.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = settings.METRICS['ENABLED']
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        collector = QueryCollector()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = match.view_name if match else '<unresolved>'
+        registry.observe(
+            'foodgram_http_request_duration_seconds',
+            total,
+            {
+                'view': view,
+                'method': request.method,
+                'status': response.status_code,
+            },
+        )
+        registry.inc(
+            'foodgram_db_queries_total', {'view': view}, collector.count
+        )
+        registry.inc(
+            'foodgram_db_query_duration_seconds_total',
+            {'view': view},
+            collector.duration,
+        )
+        registry.flush()
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Сжимает ответы gzip или brotli по заголовку `Accept-Encoding`.
+
+    Если view пометила ответ ключом `body_cache_key`, тело и его сжатые
+    варианты сохраняются в кэше тел; ответ из этого кэша приносит готовые
+    варианты в `encoded_bodies`, и повторно сжимать его не нужно
+    (см. `apps.core.compression`).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = settings.COMPRESSION
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.config['ENABLED'] or not is_compressible(
+            request, response
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        content = response.content
+        cached = getattr(response, 'encoded_bodies', None)
+        bodies = cached or {IDENTITY: content}
+        encoding = None
+        if len(content) >= self.config['MIN_LENGTH']:
+            encoding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is not None and encoding not in bodies:
+            bodies = {**bodies, encoding: compress(content, encoding)}
+
+        cache_key = getattr(response, 'body_cache_key', None)
+        if (
+            cache_key is not None
+            and bodies is not cached
+            and response.status_code == HTTPStatus.OK
+        ):
+            set_cached_body(cache_key, response['Content-Type'], bodies)
+        if encoding is None:
+            return response
+
+        response.content = bodies[encoding]
+        response['Content-Encoding'] = encoding
+        response['Content-Length'] = str(len(response.content))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = f'W/{etag}'
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Снимает профиль cProfile c выбранных запросов.
+
+    Профилируются запросы сотрудников c заголовком `X-Profile` и доля
+    `PROFILING['SAMPLE_RATE']` всех запросов. Для запросов по заголовку
+    в ответ добавляется `X-Profile-Id` c идентификатором сохранённого
+    профиля (см. раздел «Профили запросов» в админке).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = settings.PROFILING['ENABLED']
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+        trigger, user = get_trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Уже активен другой профилировщик (например, отладчик).
+            return self.get_response(request)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - start
+
+        try:
+            dump = save_profile(
+                profiler, request, response, duration, trigger, user
+            )
+        except Exception:
+            logger.exception('Не удалось сохранить профиль запроса')
+            return response
+        if dump is not None and user is not None:
+            response['X-Profile-Id'] = str(dump.pk)
+        return response
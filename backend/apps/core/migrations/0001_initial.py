@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-19 08:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileDump',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='создано')),
+                ('method', models.CharField(max_length=10, verbose_name='метод')),
+                ('path', models.CharField(max_length=512, verbose_name='путь')),
+                ('view_name', models.CharField(blank=True, max_length=255, verbose_name='view')),
+                ('status', models.PositiveSmallIntegerField(verbose_name='статус ответа')),
+                ('duration_ms', models.FloatField(verbose_name='время, мс')),
+                ('trigger', models.CharField(choices=[('header', 'заголовок'), ('sample', 'выборка')], max_length=10, verbose_name='причина')),
+                ('file_name', models.CharField(max_length=255, verbose_name='файл')),
+                ('summary', models.TextField(blank=True, verbose_name='сводка')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='profile_dumps', to=settings.AUTH_USER_MODEL, verbose_name='пользователь')),
+            ],
+            options={
+                'verbose_name': 'профиль запроса',
+                'verbose_name_plural': 'профили запросов',
+                'ordering': ('-created_at',),
+            },
+        ),
+    ]
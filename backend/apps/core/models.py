@@ -1,3 +1,6 @@
+from pathlib import Path
+
+from django.conf import settings
 from django.db import models
 
 
@@ -17,3 +20,51 @@ class TimeStampModel(models.Model):
         abstract = True
         ordering = ('-updated_at', '-created_at')
         default_related_name = '%(app_label)s_%(class)s'
+
+
+class ProfileDump(models.Model):
+    """
+    Профиль (cProfile) одного запроса.
+
+    Сам профиль хранится файлом в `PROFILING['DIR']`, модель хранит
+    метаданные запроса и текстовую сводку по самым дорогим функциям.
+    Количество дампов ограничено `PROFILING['MAX_DUMPS']` (кольцевой
+    буфер: старые дампы удаляются вместе c файлами).
+    """
+
+    class Trigger(models.TextChoices):
+        HEADER = 'header', 'заголовок'
+        SAMPLE = 'sample', 'выборка'
+
+    created_at = models.DateTimeField('создано', auto_now_add=True)
+    method = models.CharField('метод', max_length=10)
+    path = models.CharField('путь', max_length=512)
+    view_name = models.CharField('view', max_length=255, blank=True)
+    status = models.PositiveSmallIntegerField('статус ответа')
+    duration_ms = models.FloatField('время, мс')
+    trigger = models.CharField(
+        'причина', max_length=10, choices=Trigger.choices
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='profile_dumps',
+        verbose_name='пользователь',
+    )
+    file_name = models.CharField('файл', max_length=255)
+    summary = models.TextField('сводка', blank=True)
+
+    class Meta:
+        verbose_name = 'профиль запроса'
+        verbose_name_plural = 'профили запросов'
+        ordering = ('-created_at',)
+
+    def __str__(self) -> str:
+        return f'{self.method} {self.path} ({self.duration_ms:.0f} мс)'
+
+    @property
+    def file_path(self) -> Path:
+        """Путь к файлу профиля."""
+        return Path(settings.PROFILING['DIR']) / self.file_name
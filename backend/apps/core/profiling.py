@@ -0,0 +1,133 @@
+"""
+Профилирование отдельных запросов через cProfile.
+
+Профиль снимается, если запрос прислал заголовок `X-Profile`
+и принадлежит сотруднику (is_staff), либо попал в случайную выборку
+`PROFILING['SAMPLE_RATE']`. Выборочные профили сохраняются, только если
+запрос оказался медленнее `PROFILING['MIN_DURATION_MS']`.
+"""
+
+import io
+import pstats
+import random
+import uuid
+
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.authentication import (
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework.authtoken.models import Token
+
+from apps.core.models import ProfileDump
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+
+
+def get_staff_user(request):
+    """
+    Возвращает сотрудника, от имени которого выполнен запрос.
+
+    Сначала проверяется пользователь сессии, затем токен из заголовка
+    `Authorization`, т.к. DRF аутентифицирует запрос только внутри view.
+    Токен читается из БД, a не через `CachedTokenAuthentication`:
+    отозванный токен или снятый флаг is_staff не должны открывать
+    профилирование до истечения `TOKEN_AUTH_CACHE_TIMEOUT`.
+
+    Returns:
+        User | None: Пользователь c is_staff или None.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user if user.is_staff else None
+    try:
+        keyword, key = get_authorization_header(request).split()
+    except ValueError:
+        return None
+    if keyword.lower() != TokenAuthentication.keyword.lower().encode():
+        return None
+    try:
+        token = Token.objects.select_related('user').get(key=key.decode())
+    except (Token.DoesNotExist, UnicodeError):
+        return None
+    user = token.user
+    return user if user.is_active and user.is_staff else None
+
+
+def get_trigger(request) -> tuple[str | None, object]:
+    """
+    Определяет, нужно ли профилировать запрос.
+
+    Returns:
+        tuple: Причина (`ProfileDump.Trigger`) или None и сотрудник,
+            запросивший профиль через заголовок.
+    """
+    if request.META.get(PROFILE_HEADER):
+        user = get_staff_user(request)
+        if user is not None:
+            return ProfileDump.Trigger.HEADER, user
+    if random.random() < settings.PROFILING['SAMPLE_RATE']:  # noqa: S311
+        return ProfileDump.Trigger.SAMPLE, None
+    return None, None
+
+
+def save_profile(
+    profiler, request, response, duration: float, trigger: str, user
+) -> ProfileDump | None:
+    """
+    Сохраняет профиль запроса в кольцевой буфер.
+
+    Args:
+        profiler (cProfile.Profile): Остановленный профилировщик.
+        request (HttpRequest): Запрос.
+        response (HttpResponse): Ответ.
+        duration (float): Время обработки запроса в секундах.
+        trigger (str): Причина профилирования.
+        user (User | None): Сотрудник, запросивший профиль.
+
+    Returns:
+        ProfileDump | None: Сохранённый профиль или None, если выборочный
+            запрос оказался быстрее порога.
+    """
+    duration_ms = duration * 1000
+    if (
+        trigger == ProfileDump.Trigger.SAMPLE
+        and duration_ms < settings.PROFILING['MIN_DURATION_MS']
+    ):
+        return None
+
+    directory = Path(settings.PROFILING['DIR'])
+    directory.mkdir(parents=True, exist_ok=True)
+    file_name = f'{timezone.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}.prof'
+    profiler.dump_stats(directory / file_name)
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+        settings.PROFILING['TOP_FUNCTIONS']
+    )
+    match = request.resolver_match
+    dump = ProfileDump.objects.create(
+        method=request.method,
+        path=request.get_full_path()[:512],
+        view_name=match.view_name if match else '',
+        status=response.status_code,
+        duration_ms=duration_ms,
+        trigger=trigger,
+        user=user,
+        file_name=file_name,
+        summary=stream.getvalue(),
+    )
+    prune_dumps()
+    return dump
+
+
+def prune_dumps() -> None:
+    """Удаляет дампы сверх `PROFILING['MAX_DUMPS']`, начиная со старых."""
+    limit = settings.PROFILING['MAX_DUMPS']
+    stale = ProfileDump.objects.values_list('pk', flat=True)[limit:]
+    for dump in ProfileDump.objects.filter(pk__in=list(stale)):
+        dump.delete()
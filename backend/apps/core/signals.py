@@ -0,0 +1,23 @@
+import logging
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from apps.core.models import ProfileDump
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_delete, sender=ProfileDump, dispatch_uid='delete_profile_file')
+def delete_profile_file(sender, instance, **kwargs):
+    """
+    Удаляет файл профиля вместе c записью.
+
+    Args:
+        sender (Model): Класс модели, отправившей сигнал.
+        instance (ProfileDump): Экземпляр модели, который был удалён.
+    """
+    try:
+        instance.file_path.unlink(missing_ok=True)
+    except OSError:
+        logger.exception('Не удалось удалить файл профиля %s', instance)
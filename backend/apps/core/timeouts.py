@@ -0,0 +1,137 @@
+"""
+Ограничение времени выполнения SQL-запросов.
+
+`statement_timeout()` устанавливает лимит на каждый SQL-запрос во всех
+подключениях к БД внутри блока:
+- PostgreSQL — `SET statement_timeout` перед первым запросом
+  подключения и `RESET statement_timeout` при выходе из блока
+  (`SET LOCAL` действовал бы только до конца транзакции, т.е. в режиме
+  autocommit — один запрос);
+- SQLite — progress handler, прерывающий запрос по истечении лимита.
+
+Прерванный запрос завершается `OperationalError`, которую распознаёт
+`is_statement_timeout`.
+"""
+
+import time
+
+from contextlib import ExitStack, contextmanager, suppress
+from functools import partial
+
+from django.db import DatabaseError, connections
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# Через сколько инструкций VM SQLite вызывается progress handler
+SQLITE_PROGRESS_STEPS = 1000
+# SQLSTATE query_canceled (PostgreSQL)
+QUERY_CANCELED = '57014'
+
+
+class StatementTimeoutExceeded(APIException):
+    """Ответ 503, если SQL-запрос превысил лимит времени view."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Запрос выполняется слишком долго, повторите позже.'
+    default_code = 'statement_timeout'
+
+    def __init__(self, wait: int = 1):
+        super().__init__()
+        # DRF передаёт `wait` в заголовок Retry-After
+        self.wait = wait
+
+
+class StatementTimeout:
+    """
+    Обёртка для `connection.execute_wrapper`, ограничивающая время запросов.
+
+    Лимит отсчитывается от начала каждого запроса. В SQLite progress
+    handler остаётся установленным до `reset()`, поэтому прерывается и
+    долгое чтение строк результата, a не только `execute`.
+
+    Args:
+        timeout_ms (int): Лимит на один SQL-запрос в миллисекундах.
+    """
+
+    def __init__(self, timeout_ms: int):
+        self.timeout_ms = timeout_ms
+        self.configured = set()
+        self.deadlines = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        connection = context['connection']
+        alias = connection.alias
+        if connection.vendor == 'postgresql' and alias not in self.configured:
+            self.execute_raw(
+                connection, f'SET statement_timeout = {int(self.timeout_ms)}'
+            )
+            self.configured.add(alias)
+        elif connection.vendor == 'sqlite':
+            if alias not in self.configured:
+                connection.connection.set_progress_handler(
+                    partial(self.expired, alias), SQLITE_PROGRESS_STEPS
+                )
+                self.configured.add(alias)
+            self.deadlines[alias] = time.monotonic() + self.timeout_ms / 1000
+        return execute(sql, params, many, context)
+
+    def expired(self, alias: str) -> bool:
+        """Progress handler SQLite: True прерывает текущий запрос."""
+        return time.monotonic() > self.deadlines[alias]
+
+    def reset(self) -> None:
+        """Снимает лимит со всех подключений, где он был установлен."""
+        for alias in self.configured:
+            connection = connections[alias]
+            if connection.connection is None:
+                continue
+            if connection.vendor == 'sqlite':
+                connection.connection.set_progress_handler(None, 0)
+                continue
+            with suppress(DatabaseError):
+                self.execute_raw(connection, 'RESET statement_timeout')
+        self.configured.clear()
+
+    @staticmethod
+    def execute_raw(connection, sql: str) -> None:
+        """Выполняет служебный SQL в обход обёрток и учёта запросов."""
+        with (
+            connection.wrap_database_errors,
+            connection.connection.cursor() as cursor,
+        ):
+            cursor.execute(sql)
+
+
+@contextmanager
+def statement_timeout(timeout_ms: int | None):
+    """
+    Ограничивает время каждого SQL-запроса внутри блока.
+
+    Args:
+        timeout_ms (int | None): Лимит в миллисекундах; 0 или None —
+            без ограничения.
+    """
+    if not timeout_ms:
+        yield
+        return
+    wrapper = StatementTimeout(timeout_ms)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(wrapper))
+            yield
+    finally:
+        wrapper.reset()
+
+
+def is_statement_timeout(exc: BaseException) -> bool:
+    """Проверяет, что запрос прерван по лимиту времени."""
+    if not isinstance(exc, DatabaseError):
+        return False
+    cause = exc.__cause__
+    sqlstate = getattr(cause, 'sqlstate', None) or getattr(
+        cause, 'pgcode', None
+    )
+    if sqlstate is not None:
+        return sqlstate == QUERY_CANCELED
+    return str(exc) == 'interrupted'
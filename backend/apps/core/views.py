@@ -0,0 +1,37 @@
+import ipaddress
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+
+from apps.core.metrics import collect, render_prometheus
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _is_internal(request) -> bool:
+    """Проверяет, что запрос пришёл из разрешённой внутренней сети."""
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network.strip(), strict=False)
+        for network in settings.METRICS['ALLOWED_NETWORKS']
+        if network.strip()
+    )
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Отдаёт метрики всех воркеров в текстовом формате Prometheus.
+
+    Доступен только из сетей `METRICS['ALLOWED_NETWORKS']`, для
+    остальных адресов эндпоинт не существует (404).
+    """
+    if not settings.METRICS['ENABLED'] or not _is_internal(request):
+        raise Http404
+    return HttpResponse(
+        render_prometheus(collect()), content_type=PROMETHEUS_CONTENT_TYPE
+    )
@@ -1,6 +1,8 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth import get_user_model
 from django.db.models import Count
+from django.db.models.functions import Left
 
 from apps.core.admin_mixins import ReadOnlyInLineMixin
 from apps.core.constants import TEXT_TRUNCATE_LENGTH_ADMIN
@@ -142,6 +144,25 @@ class MeasurementUnitAdmin(admin.ModelAdmin):
     readonly_fields = ('updated_at', 'created_at')
 
 
+class RecipeChangeList(ChangeList):
+    """
+    Список рецептов в админке без полного описания.
+
+    Вместо `text` загружается только его начало (`text_preview`),
+    достаточное для колонки «описание».
+    """
+
+    def get_queryset(self, request, exclude_parameters=None):
+        return (
+            super()
+            .get_queryset(request, exclude_parameters)
+            .defer('text')
+            .annotate(
+                text_preview=Left('text', TEXT_TRUNCATE_LENGTH_ADMIN + 1)
+            )
+        )
+
+
 @admin.register(Recipe)
 class RecipeAdmin(admin.ModelAdmin):
     """
@@ -201,7 +222,10 @@ class RecipeAdmin(admin.ModelAdmin):
     @admin.display(description='описание')
     def short_text(self, obj):
         """Возвращает сокращенное описание рецепта."""
-        return truncate_text(obj.text, length=TEXT_TRUNCATE_LENGTH_ADMIN)
+        text = getattr(obj, 'text_preview', None)
+        if text is None:
+            text = obj.text
+        return truncate_text(text, length=TEXT_TRUNCATE_LENGTH_ADMIN)
 
     @admin.display(description='время приготовления', ordering='cooking_time')
     def cooking_time_display(self, obj):
@@ -224,6 +248,10 @@ class RecipeAdmin(admin.ModelAdmin):
             title='Показать ингредиенты',
         )
 
+    def get_changelist(self, request, **kwargs):
+        """Возвращает список рецептов без полного описания."""
+        return RecipeChangeList
+
     def get_queryset(self, request):
         """
         Расширяет queryset:
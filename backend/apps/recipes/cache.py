@@ -0,0 +1,253 @@
+"""
+Версии данных рецептов в общем кэше.
+
+Используются для валидаторов условных GET (ETag / Last-Modified)
+и ключей кэша ответов. Версия — время последнего изменения
+(timestamp), поэтому из неё же строится Last-Modified.
+
+- версия контента меняется при изменении тегов, ингредиентов,
+  единиц измерения и профилей пользователей (авторов);
+- версия состояния пользователя меняется при изменении его избранного,
+  корзины и подписок;
+- время изменения рецепта дублирует `Recipe.updated_at`, чтобы
+  проверить детальный запрос без обращения к БД.
+
+Страницы списка рецептов кэшируются в двух слоях: общая для всех
+пользователей страница (`get_list_page` / `set_list_page`) и множества
+id избранного, корзины и подписок пользователя (`get_user_relations`),
+из которых в неё подставляются персональные флаги.
+
+Сериализованные рецепты без персональных полей (фрагменты) кэшируются
+по id вместе c `updated_at`; фрагмент c другим `updated_at` считается
+устаревшим. Изменения, не затрагивающие `updated_at` (теги,
+ингредиенты, профиль автора), вытесняют фрагменты сигналами
+(`evict_recipe_fragments`).
+
+Slug тегов и их биты маски (`Tag.bit`) хранятся в реестре тегов
+(`get_tag_registry`), который сбрасывается сигналами Tag. По нему
+фильтр рецептов по тегам проверяет значения и строит маску без БД.
+
+Отсутствующая (вытесненная) версия инициализируется текущим временем:
+валидаторы при этом меняются, и клиент получает полный ответ.
+"""
+
+import time
+
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import CharField, Value
+
+from apps.users.models import Cart, Favorite, Subscribe
+
+CONTENT_VERSION_KEY = 'recipes:version:content'
+USER_STATE_VERSION_KEY = 'recipes:version:user:{user_id}'
+RECIPE_UPDATED_KEY = 'recipes:updated:{recipe_id}'
+LIST_PAGE_KEY = 'recipes:list:{digest}'
+USER_RELATIONS_KEY = 'recipes:relations:{user_id}:{version}'
+FRAGMENT_KEY = 'recipes:fragment:{recipe_id}'
+TAG_REGISTRY_KEY = 'recipes:tags:registry'
+
+
+class UserRelations(NamedTuple):
+    """Id рецептов и авторов, связанных c пользователем."""
+
+    favorites: frozenset[int] = frozenset()
+    cart: frozenset[int] = frozenset()
+    subscriptions: frozenset[int] = frozenset()
+
+
+def bump_content_version() -> None:
+    """Отмечает изменение данных, общих для всех рецептов."""
+    cache.set(CONTENT_VERSION_KEY, time.time(), timeout=None)
+
+
+def bump_user_state_version(user_id: int) -> None:
+    """Отмечает изменение избранного, корзины или подписок пользователя."""
+    cache.set(
+        USER_STATE_VERSION_KEY.format(user_id=user_id),
+        time.time(),
+        timeout=None,
+    )
+
+
+def get_versions(user_id: int | None = None) -> tuple[float, float | None]:
+    """
+    Возвращает версию контента и версию состояния пользователя.
+
+    Args:
+        user_id (int | None): Пользователь или None для анонимного.
+
+    Returns:
+        tuple[float, float | None]: Версия контента и версия состояния
+            пользователя (None для анонимного).
+    """
+    keys = [CONTENT_VERSION_KEY]
+    if user_id is not None:
+        keys.append(USER_STATE_VERSION_KEY.format(user_id=user_id))
+    versions = cache.get_many(keys)
+    missing = {key: time.time() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    user_version = versions[keys[1]] if user_id is not None else None
+    return versions[CONTENT_VERSION_KEY], user_version
+
+
+def get_recipe_updated(recipe_id: int) -> float | None:
+    """Возвращает закэшированное время изменения рецепта."""
+    return cache.get(RECIPE_UPDATED_KEY.format(recipe_id=recipe_id))
+
+
+def set_recipe_updated(recipe_id: int, updated_at) -> None:
+    """Запоминает время изменения рецепта."""
+    cache.set(
+        RECIPE_UPDATED_KEY.format(recipe_id=recipe_id),
+        updated_at.timestamp(),
+        timeout=None,
+    )
+
+
+def forget_recipe(recipe_id: int) -> None:
+    """Удаляет время изменения удалённого рецепта."""
+    cache.delete(RECIPE_UPDATED_KEY.format(recipe_id=recipe_id))
+
+
+def get_list_page(digest: str):
+    """Возвращает общую страницу списка рецептов или None."""
+    return cache.get(LIST_PAGE_KEY.format(digest=digest))
+
+
+def set_list_page(digest: str, data) -> None:
+    """Сохраняет общую страницу списка рецептов."""
+    cache.set(
+        LIST_PAGE_KEY.format(digest=digest),
+        data,
+        timeout=settings.RECIPE_LIST_CACHE_TIMEOUT,
+    )
+
+
+def get_user_relations(user_id: int, version: float) -> UserRelations:
+    """
+    Возвращает избранное, корзину и подписки пользователя.
+
+    Множества загружаются одним запросом (UNION) и кэшируются под
+    версией состояния пользователя, поэтому после её смены
+    перечитываются из БД.
+
+    Args:
+        user_id (int): Пользователь.
+        version (float): Текущая версия состояния пользователя.
+
+    Returns:
+        UserRelations: Id рецептов в избранном и корзине и id авторов,
+            на которых подписан пользователь.
+    """
+    key = USER_RELATIONS_KEY.format(user_id=user_id, version=version)
+    relations = cache.get(key)
+    if relations is not None:
+        return relations
+
+    def ids(model, field: str, kind: str):
+        return (
+            model.objects.filter(user_id=user_id)
+            .order_by()
+            .values_list(Value(kind, output_field=CharField()), field)
+        )
+
+    rows = ids(Favorite, 'recipe_id', 'favorites').union(
+        ids(Cart, 'recipe_id', 'cart'),
+        ids(Subscribe, 'author_id', 'subscriptions'),
+        all=True,
+    )
+    grouped = {field: set() for field in UserRelations._fields}
+    for kind, object_id in rows:
+        grouped[kind].add(object_id)
+    relations = UserRelations(
+        **{kind: frozenset(values) for kind, values in grouped.items()}
+    )
+    cache.set(key, relations, timeout=settings.RECIPE_LIST_CACHE_TIMEOUT)
+    return relations
+
+
+def get_recipe_fragments(recipes) -> dict[int, dict]:
+    """
+    Возвращает актуальные фрагменты рецептов одним `get_many`.
+
+    Args:
+        recipes (Iterable[Recipe]): Рецепты.
+
+    Returns:
+        dict[int, dict]: Фрагменты по id рецепта; устаревшие
+            и отсутствующие фрагменты не возвращаются.
+    """
+    if not settings.RECIPE_FRAGMENT_CACHE_TIMEOUT:
+        return {}
+    updated = {
+        FRAGMENT_KEY.format(recipe_id=recipe.pk): (
+            recipe.pk,
+            recipe.updated_at.timestamp(),
+        )
+        for recipe in recipes
+    }
+    fragments = {}
+    for key, (updated_at, data) in cache.get_many(updated).items():
+        recipe_id, current = updated[key]
+        if updated_at == current:
+            fragments[recipe_id] = data
+    return fragments
+
+
+def set_recipe_fragments(fragments: dict) -> None:
+    """
+    Сохраняет фрагменты рецептов.
+
+    Args:
+        fragments (dict[Recipe, dict]): Фрагменты по рецептам.
+    """
+    if not settings.RECIPE_FRAGMENT_CACHE_TIMEOUT or not fragments:
+        return
+    cache.set_many(
+        {
+            FRAGMENT_KEY.format(recipe_id=recipe.pk): (
+                recipe.updated_at.timestamp(),
+                data,
+            )
+            for recipe, data in fragments.items()
+        },
+        timeout=settings.RECIPE_FRAGMENT_CACHE_TIMEOUT,
+    )
+
+
+def evict_recipe_fragments(recipe_ids) -> None:
+    """Вытесняет фрагменты рецептов."""
+    cache.delete_many(
+        [FRAGMENT_KEY.format(recipe_id=recipe_id) for recipe_id in recipe_ids]
+    )
+
+
+def get_tag_registry() -> dict[str, int | None]:
+    """
+    Возвращает реестр тегов: slug и номер бита маски.
+
+    Реестр загружается одним запросом при промахе и хранится без срока
+    до изменения тегов (`forget_tag_registry`). Реестр c тегами без бита
+    не кэшируется, чтобы исправленные данные подхватывались сразу.
+
+    Returns:
+        dict[str, int | None]: Биты маски по slug тегов.
+    """
+    from apps.recipes.models import Tag  # noqa: PLC0415
+
+    registry = cache.get(TAG_REGISTRY_KEY)
+    if registry is None:
+        registry = dict(Tag.objects.order_by().values_list('slug', 'bit'))
+        if None not in registry.values():
+            cache.set(TAG_REGISTRY_KEY, registry, timeout=None)
+    return registry
+
+
+def forget_tag_registry() -> None:
+    """Сбрасывает реестр тегов после их изменения."""
+    cache.delete(TAG_REGISTRY_KEY)
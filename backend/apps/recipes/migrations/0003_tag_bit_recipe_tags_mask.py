@@ -0,0 +1,50 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:05
+
+import django.core.validators
+from django.db import migrations, models
+
+TAG_BITMASK_SIZE = 63
+
+
+def fill_tags_masks(apps, schema_editor):
+    """Назначает биты существующим тегам и заполняет маски рецептов."""
+    Tag = apps.get_model('recipes', 'Tag')
+    Recipe = apps.get_model('recipes', 'Recipe')
+    tags = list(Tag.objects.order_by('pk'))
+    if len(tags) > TAG_BITMASK_SIZE:
+        msg = f'Тегов больше, чем битов маски ({TAG_BITMASK_SIZE}).'
+        raise RuntimeError(msg)
+    for bit, tag in enumerate(tags):
+        tag.bit = bit
+    Tag.objects.bulk_update(tags, ['bit'])
+
+    masks = {}
+    links = Recipe.tags.through.objects.values_list('recipe_id', 'tag__bit')
+    for recipe_id, bit in links:
+        masks[recipe_id] = masks.get(recipe_id, 0) | 1 << bit
+    Recipe.objects.bulk_update(
+        [Recipe(pk=pk, tags_mask=mask) for pk, mask in masks.items()],
+        ['tags_mask'],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='tags_mask',
+            field=models.BigIntegerField(default=0, editable=False, help_text='Биты тегов рецепта для фильтрации без JOIN.', verbose_name='маска тегов'),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='bit',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='Номер бита тега в маске тегов рецепта.', null=True, unique=True, validators=[django.core.validators.MaxValueValidator(62)], verbose_name='бит маски'),
+        ),
+        migrations.RunPython(fill_tags_masks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_tag_bit_recipe_tags_mask'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['author', '-updated_at'], name='recipe_author_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-updated_at', '-created_at'], name='recipe_updated_created_idx'),
+        ),
+    ]
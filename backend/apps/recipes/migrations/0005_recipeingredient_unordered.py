@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:13
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_recipe_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='recipeingredient',
+            options={'verbose_name': 'ингредиент', 'verbose_name_plural': 'ингредиенты'},
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations
+
+TAG_BITMASK_SIZE = 63
+
+
+def fill_missing_bits(apps, schema_editor):
+    """Назначает биты тегам, созданным без них, и обновляет маски."""
+    Tag = apps.get_model('recipes', 'Tag')
+    Recipe = apps.get_model('recipes', 'Recipe')
+    tags = list(Tag.objects.filter(bit__isnull=True).order_by('pk'))
+    if not tags:
+        return
+    used = set(
+        Tag.objects.filter(bit__isnull=False).values_list('bit', flat=True)
+    )
+    free = [bit for bit in range(TAG_BITMASK_SIZE) if bit not in used]
+    if len(tags) > len(free):
+        msg = f'Тегов больше, чем битов маски ({TAG_BITMASK_SIZE}).'
+        raise RuntimeError(msg)
+    for tag, bit in zip(tags, free, strict=False):
+        tag.bit = bit
+    Tag.objects.bulk_update(tags, ['bit'])
+
+    through = Recipe.tags.through
+    recipe_ids = through.objects.filter(tag__in=tags).values('recipe_id')
+    links = through.objects.filter(recipe_id__in=recipe_ids).values_list(
+        'recipe_id', 'tag__bit'
+    )
+    masks = {}
+    for recipe_id, bit in links:
+        masks[recipe_id] = masks.get(recipe_id, 0) | 1 << bit
+    Recipe.objects.bulk_update(
+        [Recipe(pk=pk, tags_mask=mask) for pk, mask in masks.items()],
+        ['tags_mask'],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_recipeingredient_unordered'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_missing_bits, migrations.RunPython.noop),
+    ]
@@ -21,6 +21,7 @@ from apps.core.constants import (
     MIN_COOK_TIME,
     RECIPE_NAME_MAX_LENGTH,
     RECIPE_SHORT_CODE_MAX_LENGTH,
+    TAG_BITMASK_SIZE,
     TAG_NAME_MAX_LENGTH,
     TAG_SLUG_MAX_LENGTH,
 )
@@ -32,9 +33,11 @@ from apps.core.validators import (
     validate_file_size,
     validate_safe_filename,
 )
+from apps.recipes.querysets import RecipeIngredientQuerySet, RecipeQuerySet
 from apps.recipes.services import (
     generate_unique_short_code,
     generate_unique_slug,
+    get_free_tag_bit,
 )
 
 User = get_user_model()
@@ -138,6 +141,7 @@ class Tag(TimeStampModel):
     Attributes:
         name (str): Название тега.
         slug (str): Уникальный URL-дружественный идентификатор тега.
+        bit (int): Номер бита тега в `Recipe.tags_mask`.
     """
 
     name = models.CharField(
@@ -153,6 +157,15 @@ class Tag(TimeStampModel):
         blank=True,
         help_text='Уникальный URL-дружественный идентификатор тега.',
     )
+    bit = models.PositiveSmallIntegerField(
+        'бит маски',
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+        validators=[MaxValueValidator(TAG_BITMASK_SIZE - 1)],
+        help_text='Номер бита тега в маске тегов рецепта.',
+    )
 
     class Meta:
         verbose_name = 'тег'
@@ -186,6 +199,10 @@ class Tag(TimeStampModel):
         super().clean()
 
     def save(self, *args, **kwargs):
+        # Бит назначается при любом способе создания тега, в том числе
+        # c заданным вручную slug
+        if self.bit is None:
+            self.bit = get_free_tag_bit()
         self.full_clean()
         super().save(*args, **kwargs)
 
@@ -202,6 +219,8 @@ class Recipe(TimeStampModel):
         ingredients (ManyToManyField): Ингредиенты рецепта.
         image (ImageField): Фотография готового блюда.
         cooking_time (int): Время приготовления рецепта в минутах.
+        tags_mask (int): Биты тегов рецепта (`Tag.bit`), синхронизируются
+            c `tags` сигналом `m2m_changed`.
     """
 
     name = models.CharField(
@@ -260,6 +279,14 @@ class Recipe(TimeStampModel):
         blank=True,
         help_text='Уникальная последовательность',
     )
+    tags_mask = models.BigIntegerField(
+        'маска тегов',
+        default=0,
+        editable=False,
+        help_text='Биты тегов рецепта для фильтрации без JOIN.',
+    )
+
+    objects = RecipeQuerySet.as_manager()
 
     class Meta(TimeStampModel.Meta):
         verbose_name = 'рецепт'
@@ -267,6 +294,14 @@ class Recipe(TimeStampModel):
         default_related_name = 'recipes'
         indexes = [
             models.Index(fields=['name'], name='recipe_name_idx'),
+            models.Index(
+                fields=['author', '-updated_at'],
+                name='recipe_author_updated_idx',
+            ),
+            models.Index(
+                fields=['-updated_at', '-created_at'],
+                name='recipe_updated_created_idx',
+            ),
         ]
         constraints = [
             models.CheckConstraint(
@@ -328,10 +363,11 @@ class RecipeIngredient(TimeStampModel):
         ],
     )
 
+    objects = RecipeIngredientQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'ингредиент'
         verbose_name_plural = 'ингредиенты'
-        ordering = ('amount',)
         constraints = [
             models.UniqueConstraint(
                 fields=['recipe', 'ingredient'],
@@ -0,0 +1,69 @@
+"""
+Проекции запросов рецептов c явным порядком строк.
+
+Порядок из `Meta.ordering` попадает в каждый запрос модели, в том числе
+в prefetch и агрегаты, где он не нужен и стоит сортировки. Поэтому
+код API берёт выборки через именованные проекции менеджеров:
+- `for_list()` — страницы списка, порядок совпадает c индексом;
+- `for_detail()` — один объект или набор для ответа; порядок рецептов
+  не важен, ингредиенты идут по количеству, как до отказа
+  от `Meta.ordering`;
+- `for_aggregate()` — агрегаты и подзапросы, без сортировки.
+"""
+
+from django.db import models
+
+# Порядок страниц списка рецептов, совпадает c `recipe_updated_created_idx`
+RECIPE_LIST_ORDERING = ('-updated_at', '-created_at')
+
+
+class RecipeQuerySet(models.QuerySet):
+    """Проекции рецептов."""
+
+    def for_list(self):
+        """Рецепты c автором в порядке страниц списка."""
+        return self.select_related('author').order_by(*RECIPE_LIST_ORDERING)
+
+    def for_detail(self):
+        """Рецепты c автором без сортировки."""
+        return self.select_related('author').order_by()
+
+    def for_short_list(self):
+        """Рецепты без текста в порядке страниц списка (`short_recipes`)."""
+        return self.defer('text').order_by(*RECIPE_LIST_ORDERING)
+
+    def for_aggregate(self):
+        """Рецепты без сортировки для агрегатов и подзапросов."""
+        return self.order_by()
+
+
+class RecipeIngredientQuerySet(models.QuerySet):
+    """Проекции ингредиентов рецептов."""
+
+    def for_detail(self):
+        """Ингредиенты c единицами измерения по количеству (prefetch)."""
+        return self.select_related('ingredient__measurement_unit').order_by(
+            'amount', 'pk'
+        )
+
+    def for_aggregate(self):
+        """Ингредиенты рецептов без сортировки."""
+        return self.order_by()
+
+    def shopping_list(self, user):
+        """
+        Суммирует ингредиенты рецептов из корзины пользователя.
+
+        Args:
+            user (User): Владелец корзины.
+
+        Returns:
+            QuerySet: Словари c названием, единицей измерения
+                и суммарным количеством, по алфавиту.
+        """
+        return (
+            self.filter(recipe__carts__user=user)
+            .values('ingredient__name', 'ingredient__measurement_unit__name')
+            .annotate(amount=models.Sum('amount'))
+            .order_by('ingredient__name')
+        )
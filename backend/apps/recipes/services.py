@@ -2,17 +2,29 @@ import logging
 import shutil
 import threading
 
+from contextlib import nullcontext
 from os.path import relpath
 from pathlib import Path
 
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connections, router, transaction
 from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.response import Response
 
 from apps.core.constants import (
     ARCHIVE_ROOT,
+    BULK_UPDATE_BATCH_SIZE,
     MAX_ATTEMPTS,
     RECIPE_SHORT_CODE_MAX_LENGTH,
+    RELATION_CREATED,
+    RELATION_DELETED,
+    RELATION_EXISTS,
+    RELATION_INVALID,
+    RELATION_NOT_FOUND,
+    TAG_BITMASK_SIZE,
     TAG_SLUG_MAX_LENGTH,
 )
 from apps.core.exceptions import SlugGenerationError
@@ -22,7 +34,6 @@ from apps.core.utils.slug import (
     parse_slug_number,
 )
 from apps.core.utils.text import generate_short_code
-from config.settings import MEDIA_ROOT
 
 logger = logging.getLogger(__name__)
 
@@ -87,6 +98,104 @@ def generate_unique_slug(
     raise RuntimeError(msg)
 
 
+def get_free_tag_bit() -> int:
+    """
+    Возвращает младший свободный бит маски тегов.
+
+    Returns:
+        int: Номер бита для нового тега.
+
+    Raises:
+        ValidationError: Если все `TAG_BITMASK_SIZE` битов заняты.
+    """
+    from apps.recipes.models import Tag  # noqa: PLC0415
+
+    used = set(
+        Tag.objects.filter(bit__isnull=False).values_list('bit', flat=True)
+    )
+    for bit in range(TAG_BITMASK_SIZE):
+        if bit not in used:
+            return bit
+    msg = f'Нельзя создать больше {TAG_BITMASK_SIZE} тегов.'
+    raise ValidationError(msg)
+
+
+def get_tags_mask(slugs) -> int | None:
+    """
+    Возвращает маску тегов c указанными slug по реестру тегов.
+
+    Args:
+        slugs (Iterable[str]): Slug тегов.
+
+    Если реестр не знает бит тега, он перечитывается из БД; если бита
+    нет и в БД, это ошибка данных, и она пишется в лог.
+
+    Returns:
+        int | None: Маска тегов; None, если у какого-либо тега нет бита.
+    """
+    from apps.recipes.cache import (  # noqa: PLC0415
+        forget_tag_registry,
+        get_tag_registry,
+    )
+
+    slugs = set(slugs)
+    registry = get_tag_registry()
+    if any(registry.get(slug) is None for slug in slugs):
+        forget_tag_registry()
+        registry = get_tag_registry()
+    unmapped = sorted(slug for slug in slugs if registry.get(slug) is None)
+    if unmapped:
+        logger.error('Нет бита маски у тегов: %s', ', '.join(unmapped))
+        return None
+    return sum(1 << registry[slug] for slug in slugs)
+
+
+def update_tags_masks(recipe_ids) -> dict[int, int]:
+    """
+    Пересчитывает маски тегов рецептов по связям в БД.
+
+    Маски записываются одним `bulk_update`, который не отправляет
+    сигналы и не меняет `updated_at`.
+
+    Args:
+        recipe_ids (Iterable[int]): ID рецептов.
+
+    Returns:
+        dict[int, int]: Новые маски по ID рецептов.
+    """
+    from apps.recipes.models import Recipe  # noqa: PLC0415
+
+    masks = dict.fromkeys(recipe_ids, 0)
+    if not masks:
+        return masks
+    links = Recipe.tags.through.objects.filter(
+        recipe_id__in=masks, tag__bit__isnull=False
+    ).values_list('recipe_id', 'tag__bit')
+    for recipe_id, bit in links:
+        masks[recipe_id] |= 1 << bit
+    Recipe.objects.bulk_update(
+        [Recipe(pk=pk, tags_mask=mask) for pk, mask in masks.items()],
+        ['tags_mask'],
+        batch_size=BULK_UPDATE_BATCH_SIZE,
+    )
+    return masks
+
+
+def sync_tags_masks() -> None:
+    """
+    Назначает биты тегам без бита и пересчитывает маски всех рецептов.
+
+    Нужна после загрузки тегов и связей через `bulk_create`, который
+    не вызывает `save()` и сигналы.
+    """
+    from apps.recipes.models import Recipe, Tag  # noqa: PLC0415
+
+    for tag in Tag.objects.filter(bit__isnull=True).order_by('pk'):
+        tag.bit = get_free_tag_bit()
+        tag.save(update_fields=['bit'])
+    update_tags_masks(Recipe.objects.values_list('pk', flat=True))
+
+
 def _get_old_image_path() -> dict:
     """
     Возвращает потокобезопасное хранилище старых путей фотографий.
@@ -127,8 +236,8 @@ def archive_file_by_path(old_path: str) -> None:
         return
 
     try:
-        relative_path = relpath(old_path, MEDIA_ROOT)
-        archive_root = Path(MEDIA_ROOT) / Path(ARCHIVE_ROOT)
+        relative_path = relpath(old_path, settings.MEDIA_ROOT)
+        archive_root = Path(settings.MEDIA_ROOT) / Path(ARCHIVE_ROOT)
         new_path = archive_root / relative_path
 
         Path(new_path).parent.mkdir(parents=True, exist_ok=True)
@@ -232,12 +341,151 @@ def get_txt_in_response(
     return response
 
 
+def get_relation_row(
+    connection, relation_model, user_id: int, target_field: str, target_id
+) -> tuple[list, list]:
+    """
+    Возвращает колонки связи (кроме PK) и их значения для INSERT.
+
+    Значения готовятся так же, как при `save()`, в том числе заполняются
+    `auto_now_add`-поля.
+    """
+    opts = relation_model._meta  # noqa: SLF001
+    instance = relation_model(
+        user_id=user_id, **{f'{target_field}_id': target_id}
+    )
+    fields = [field for field in opts.concrete_fields if not field.primary_key]
+    params = [
+        field.get_db_prep_save(
+            field.pre_save(instance, add=True), connection=connection
+        )
+        for field in fields
+    ]
+    return fields, params
+
+
+def insert_user_relation(
+    relation_model,
+    user_id: int,
+    target_field: str,
+    target_object_id: int,
+) -> bool | None:
+    """
+    Создаёт связь пользователя c объектом одним SQL-запросом.
+
+    Выполняет `INSERT ... SELECT ... WHERE EXISTS ... ON CONFLICT DO
+    NOTHING RETURNING` по ID, без загрузки пользователя и объекта:
+    строку возвращает только созданная связь c существующим объектом.
+    Запрос не отправляет сигналы, поэтому версия состояния пользователя
+    обновляется здесь.
+
+    Args:
+        relation_model (Model): Модель, связующая пользователя и объект.
+        user_id (int): ID пользователя.
+        target_field (str): Имя поля для целевого объекта.
+        target_object_id (int): ID целевого объекта.
+
+    Returns:
+        bool | None: True, если связь создана, False, если она уже
+            существует или объекта нет, и None, если БД не поддерживает
+            RETURNING или нарушено другое ограничение модели.
+    """
+    from apps.recipes.cache import bump_user_state_version  # noqa: PLC0415
+
+    connection = connections[router.db_for_write(relation_model)]
+    if not connection.features.can_return_columns_from_insert:
+        return None
+
+    opts = relation_model._meta  # noqa: SLF001
+    fields, params = get_relation_row(
+        connection, relation_model, user_id, target_field, target_object_id
+    )
+    target_model = opts.get_field(target_field).related_model
+    target_opts = target_model._meta  # noqa: SLF001
+    params.append(target_object_id)
+    quote = connection.ops.quote_name
+    # WHERE в SELECT обязателен для SQLite: без него ON CONFLICT
+    # разбирается как часть SELECT
+    sql = (
+        f'INSERT INTO {quote(opts.db_table)} '  # noqa: S608
+        f'({", ".join(quote(field.column) for field in fields)}) '
+        f'SELECT {", ".join(["%s"] * len(fields))} '
+        f'WHERE EXISTS (SELECT 1 FROM {quote(target_opts.db_table)} '
+        f'WHERE {quote(target_opts.pk.column)} = %s) '
+        f'ON CONFLICT DO NOTHING RETURNING {quote(opts.pk.column)}'
+    )
+    # Внутри транзакции ошибка запроса прерывает её: нужна точка сохранения
+    savepoint = (
+        transaction.atomic(using=connection.alias)
+        if connection.in_atomic_block
+        else nullcontext()
+    )
+    try:
+        with savepoint, connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            created = cursor.fetchone() is not None
+    except IntegrityError:
+        return None
+    if created:
+        bump_user_state_version(user_id)
+    return created
+
+
+def insert_user_relations(
+    relation_model,
+    user_id: int,
+    target_field: str,
+    target_ids: list[int],
+) -> set[int] | None:
+    """
+    Создаёт связи пользователя c несколькими объектами одним SQL-запросом.
+
+    Выполняет `INSERT ... ON CONFLICT DO NOTHING RETURNING` c ID объекта:
+    строки возвращают только связи, созданные этим запросом, поэтому
+    связь, добавленная параллельным запросом, не считается созданной.
+
+    Args:
+        relation_model (Model): Модель, связующая пользователя и объект.
+        user_id (int): ID пользователя.
+        target_field (str): Имя поля для целевого объекта.
+        target_ids (list[int]): ID целевых объектов.
+
+    Returns:
+        set[int] | None: ID объектов, связи c которыми созданы, или None,
+            если БД не поддерживает RETURNING.
+    """
+    connection = connections[router.db_for_write(relation_model)]
+    if not connection.features.can_return_columns_from_insert:
+        return None
+
+    opts = relation_model._meta  # noqa: SLF001
+    rows = [
+        get_relation_row(
+            connection, relation_model, user_id, target_field, target_id
+        )
+        for target_id in target_ids
+    ]
+    fields = rows[0][0]
+    placeholders = f'({", ".join(["%s"] * len(fields))})'
+    quote = connection.ops.quote_name
+    sql = (
+        f'INSERT INTO {quote(opts.db_table)} '  # noqa: S608
+        f'({", ".join(quote(field.column) for field in fields)}) '
+        f'VALUES {", ".join([placeholders] * len(rows))} '
+        f'ON CONFLICT DO NOTHING '
+        f'RETURNING {quote(opts.get_field(target_field).column)}'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [param for _, params in rows for param in params])
+        return {target_id for (target_id,) in cursor.fetchall()}
+
+
 def manage_user_relation_object(
     relation_model,
     user_id: int,
     target_field: str,
     target_object_id: int,
-    target_object,
+    target_queryset,
     create_serializer,
     response_serializer,
     context: dict,
@@ -246,16 +494,24 @@ def manage_user_relation_object(
     """
     Универсальная функция для управления связями пользователя c объектами.
 
+    Связь создаётся и удаляется по ID, без предварительной загрузки
+    объекта: POST создаёт её через `insert_user_relation`, и объект
+    загружается только для ответа. Если связь уже существует, объекта нет
+    или нарушено ограничение модели, запрос проходит через
+    `create_serializer`, который возвращает те же ошибки, что и без
+    быстрого пути. Отсутствующий объект даёт 404 в обоих методах.
+
     Args:
         relation_model (Model): Модель, связующая пользователя и объект.
         user_id (int): ID пользователя.
         target_field (str): Имя поля для целевого объекта.
         target_object_id (int): ID целевого объекта.
-        target_object (Model): Целевой объект.
+        target_queryset (QuerySet): Выборка, из которой загружается
+            объект для ответа.
         create_serializer (Serializer): Сериализатор для создания.
         response_serializer (Serializer): Сериализатор для ответа.
         context (dict): Контекст для сериализаторов.
-        not_found_error (str): Сообщение, если объект не найден.
+        not_found_error (str): Сообщение, если связи нет.
 
     Returns:
         handler: функция-обработчик запроса.
@@ -264,15 +520,23 @@ def manage_user_relation_object(
     def handler(request):
         data = {'user': user_id, target_field: target_object_id}
         if request.method == 'POST':
-            serializer = create_serializer(data=data)
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
+            created = insert_user_relation(
+                relation_model, user_id, target_field, target_object_id
+            )
+            target_object = get_object_or_404(
+                target_queryset, pk=target_object_id
+            )
+            if not created:
+                serializer = create_serializer(data=data)
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
             response_data = response_serializer(target_object, context=context)
             return Response(response_data.data, status=status.HTTP_201_CREATED)
 
         deleted, _ = relation_model.objects.filter(**data).delete()
         if deleted:
             return Response(status=status.HTTP_204_NO_CONTENT)
+        get_object_or_404(target_queryset.values('pk'), pk=target_object_id)
 
         return Response(
             {'errors': not_found_error},
@@ -280,3 +544,164 @@ def manage_user_relation_object(
         )
 
     return handler
+
+
+def add_user_relations(
+    relation_model,
+    user_id: int,
+    target_field: str,
+    target_ids: list[int],
+    invalid: dict | None = None,
+) -> list[dict]:
+    """
+    Добавляет связи пользователя c несколькими объектами.
+
+    Существующие объекты и связи выбираются двумя запросами, новые
+    связи создаются одним запросом `insert_user_relations`. Связь,
+    которую между чтением и вставкой создал параллельный запрос,
+    получает статус `exists`. Вставка не отправляет сигналы, поэтому
+    версия состояния пользователя обновляется здесь.
+
+    Args:
+        relation_model (Model): Модель, связующая пользователя и объект.
+        user_id (int): ID пользователя.
+        target_field (str): Имя поля для целевого объекта.
+        target_ids (list[int]): ID целевых объектов.
+        invalid (dict[int, str] | None): ID, которые нельзя добавить,
+            и сообщения об ошибке.
+
+    Returns:
+        list[dict]: Результат по каждому ID без повторов, в порядке
+            запроса: `created`, `exists`, `not_found` или `invalid`.
+    """
+    from apps.recipes.cache import bump_user_state_version  # noqa: PLC0415
+
+    invalid = invalid or {}
+    ids = list(dict.fromkeys(target_ids))
+    target_model = getattr(relation_model, target_field).field.related_model
+    found = set(
+        target_model.objects.filter(pk__in=ids).values_list('pk', flat=True)
+    )
+    related = set(
+        relation_model.objects.filter(
+            user_id=user_id, **{f'{target_field}_id__in': ids}
+        ).values_list(f'{target_field}_id', flat=True)
+    )
+
+    results, pending = [], []
+    for target_id in ids:
+        result = {'id': target_id}
+        if target_id not in found:
+            result['status'] = RELATION_NOT_FOUND
+        elif target_id in invalid:
+            result['status'] = RELATION_INVALID
+            result['errors'] = invalid[target_id]
+        elif target_id in related:
+            result['status'] = RELATION_EXISTS
+        else:
+            pending.append(result)
+        results.append(result)
+    if not pending:
+        return results
+
+    new_ids = [result['id'] for result in pending]
+    created = insert_user_relations(
+        relation_model, user_id, target_field, new_ids
+    )
+    if created is None:
+        # Без RETURNING результат каждой строки неизвестен
+        relation_model.objects.bulk_create(
+            [
+                relation_model(
+                    user_id=user_id, **{f'{target_field}_id': target_id}
+                )
+                for target_id in new_ids
+            ],
+            ignore_conflicts=True,
+        )
+        created = set(new_ids)
+    for result in pending:
+        created_now = result['id'] in created
+        result['status'] = RELATION_CREATED if created_now else RELATION_EXISTS
+    if created:
+        bump_user_state_version(user_id)
+    return results
+
+
+def remove_user_relations(
+    relation_model,
+    user_id: int,
+    target_field: str,
+    target_ids: list[int],
+) -> list[dict]:
+    """
+    Удаляет связи пользователя c несколькими объектами.
+
+    Args:
+        relation_model (Model): Модель, связующая пользователя и объект.
+        user_id (int): ID пользователя.
+        target_field (str): Имя поля для целевого объекта.
+        target_ids (list[int]): ID целевых объектов.
+
+    Returns:
+        list[dict]: Результат по каждому ID без повторов, в порядке
+            запроса: `deleted` или `not_found`, если связи не было.
+    """
+    ids = list(dict.fromkeys(target_ids))
+    relations = relation_model.objects.filter(
+        user_id=user_id, **{f'{target_field}_id__in': ids}
+    )
+    related = set(relations.values_list(f'{target_field}_id', flat=True))
+    if related:
+        relations.filter(**{f'{target_field}_id__in': related}).delete()
+    return [
+        {
+            'id': target_id,
+            'status': RELATION_DELETED
+            if target_id in related
+            else RELATION_NOT_FOUND,
+        }
+        for target_id in ids
+    ]
+
+
+def manage_user_relations_bulk(
+    relation_model,
+    user_id: int,
+    target_field: str,
+    ids_serializer,
+    invalid: dict | None = None,
+):
+    """
+    Пакетное добавление (POST) или удаление (DELETE) связей пользователя.
+
+    В отличие от `manage_user_relation_object`, ошибка по одному ID
+    не отменяет запрос: ответ 200 содержит результат по каждому ID.
+
+    Args:
+        relation_model (Model): Модель, связующая пользователя и объект.
+        user_id (int): ID пользователя.
+        target_field (str): Имя поля для целевого объекта.
+        ids_serializer (Serializer): Сериализатор списка ID.
+        invalid (dict[int, str] | None): ID, которые нельзя добавить,
+            и сообщения об ошибке.
+
+    Returns:
+        handler: функция-обработчик запроса.
+    """
+
+    def handler(request):
+        serializer = ids_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        if request.method == 'POST':
+            results = add_user_relations(
+                relation_model, user_id, target_field, ids, invalid
+            )
+        else:
+            results = remove_user_relations(
+                relation_model, user_id, target_field, ids
+            )
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+    return handler
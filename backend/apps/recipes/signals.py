@@ -1,10 +1,34 @@
 import logging
 
-from django.db.models.signals import post_delete, post_save, pre_save
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 
-from apps.recipes.models import Recipe
-from apps.recipes.services import _get_old_image_path, archive_file_by_path
+from apps.recipes.cache import (
+    bump_content_version,
+    evict_recipe_fragments,
+    forget_recipe,
+    forget_tag_registry,
+    set_recipe_updated,
+)
+from apps.recipes.models import (
+    Ingredient,
+    MeasurementUnit,
+    Recipe,
+    RecipeIngredient,
+    Tag,
+)
+from apps.recipes.services import (
+    _get_old_image_path,
+    archive_file_by_path,
+    update_tags_masks,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -70,3 +94,217 @@ def archive_replaced_image(sender, instance, **kwargs):
     old_path = _get_old_image_path().pop(instance.pk, None)
     if old_path:
         archive_file_by_path(old_path)
+
+
+@receiver(post_save, sender=Recipe, dispatch_uid='remember_recipe_updated')
+def remember_recipe_updated(sender, instance, **kwargs):
+    """
+    Запоминает время изменения рецепта для условных GET-запросов.
+
+    Args:
+        sender (Model): Модель, отправившая сигнал.
+        instance (Recipe): Экземпляр рецепта.
+    """
+    set_recipe_updated(instance.pk, instance.updated_at)
+
+
+@receiver(post_delete, sender=Recipe, dispatch_uid='forget_recipe_updated')
+def forget_recipe_updated(sender, instance, **kwargs):
+    """
+    Удаляет время изменения удалённого рецепта и обновляет версию контента.
+
+    Удаление не сдвигает `max(updated_at)` списка, поэтому Last-Modified
+    списка продвигает версия контента.
+
+    Args:
+        sender (Model): Модель, отправившая сигнал.
+        instance (Recipe): Экземпляр рецепта.
+    """
+    forget_recipe(instance.pk)
+    bump_content_version()
+
+
+@receiver(
+    [post_save, post_delete], sender=Tag, dispatch_uid='tag_content_version'
+)
+@receiver(
+    [post_save, post_delete],
+    sender=Ingredient,
+    dispatch_uid='ingredient_content_version',
+)
+@receiver(
+    [post_save, post_delete],
+    sender=MeasurementUnit,
+    dispatch_uid='unit_content_version',
+)
+def catalog_changed(sender, **kwargs):
+    """
+    Обновляет версию контента при изменении справочников.
+
+    Теги, ингредиенты и единицы измерения входят в ответ каждого рецепта,
+    но их изменение не меняет `Recipe.updated_at`.
+
+    Args:
+        sender (Model): Модель, отправившая сигнал.
+    """
+    bump_content_version()
+
+
+@receiver(
+    [post_save, post_delete], sender=Recipe, dispatch_uid='recipe_fragment'
+)
+@receiver(
+    [post_save, post_delete],
+    sender=RecipeIngredient,
+    dispatch_uid='recipe_ingredient_fragment',
+)
+def recipe_changed(sender, instance, **kwargs):
+    """
+    Вытесняет фрагмент изменённого рецепта.
+
+    Args:
+        sender (Model): Модель, отправившая сигнал.
+        instance (Recipe | RecipeIngredient): Рецепт или его ингредиент.
+    """
+    evict_recipe_fragments(
+        [instance.pk if sender is Recipe else instance.recipe_id]
+    )
+
+
+@receiver(
+    m2m_changed,
+    sender=Recipe.tags.through,
+    dispatch_uid='recipe_tags_fragment',
+)
+def recipe_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Вытесняет фрагменты рецептов при изменении их тегов.
+
+    Args:
+        sender (Model): Промежуточная модель связи.
+        instance (Recipe | Tag): Изменяемый объект.
+        action (str): Тип изменения.
+        reverse (bool): Изменение выполняется со стороны тега.
+        pk_set (set | None): Id добавляемых или удаляемых объектов.
+    """
+    if action not in {'post_add', 'post_remove', 'pre_clear'}:
+        return
+    if not reverse:
+        evict_recipe_fragments([instance.pk])
+    elif action == 'pre_clear':
+        evict_recipe_fragments(instance.recipes.values_list('pk', flat=True))
+    else:
+        evict_recipe_fragments(pk_set)
+
+
+@receiver([post_save, post_delete], sender=Tag, dispatch_uid='tag_registry')
+def tag_registry_changed(sender, instance, **kwargs):
+    """
+    Сбрасывает реестр slug тегов.
+
+    Args:
+        sender (Model): Модель, отправившая сигнал.
+        instance (Tag): Изменённый тег.
+    """
+    forget_tag_registry()
+
+
+@receiver(
+    m2m_changed, sender=Recipe.tags.through, dispatch_uid='recipe_tags_mask'
+)
+def recipe_tags_mask_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Синхронизирует `Recipe.tags_mask` c тегами рецепта.
+
+    Со стороны рецепта маска пересчитывается по связям в БД, со стороны
+    тега бит тега добавляется или снимается одним UPDATE.
+
+    Args:
+        sender (Model): Промежуточная модель связи.
+        instance (Recipe | Tag): Изменяемый объект.
+        action (str): Тип изменения.
+        reverse (bool): Изменение выполняется со стороны тега.
+        pk_set (set | None): Id добавляемых или удаляемых объектов.
+    """
+    if not reverse:
+        if action in {'post_add', 'post_remove', 'post_clear'}:
+            masks = update_tags_masks([instance.pk])
+            instance.tags_mask = masks[instance.pk]
+        return
+    if instance.bit is None:
+        return
+    bit = 1 << instance.bit
+    if action == 'post_add':
+        Recipe.objects.filter(pk__in=pk_set).update(
+            tags_mask=F('tags_mask').bitor(bit)
+        )
+    elif action == 'post_remove':
+        Recipe.objects.filter(pk__in=pk_set).update(
+            tags_mask=F('tags_mask').bitand(~bit)
+        )
+    elif action == 'pre_clear':
+        clear_tag_bit(instance)
+
+
+@receiver(pre_delete, sender=Tag, dispatch_uid='tag_recipes_mask')
+def tag_deleted(sender, instance, **kwargs):
+    """
+    Снимает бит удаляемого тега c масок его рецептов.
+
+    Связи c рецептами удаляются каскадом без сигнала `m2m_changed`.
+
+    Args:
+        sender (Model): Модель, отправившая сигнал.
+        instance (Tag): Удаляемый тег.
+    """
+    if instance.bit is not None:
+        clear_tag_bit(instance)
+
+
+def clear_tag_bit(tag) -> None:
+    """Снимает бит тега c масок рецептов, связанных c тегом."""
+    Recipe.objects.filter(tags=tag).update(
+        tags_mask=F('tags_mask').bitand(~(1 << tag.bit))
+    )
+
+
+@receiver(
+    [post_save, pre_delete], sender=Tag, dispatch_uid='tag_recipe_fragments'
+)
+@receiver(
+    [post_save, pre_delete],
+    sender=Ingredient,
+    dispatch_uid='ingredient_recipe_fragments',
+)
+@receiver(
+    [post_save, pre_delete],
+    sender=MeasurementUnit,
+    dispatch_uid='unit_recipe_fragments',
+)
+def catalog_item_changed(sender, instance, created=False, **kwargs):
+    """
+    Вытесняет фрагменты рецептов, в которые входит изменённый тег,
+    ингредиент или единица измерения.
+
+    Args:
+        sender (Model): Модель, отправившая сигнал.
+        instance (Tag | Ingredient | MeasurementUnit): Элемент справочника.
+        created (bool): Объект только что создан.
+    """
+    if created:
+        return
+    if sender is Tag:
+        recipe_ids = instance.recipes.for_aggregate().values_list(
+            'pk', flat=True
+        )
+    else:
+        lookup = {
+            Ingredient: 'ingredient',
+            MeasurementUnit: 'ingredient__measurement_unit',
+        }[sender]
+        recipe_ids = RecipeIngredient.objects.filter(
+            **{lookup: instance}
+        ).values_list('recipe_id', flat=True)
+    evict_recipe_fragments(recipe_ids)
@@ -246,6 +246,12 @@ class UserRecipeRelation(TimeStampModel):
                 name='%(class)s_unique_user_recipe',
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['user', '-created_at'],
+                name='%(class)s_user_created_idx',
+            )
+        ]
 
     def __str__(self) -> str:
         return truncate_text(f'{self.recipe.name} → {self.user.username}')
@@ -0,0 +1,51 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.recipes.cache import (
+    bump_content_version,
+    bump_user_state_version,
+    evict_recipe_fragments,
+)
+from apps.users.models import Cart, Favorite, Subscribe, User
+
+
+@receiver(post_save, sender=User, dispatch_uid='user_saved_content_version')
+def user_changed(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Обновляет версию контента при изменении профиля пользователя.
+
+    Профиль автора входит в ответ рецепта, поэтому фрагменты его
+    рецептов вытесняются. Создание пользователя и обновление только
+    `last_login` (вход) версию не меняют.
+
+    Args:
+        sender (Model): Модель, отправившая сигнал.
+        instance (User): Экземпляр пользователя.
+        created (bool): Пользователь только что создан.
+        update_fields (frozenset | None): Сохраняемые поля.
+    """
+    if created or update_fields == frozenset({'last_login'}):
+        return
+    bump_content_version()
+    evict_recipe_fragments(instance.recipes.values_list('pk', flat=True))
+
+
+@receiver(
+    [post_save, post_delete], sender=Favorite, dispatch_uid='favorite_state'
+)
+@receiver([post_save, post_delete], sender=Cart, dispatch_uid='cart_state')
+@receiver(
+    [post_save, post_delete], sender=Subscribe, dispatch_uid='subscribe_state'
+)
+def user_state_changed(sender, instance, **kwargs):
+    """
+    Обновляет версию состояния пользователя.
+
+    Избранное, корзина и подписки определяют флаги `is_favorited`,
+    `is_in_shopping_cart` и `is_subscribed` в ответах рецептов.
+
+    Args:
+        sender (Model): Модель, отправившая сигнал.
+        instance (Favorite | Cart | Subscribe): Изменённая связь.
+    """
+    bump_user_state_version(instance.user_id)
@@ -0,0 +1,70 @@
+"""
+Маршрутизация запросов к БД между основной базой и репликами.
+
+Чтение уходит на реплики (`READ_REPLICAS['ALIASES']`) только внутри
+`use_replicas()` — его включает `ReplicaRoutingMiddleware` для запросов
+безопасными методами. Всё остальное (запись, транзакции, команды
+management, фоновые задачи) работает c основной базой.
+"""
+
+import random
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Токены и сессии читаются из основной базы: только что выданные
+# учётные данные могут ещё не дойти до реплики
+PRIMARY_APP_LABELS = frozenset({'authtoken', 'sessions'})
+
+_replicas_enabled: ContextVar[bool] = ContextVar(
+    'replicas_enabled', default=False
+)
+
+
+@contextmanager
+def use_replicas(enabled: bool = True):
+    """Разрешает чтение c реплик в текущем контексте."""
+    token = _replicas_enabled.set(enabled)
+    try:
+        yield
+    finally:
+        _replicas_enabled.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Роутер: чтение c реплик, запись и миграции — в основную базу.
+
+    Внутри открытой транзакции основной базы чтение остаётся на ней,
+    чтобы видеть собственные изменения; токены и сессии всегда читаются
+    из основной базы (`PRIMARY_APP_LABELS`).
+    """
+
+    def db_for_read(self, model, **hints):
+        aliases = settings.READ_REPLICAS['ALIASES']
+        if (
+            not aliases
+            or not _replicas_enabled.get()
+            or model._meta.app_label in PRIMARY_APP_LABELS  # noqa: SLF001
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(aliases)  # noqa: S311
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.READ_REPLICAS['ALIASES']}
+        states = (obj1._state, obj2._state)  # noqa: SLF001
+        if all(state.db in databases for state in states):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.READ_REPLICAS['ALIASES']:
+            return False
+        return None
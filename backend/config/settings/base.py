@@ -1,6 +1,8 @@
+import tempfile
+
 from pathlib import Path
 
-from decouple import config
+from decouple import Csv, config
 from django.core.management.utils import get_random_secret_key
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -42,11 +44,17 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 
 MIDDLEWARE = [
+    'apps.core.middleware.ReplicaRoutingMiddleware',
+    'apps.core.middleware.MetricsMiddleware',
+    'apps.core.middleware.AdmissionControlMiddleware',
+    'apps.core.middleware.CompressionMiddleware',
+    'apps.core.middleware.QueryProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.core.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'apps.core.middleware.ProjectExceptionMiddleware',
@@ -91,6 +99,8 @@ else:
     STATIC_ROOT = '/app/collectstatic/static'
     MEDIA_ROOT = '/app/media'
 
+    DB_POOL_ENABLED = config('DB_POOL_ENABLED', default=False, cast=bool)
+
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.postgresql',
@@ -99,20 +109,95 @@ else:
             'PASSWORD': config('POSTGRES_PASSWORD', default=''),
             'HOST': config('DB_HOST', default='db'),
             'PORT': config('DB_PORT', default='5432'),
+            # Пул psycopg несовместим c постоянными соединениями Django
+            'CONN_MAX_AGE': 0
+            if DB_POOL_ENABLED
+            else config('DB_CONN_MAX_AGE', default=60, cast=int),
+            # C пулом проверка выполняется при выдаче соединения из пула
+            'CONN_HEALTH_CHECKS': config(
+                'DB_CONN_HEALTH_CHECKS', default=True, cast=bool
+            ),
+            'OPTIONS': {},
         }
     }
 
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'foodgram-cache',
-        'TIMEOUT': 300,
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000,
-        },
-    }
+    if DB_POOL_ENABLED:
+        # Пул создаётся в каждом воркере gunicorn; воркеру нужно не больше
+        # соединений, чем потоков в нём (GUNICORN_THREADS).
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=1, cast=int),
+            'max_size': config(
+                'DB_POOL_MAX_SIZE',
+                default=config('GUNICORN_THREADS', default=1, cast=int),
+                cast=int,
+            ),
+            'timeout': config('DB_POOL_TIMEOUT', default=10.0, cast=float),
+            'max_idle': config('DB_POOL_MAX_IDLE', default=600.0, cast=float),
+            'max_lifetime': config(
+                'DB_POOL_MAX_LIFETIME', default=3600.0, cast=float
+            ),
+        }
+
+# Реплики для чтения: пути к файлам SQLite (относительно BASE_DIR)
+# или host[:port] серверов PostgreSQL
+READ_REPLICAS = {
+    'ALIASES': [],
+    'STICKY_SECONDS': config('DB_REPLICA_STICKY_SECONDS', default=5, cast=int),
 }
 
+for index, replica in enumerate(
+    config('DB_REPLICAS', default='', cast=Csv()), start=1
+):
+    alias = f'replica_{index}'
+    DATABASES[alias] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+    if USE_SQLITE:
+        DATABASES[alias]['NAME'] = BASE_DIR / replica
+    else:
+        host, _, port = replica.partition(':')
+        DATABASES[alias]['HOST'] = host
+        DATABASES[alias]['PORT'] = port or DATABASES['default']['PORT']
+    READ_REPLICAS['ALIASES'].append(alias)
+
+DATABASE_ROUTERS = ['config.routers.ReplicaRouter']
+
+CACHE_BACKEND = config('CACHE_BACKEND', default='sqlite')
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'apps.core.cache_backends.InstrumentedRedisCache',
+            'LOCATION': config('REDIS_URL', default='redis://redis:6379/0'),
+            'TIMEOUT': 300,
+        }
+    }
+elif CACHE_BACKEND == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'apps.core.cache_backends.InstrumentedLocMemCache',
+            'LOCATION': 'foodgram-cache',
+            'TIMEOUT': 300,
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000,
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'apps.core.cache_backends.InstrumentedSQLiteCache',
+            'LOCATION': config(
+                'CACHE_LOCATION',
+                default=str(Path(tempfile.gettempdir()) / 'foodgram-cache.db'),
+            ),
+            'TIMEOUT': 300,
+            'OPTIONS': {
+                'MAX_ENTRIES': config(
+                    'CACHE_MAX_ENTRIES', default=10000, cast=int
+                ),
+            },
+        }
+    }
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -203,15 +288,83 @@ LOGGING = {
 }
 
 
+REQUEST_PROFILING = {
+    'ENABLED': config('REQUEST_PROFILING_ENABLED', default=True, cast=bool),
+    'SAMPLE_RATE': config(
+        'REQUEST_PROFILING_SAMPLE_RATE', default=1.0, cast=float
+    ),
+    'SERVER_TIMING': config(
+        'REQUEST_PROFILING_SERVER_TIMING', default=True, cast=bool
+    ),
+    'SLOW_REQUEST_MS': config(
+        'REQUEST_PROFILING_SLOW_REQUEST_MS', default=500, cast=int
+    ),
+    'MAX_QUERIES': config(
+        'REQUEST_PROFILING_MAX_QUERIES', default=20, cast=int
+    ),
+    'MAX_DUPLICATES': config(
+        'REQUEST_PROFILING_MAX_DUPLICATES', default=5, cast=int
+    ),
+    'TOP_REPEATED': 3,
+}
+
+
+METRICS = {
+    'ENABLED': config('METRICS_ENABLED', default=True, cast=bool),
+    'DIR': config(
+        'METRICS_DIR',
+        default=str(Path(tempfile.gettempdir()) / 'foodgram-metrics'),
+    ),
+    'FLUSH_INTERVAL': config(
+        'METRICS_FLUSH_INTERVAL', default=1.0, cast=float
+    ),
+    'ALLOWED_NETWORKS': config(
+        'METRICS_ALLOWED_NETWORKS',
+        default='127.0.0.0/8,::1/128,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16',
+        cast=Csv(),
+    ),
+}
+
+
+PROFILING = {
+    'ENABLED': config('PROFILING_ENABLED', default=True, cast=bool),
+    'SAMPLE_RATE': config('PROFILING_SAMPLE_RATE', default=0.0, cast=float),
+    'MIN_DURATION_MS': config(
+        'PROFILING_MIN_DURATION_MS', default=300, cast=int
+    ),
+    'DIR': config(
+        'PROFILING_DIR', default=str(BASE_DIR / 'logs' / 'profiles')
+    ),
+    'MAX_DUMPS': config('PROFILING_MAX_DUMPS', default=50, cast=int),
+    'TOP_FUNCTIONS': 40,
+}
+
+
+COMPRESSION = {
+    'ENABLED': config('COMPRESSION_ENABLED', default=True, cast=bool),
+    'MIN_LENGTH': config('COMPRESSION_MIN_LENGTH', default=200, cast=int),
+    'GZIP_LEVEL': config('COMPRESSION_GZIP_LEVEL', default=6, cast=int),
+    'BROTLI_QUALITY': config(
+        'COMPRESSION_BROTLI_QUALITY', default=5, cast=int
+    ),
+    'CONTENT_TYPES': ('application/json', 'text/'),
+}
+
+
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.api.renderers.FastJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'apps.api.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination'
     '.PageNumberPagination',
@@ -220,8 +373,8 @@ REST_FRAMEWORK = {
         'django_filters.rest_framework.DjangoFilterBackend'
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'apps.api.throttling.AnonRateThrottle',
+        'apps.api.throttling.UserRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '1000/day',
@@ -229,6 +382,61 @@ REST_FRAMEWORK = {
     },
 }
 
+# Облегчённые сериализаторы чтения, см. apps.api.serializers.lean.
+API_LEAN_SERIALIZERS = config('API_LEAN_SERIALIZERS', default=True, cast=bool)
+
+# Лимит времени одного SQL-запроса в view API, мс (0 — без лимита);
+# лимиты действий задаются во view, см. StatementTimeoutMixin.
+API_STATEMENT_TIMEOUT_MS = config(
+    'API_STATEMENT_TIMEOUT_MS', default=5000, cast=int
+)
+
+# Отклонение низкоприоритетных запросов при перегрузке воркера,
+# см. apps.core.admission; приоритеты маршрутов — в apps.api.urls.
+ADMISSION_CONTROL = {
+    'ENABLED': config('ADMISSION_CONTROL_ENABLED', default=True, cast=bool),
+    'ROUTE_PRIORITIES': 'apps.api.urls.ROUTE_PRIORITIES',
+    # Предел запросов в обработке, включая проверяемый: по умолчанию
+    # заняты все потоки воркера, отклонение — только сверх этого
+    'MAX_IN_FLIGHT': config(
+        'ADMISSION_MAX_IN_FLIGHT',
+        default=config('GUNICORN_THREADS', default=1, cast=int),
+        cast=int,
+    ),
+    'LATENCY_TARGET_MS': config(
+        'ADMISSION_LATENCY_TARGET_MS', default=500, cast=float
+    ),
+    'QUEUE_TARGET_MS': config(
+        'ADMISSION_QUEUE_TARGET_MS', default=200, cast=float
+    ),
+    'WINDOW_SECONDS': config(
+        'ADMISSION_WINDOW_SECONDS', default=10, cast=float
+    ),
+    # Нагрузка (1 — предел), начиная c которой отклоняются и NORMAL
+    'NORMAL_SHED_LOAD': config(
+        'ADMISSION_NORMAL_SHED_LOAD', default=2, cast=float
+    ),
+    'RETRY_AFTER': config('ADMISSION_RETRY_AFTER', default=2, cast=int),
+}
+
+TOKEN_AUTH_CACHE_TIMEOUT = config(
+    'TOKEN_AUTH_CACHE_TIMEOUT', default=60, cast=int
+)
+
+# Кэш страниц списка рецептов (0 — отключён), см. apps.recipes.cache.
+RECIPE_LIST_CACHE_TIMEOUT = config(
+    'RECIPE_LIST_CACHE_TIMEOUT', default=300, cast=int
+)
+# Кэш сериализованных рецептов без персональных полей (0 — отключён).
+RECIPE_FRAGMENT_CACHE_TIMEOUT = config(
+    'RECIPE_FRAGMENT_CACHE_TIMEOUT', default=3600, cast=int
+)
+# Кэш готовых (в т.ч. сжатых) тел ответов по ETag (0 — отключён),
+# см. apps.core.compression.
+RESPONSE_BODY_CACHE_TIMEOUT = config(
+    'RESPONSE_BODY_CACHE_TIMEOUT', default=300, cast=int
+)
+
 DJOSER = {
     'LOGIN_FIELD': 'email',
     'USER_CREATE_PASSWORD_RETYPE': True,
@@ -34,6 +34,9 @@ CSRF_TRUSTED_ORIGINS = [
 CSRF_COOKIE_SECURE = False
 SESSION_COOKIE_SECURE = False
 
+# Threaded runserver обслуживает фронтенд без лимита потоков
+ADMISSION_CONTROL['ENABLED'] = False
+
 REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
     *REST_FRAMEWORK.get('DEFAULT_RENDERER_CLASSES', []),
     'rest_framework.renderers.BrowsableAPIRenderer',
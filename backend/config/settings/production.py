@@ -24,3 +24,7 @@ CSRF_TRUSTED_ORIGINS = config(
 
 CSRF_COOKIE_SECURE = True
 SESSION_COOKIE_SECURE = True
+
+REQUEST_PROFILING['SAMPLE_RATE'] = config(
+    'REQUEST_PROFILING_SAMPLE_RATE', default=0.05, cast=float
+)
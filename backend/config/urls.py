@@ -5,11 +5,13 @@ from django.urls import include, path
 import config.settings
 
 from apps.core.constants import SHORT_LINK_PREFIX
+from apps.core.views import metrics_view
 from apps.recipes.views import redirect_to_recipe
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('apps.api.urls')),
+    path('metrics', metrics_view, name='metrics'),
     path(
         f'{SHORT_LINK_PREFIX}/<str:short_code>/',
         redirect_to_recipe,
@@ -17,4 +17,5 @@ echo "Collecting static files..."
 python manage.py collectstatic --no-input
 
 echo "Starting Gunicorn..."
-gunicorn config.wsgi:application --bind 0.0.0.0:${GUNICORN_PORT:-8080}
+gunicorn config.wsgi:application --bind 0.0.0.0:${GUNICORN_PORT:-8080} \
+    --workers ${GUNICORN_WORKERS:-1} --threads ${GUNICORN_THREADS:-1}